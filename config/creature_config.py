@@ -17,6 +17,17 @@ class CreatureConfig:
         "default": 0.4
     }
 
+    # Уровни детализации симуляции (LOD): (имя, радиус от камеры в пикселях, период обновления в тиках)
+    # Существа дальше последнего радиуса считаются спящими
+    LOD_TIERS = [
+        ("near", 1024, 1),  # ~16 тайлов - полное обновление каждый тик
+        ("mid", 2048, 4),  # ~32 тайла - раз в 4 тика с накопленным delta_time
+    ]
+
+    # Поведение спящих существ при пробуждении:
+    # "fast_forward" - прокрутить таймеры за пропущенное время, "freeze" - продолжить с места остановки
+    LOD_DORMANT_MODE = "fast_forward"
+
     @classmethod
     def get_sprite_size(cls, creature_name: str):
         """Получить размер спрайта для существа"""
@@ -0,0 +1,188 @@
+"""
+Бенчмарки на headless-прогоне: скорость симуляции (тиков/с) в типовых тяжелых сценариях.
+Каждый сценарий запускается в отдельном процессе, чтобы глобальные менеджеры не влияли друг на друга.
+
+    python -m frame.benchmark                          # все сценарии
+    python -m frame.benchmark --scenario bugs_chasing --ticks 300
+    python -m frame.benchmark --json bench.json --min-tps 60   # для CI: код 1, если медленнее
+"""
+import os
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+from typing import Callable, Dict
+
+from config import constants as C
+
+# {имя: функция подготовки(runner, script) -> функция на каждый тик или None}
+SCENARIOS: Dict[str, Callable] = {}
+
+
+def scenario(name: str):
+    """Регистрирует сценарий бенчмарка"""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def _free_tiles_around(game_state, count: int, radius: int):
+    """Свободные тайлы вокруг игрока (по спирали наружу)"""
+    grid = game_state.collision_grid
+    px = int(game_state.player.center_x // C.TILE_SIZE)
+    py = int(game_state.player.center_y // C.TILE_SIZE)
+
+    tiles = []
+    for r in range(1, radius + 1):
+        for tx in range(px - r, px + r + 1):
+            for ty in range(py - r, py + r + 1):
+                if max(abs(tx - px), abs(ty - py)) != r:
+                    continue
+                if 0 <= tx < grid.width and 0 <= ty < grid.height and not grid.is_blocked(tx, ty):
+                    tiles.append((tx, ty))
+    # Если места мало - несколько существ на тайл
+    return [tiles[i % len(tiles)] for i in range(count)] if tiles else []
+
+
+def _walk_back_and_forth(script, ticks: int, period: int = 60):
+    for start in range(0, ticks, period * 2):
+        script.press(start, "right", period).press(start + period, "left", period)
+
+
+@scenario("idle")
+def idle(runner, script, ticks):
+    """Стартовая карта без дополнительной нагрузки"""
+    _walk_back_and_forth(script, ticks)
+
+
+@scenario("bugs_chasing")
+def bugs_chasing(runner, script, ticks, count: int = 500):
+    """500 агрессивных жуков вокруг игрока"""
+    game_state = runner.game_state
+    map_name = game_state.entity_manager.current_map_name
+    properties = {"behavior": "aggressive", "max_health": 100, "scale": 3, "vision_range": 600}
+
+    for i, (tx, ty) in enumerate(_free_tiles_around(game_state, count, radius=20)):
+        # Монстр сам попадает в SpriteList карты (game_state.mobs)
+        game_state.entity_manager.spawn_monster(
+            mob_id=f"bench_bug_{i}_{map_name}",
+            mob_name="bug",
+            mob_type="bug",
+            position=((tx + 0.5) * C.TILE_SIZE, (ty + 0.5) * C.TILE_SIZE),
+            properties=dict(properties),
+            map_name=map_name,
+        )
+
+    _walk_back_and_forth(script, ticks)
+
+
+@scenario("teleport_storm")
+def teleport_storm(runner, script, ticks, every: int = 10):
+    """Смена карты каждые every тиков"""
+    game_state = runner.game_state
+    start = (game_state.player.center_x, game_state.player.center_y)
+    maps = ["testmap", "secmap"]
+
+    def on_tick(runner):
+        if runner.tick_index % every == 0:
+            target = maps[(runner.tick_index // every) % len(maps)]
+            game_state.teleport_to(start[0], start[1], target)
+
+    return on_tick
+
+
+@scenario("chests_1000")
+def chests_1000(runner, script, ticks, count: int = 1000):
+    """1000 сундуков вокруг игрока"""
+    from src.entities.chest import ChestSprite
+    from src.events.chest_event import ChestEvent
+
+    game_state = runner.game_state
+    event_manager = game_state.map_loader.event_manager
+    rm = game_state.map_loader.rm
+    texture = rm.load_texture("containers/chest.png")
+    texture_open = rm.load_texture("containers/chest_opened.png")
+
+    for i, (tx, ty) in enumerate(_free_tiles_around(game_state, count, radius=30)):
+        x, y = tx * C.TILE_SIZE, ty * C.TILE_SIZE
+        event = ChestEvent(f"bench_chest_{i}", "сундук", (x, y, C.TILE_SIZE, C.TILE_SIZE), {"loot": ""})
+        sprite = ChestSprite(texture, texture_open, x + C.TILE_SIZE / 2, y + C.TILE_SIZE / 2, event=event)
+        event.set_sprite(sprite)
+        event_manager.add_event(event)
+        event_manager.chest_sprites.append(sprite)
+
+    _walk_back_and_forth(script, ticks)
+
+
+def run_scenario(name: str, ticks: int, warmup: int, draw: bool) -> dict:
+    """Запускает один сценарий в текущем процессе"""
+    from frame.headless import HeadlessRunner, ScriptedInput
+    from src.core.profiler import profiler
+
+    runner = HeadlessRunner(draw=draw)
+    script = ScriptedInput()
+    on_tick = SCENARIOS[name](runner, script, warmup + ticks)
+
+    runner.run(warmup, script, on_tick)
+    profiler.reset()
+    result = runner.run(ticks, script, on_tick)
+
+    result["scenario"] = name
+    result["update_ms"] = dict(zip(("p50", "p95", "p99"), profiler.percentiles("update")))
+    runner.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки headless-прогона")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="сценарий (можно несколько), по умолчанию - все")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--draw", action="store_true", help="рисовать кадры в невидимый буфер")
+    parser.add_argument("--json", help="куда сохранить результаты ('-' - в stdout)")
+    parser.add_argument("--min-tps", type=float, default=0, help="минимально допустимые тики/с")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    scenarios = args.scenario or sorted(SCENARIOS)
+
+    if len(scenarios) == 1 and args.json == "-":
+        # Дочерний процесс: один сценарий, результат в stdout последней строкой
+        print(json.dumps(run_scenario(scenarios[0], args.ticks, args.warmup, args.draw)))
+        return
+
+    results = []
+    for name in scenarios:
+        command = [sys.executable, "-m", "frame.benchmark", "--scenario", name,
+                   "--ticks", str(args.ticks), "--warmup", str(args.warmup), "--json", "-"]
+        if args.draw:
+            command.append("--draw")
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{name:<16} ОШИБКА\n{completed.stderr}")
+            results.append({"scenario": name, "error": completed.stderr.strip().splitlines()[-1:]})
+            continue
+
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        update = result["update_ms"]
+        print(f"{name:<16} {result['ticks_per_second']:9.1f} тиков/с   "
+              f"update p50 {update['p50']:.2f} p95 {update['p95']:.2f} p99 {update['p99']:.2f} мс")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    slow = [r for r in results if "error" in r or r["ticks_per_second"] < args.min_tps]
+    if slow:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Запуск игры без видимого окна: GameStateManager, GameplayState, EntityManager и MapLoader
+работают как обычно, а update() вызывается с фиксированным delta_time заданное число тиков.
+Ввод подается сценарием действий InputManager.
+
+arcade создается в режиме ARCADE_HEADLESS (контекст OpenGL без окна, работает и без GPU через EGL).
+
+    python -m frame.headless --ticks 600
+"""
+import os
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import argparse
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from frame.main_window import MainWindow
+from src.core.autosave import autosave
+from src.core.profiler import profiler
+
+
+class ScriptedInput:
+    """Сценарий ввода: на каком тике какое действие нажать или отпустить"""
+
+    def __init__(self):
+        # {тик: [(действие, нажато)]}
+        self.events: Dict[int, List[Tuple[str, bool]]] = defaultdict(list)
+
+    def press(self, tick: int, action: str, duration: int = 1):
+        """Удерживать действие duration тиков, начиная с tick"""
+        self.events[tick].append((action, True))
+        self.events[tick + duration].append((action, False))
+        return self
+
+    def apply(self, tick: int, window):
+        """Передает окну нажатия этого тика (как настоящие клавиши)"""
+        for action, pressed in self.events.get(tick, ()):
+            key_codes = window.input_manager.key_codes.get(action)
+            if not key_codes:
+                continue
+            if pressed:
+                window.on_key_press(key_codes[0], 0)
+            else:
+                window.on_key_release(key_codes[0], 0)
+
+
+class HeadlessRunner:
+    """Прогон игры без окна с фиксированным шагом"""
+
+    def __init__(self, delta_time: float = 1 / 60, start_state: str = "game", draw: bool = False):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.delta_time = delta_time
+        self.draw = draw
+        self.tick_index = 0
+
+        # Автосохранение прогона - во временную папку, чтобы не трогать сохранение игрока
+        self.save_dir = tempfile.TemporaryDirectory(prefix="headless_save_")
+        autosave.filename = os.path.join(self.save_dir.name, "savegame.dat")
+        autosave.autosave_filename = os.path.join(self.save_dir.name, "autosave.dat")
+
+        self.window = MainWindow()
+        self.window.gsm.switch_to(start_state)
+
+    @property
+    def gsm(self):
+        return self.window.gsm
+
+    @property
+    def game_state(self):
+        return self.gsm.states["game"]
+
+    def tick(self, script: Optional[ScriptedInput] = None):
+        """Один тик: ввод, обновление и (по желанию) отрисовка в невидимый буфер"""
+        if script:
+            script.apply(self.tick_index, self.window)
+
+        self.window.on_update(self.delta_time)
+        if self.draw:
+            self.window.on_draw()
+        else:
+            # Без отрисовки кадр профилировщика закрываем сами
+            profiler.end_frame()
+
+        self.tick_index += 1
+
+    def run(self, ticks: int, script: Optional[ScriptedInput] = None,
+            on_tick: Optional[Callable[["HeadlessRunner"], None]] = None) -> dict:
+        """Прогоняет ticks тиков и возвращает скорость симуляции"""
+        start = time.perf_counter()
+        for _ in range(ticks):
+            if on_tick:
+                on_tick(self)
+            self.tick(script)
+        seconds = time.perf_counter() - start
+
+        return {
+            "ticks": ticks,
+            "seconds": seconds,
+            "ticks_per_second": ticks / seconds if seconds > 0 else float("inf"),
+        }
+
+    def close(self):
+        autosave.stop()
+        self.window.close()
+        self.save_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Прогон игры без окна")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--draw", action="store_true", help="рисовать кадры в невидимый буфер")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(name)s - %(message)s")
+
+    runner = HeadlessRunner(draw=args.draw)
+    # Игрок ходит вправо-влево
+    script = ScriptedInput()
+    for start in range(0, args.ticks, 120):
+        script.press(start, "right", 60).press(start + 60, "left", 60)
+
+    result = runner.run(args.ticks, script)
+    print(f"{result['ticks']} тиков за {result['seconds']:.2f} с: {result['ticks_per_second']:.1f} тиков/с")
+    runner.close()
+
+
+if __name__ == "__main__":
+    main()
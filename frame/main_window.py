@@ -2,6 +2,7 @@ import logging
 import arcade
 
 from config import  constants as C
+from src.core.autosave import autosave
 from src.core.game_state_manager import GameStateManager
 from src.core.input_manager import InputManager
 from src.core.resource_manager import resource_manager
@@ -35,8 +36,8 @@ class MainWindow(arcade.Window):
         self.viewport_height = C.VIEWPORT_HEIGHT
 
         super().__init__(
-            width=self.screen_width,
-            height=self.screen_height,
+            width=int(self.screen_width),
+            height=int(self.screen_height),
             title=self.screen_title,
             update_rate=1 / 60
         )
@@ -109,4 +110,6 @@ class MainWindow(arcade.Window):
 
     def on_close(self):
         """Закрытие окна"""
+        # Дописываем автосохранение до выхода
+        autosave.stop()
         super().on_close()
@@ -0,0 +1,100 @@
+"""
+Бенчмарк сохранения: время записи и чтения GameData в байты и размер файла
+для заданного числа монстров, сундуков и зон (без окна и без диска).
+
+    python -m frame.save_benchmark --mobs 5000 --chests 2000
+"""
+import argparse
+import logging
+import pickle
+import random
+import time
+
+from src.core import save_format
+from src.core.game_data import game_data
+from src.events.event_state_store import event_states
+
+
+def populate(mobs: int, chests: int, zones: int, seed: int = 1):
+    """Заполняет GameData синтетическими монстрами, зонами и состояниями сундуков"""
+    rng = random.Random(seed)
+    maps = ["secmap", "testmap"]
+
+    for i in range(zones):
+        x, y = rng.uniform(0, 5000), rng.uniform(0, 5000)
+        game_data.add_mob_zone(f"zone_{i}", {
+            "id": f"zone_{i}",
+            "rect": (x, y, rng.uniform(100, 800), -rng.uniform(100, 800)),
+            "properties": {},
+            "map_name": maps[i % len(maps)],
+        })
+
+    for i in range(mobs):
+        mob_type = "bug" if i % 5 else "npc"
+        map_name = maps[i % len(maps)]
+        mob_id = f"creature_{mob_type}_{i}_{map_name}"
+        data = game_data.create_monster_data(
+            mob_id, mob_type, mob_type, (rng.uniform(0, 5000), rng.uniform(0, 5000)),
+            custom_props=None, map_name=map_name)
+        zone = game_data.find_nearest_zone(data["position"]["x"], data["position"]["y"], map_name=map_name)
+        if zone:
+            data["zone_id"] = zone["id"]
+            data["zone_rect"] = zone["rect"]
+        game_data.add_mob(mob_id, data)
+
+    for i in range(chests):
+        event_states.set_state(f"chest_{i}_{maps[i % len(maps)]}", "chest", {"is_empty": i % 3 == 0},
+                               schema=(("is_empty", "?"),))
+
+
+def measure(func, repeat: int) -> float:
+    """Лучшее время из repeat запусков, мс"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк формата сохранения")
+    parser.add_argument("--mobs", type=int, default=5000)
+    parser.add_argument("--chests", type=int, default=2000)
+    parser.add_argument("--zones", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    populate(args.mobs, args.chests, args.zones)
+
+    # Формат и pickle на одних и тех же разделах (без обработчиков GameData)
+    sections = {
+        "player": game_data.player_data,
+        "mobs": game_data.mobs_data,
+        "zones": game_data.mob_zones,
+        "events": game_data.event_state_data,
+    }
+    data = save_format.dumps(sections)
+    codec_save_ms = measure(lambda: save_format.dumps(sections), args.repeat)
+    codec_load_ms = measure(lambda: save_format.loads(data), args.repeat)
+
+    # Для сравнения - старый способ (pickle)
+    legacy_data = pickle.dumps(sections)
+    pickle_save_ms = measure(lambda: pickle.dumps(sections), args.repeat)
+    pickle_load_ms = measure(lambda: pickle.loads(legacy_data), args.repeat)
+
+    # Полный путь GameData: с обработчиками до сохранения и после загрузки, индексами зон
+    full_data = game_data.dumps()
+    full_save_ms = measure(game_data.dumps, args.repeat)
+    full_load_ms = measure(lambda: game_data.loads(full_data), args.repeat)
+
+    print(f"{args.mobs} монстров, {args.chests} сундуков, {args.zones} зон")
+    print(f"формат ITCS  запись {codec_save_ms:7.2f} мс  чтение {codec_load_ms:7.2f} мс  {len(data) / 1024:8.1f} КБ")
+    print(f"pickle       запись {pickle_save_ms:7.2f} мс  чтение {pickle_load_ms:7.2f} мс  "
+          f"{len(legacy_data) / 1024:8.1f} КБ")
+    print(f"GameData     запись {full_save_ms:7.2f} мс  чтение {full_load_ms:7.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
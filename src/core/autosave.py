@@ -0,0 +1,218 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from . import save_format, save_journal
+from .game_data import game_data
+
+
+class AutosaveService:
+    """
+    Автосохранение без остановки кадра.
+    Основной поток раз в interval секунд снимает только изменённые записи (GameData.take_delta),
+    фоновый поток дописывает их в журнал и держит полную копию разделов сохранения,
+    из которой каждые compact_every записей пересобирает файл автосохранения и начинает журнал заново.
+    При сбое теряются изменения не больше чем за interval секунд.
+    Автосохранение пишется в свой слот (autosave_filename); файл сохранения игрока (filename)
+    пишется только по команде сохранения, так новая игра не затирает прежнее сохранение.
+    """
+
+    def __init__(self, filename: str = "savegame.dat", autosave_filename: str = "autosave.dat",
+                 interval: float = 2.0, compact_every: int = 30):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.filename = filename
+        self.autosave_filename = autosave_filename
+        self.interval = interval
+        self.compact_every = compact_every
+
+        self._timer = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_task = None
+
+        # Состояние фонового потока: копия разделов, поколение файла автосохранения, записи журнала
+        self._sections: dict = {}
+        self._generation = 0
+        self._entries = 0
+        self._journal_ready = False
+
+        # У фонового потока есть полный снимок текущей игры (иначе изменения журналу не к чему применять)
+        self._has_base = False
+
+        game_data.add_save_hooks(after_load=self._on_load)
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    @property
+    def journal_filename(self) -> str:
+        return save_journal.journal_path(self.autosave_filename)
+
+    def start(self):
+        """Запускает фоновую запись. Полный снимок уходит в слот автосохранения через interval секунд"""
+        if self.running:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._timer = 0.0
+        self._has_base = False
+
+    def stop(self):
+        """Дописывает изменения в слот автосохранения, пересобирает его и останавливает фоновый поток"""
+        if not self.running:
+            return
+        if self._has_base:
+            self.flush()
+            self._submit(self._compact)
+        else:
+            self._reset()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._last_task = None
+
+    def update(self, delta_time: float):
+        """
+        Вызывается каждый тик: раз в interval секунд отправляет изменения в журнал
+        (в первый раз - полный снимок в слот автосохранения)
+        """
+        if not self.running:
+            return
+        self._timer += delta_time
+        if self._timer >= self.interval:
+            self._timer = 0.0
+            if self._has_base:
+                self.flush()
+            else:
+                self._reset()
+
+    def flush(self):
+        """Отправляет изменённые записи в журнал (не дожидаясь записи)"""
+        if not self.running or not self._has_base:
+            return
+        try:
+            delta = game_data.take_delta()
+        except Exception as e:
+            # Изменения остались отмеченными - уйдут следующим снимком
+            self.logger.error(f"Не удалось снять изменения для автосохранения: {e}")
+            return
+        if delta is not None:
+            self._submit(self._write_delta, delta)
+
+    def save_now(self):
+        """
+        Сохранение игрока без ожидания: фоновый поток пересобирает слот автосохранения
+        и те же байты пишет в файл сохранения
+        """
+        if not self.running:
+            game_data.save_to_file(self.filename)
+            return
+        if self._has_base:
+            self.flush()
+        else:
+            self._reset(compact=False)
+        self._submit(self._compact, True)
+
+    def wait(self):
+        """Дожидается записи всего отправленного"""
+        if self._last_task is not None:
+            self._last_task.result()
+
+    def newest_slot(self) -> Optional[str]:
+        """Более свежий из файла сохранения и слота автосохранения (None - нет ни одного)"""
+        times = {}
+        for filename in (self.filename, self.autosave_filename):
+            if os.path.exists(filename):
+                times[filename] = max(_modified(filename), _modified(save_journal.journal_path(filename)))
+        return max(times, key=times.get) if times else None
+
+    def load(self, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Загружает сохранение (файл и его журнал), дождавшись фоновой записи.
+        Без filename - более свежее из сохранения игрока и автосохранения. Возвращает загруженный файл
+        """
+        self.wait()
+        filename = filename or self.newest_slot()
+        if filename is None:
+            self.logger.warning("Нет ни сохранения, ни автосохранения")
+            return None
+        game_data.load_from_file(filename)
+        return filename
+
+    def import_legacy(self):
+        """Переносит сохранение старого формата (pickle); файл сохранения перепишется при следующем сохранении"""
+        self.wait()
+        game_data.import_legacy_save(self.filename)
+
+    def _reset(self, compact: bool = True):
+        """Отдаёт фоновому потоку полный снимок (и по умолчанию сразу пересобирает из него слот автосохранения)"""
+        snapshot = game_data.dumps()
+        game_data.clear_dirty()
+        self._timer = 0.0
+        self._has_base = True
+        self._submit(self._write_snapshot, snapshot, compact)
+
+    def _on_load(self):
+        # Загруженное состояние заменяет всё, что было у фонового потока
+        if self.running:
+            self._reset()
+
+    def _submit(self, func, *args):
+        self._last_task = self._executor.submit(self._guarded, func, *args)
+
+    def _guarded(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.logger.error(f"Ошибка автосохранения: {e}")
+
+    # ---ФОНОВЫЙ ПОТОК---
+    def _write_snapshot(self, snapshot: bytes, compact: bool):
+        self._sections = save_format.loads(snapshot)
+        if compact:
+            self._compact()
+
+    def _write_delta(self, delta: bytes):
+        save_journal.apply_delta(self._sections, save_format.loads(delta))
+        # Журнал не начат (не удалась пересборка) - записи в старый журнал при загрузке не читаются
+        if not self._journal_ready:
+            self._compact()
+            return
+
+        save_journal.append(self.journal_filename, delta)
+        self._entries += 1
+        if self._entries >= self.compact_every:
+            self._compact()
+
+    def _compact(self, save_player_file: bool = False):
+        """
+        Пересобирает слот автосохранения из копии разделов и начинает новый журнал.
+        save_player_file - те же байты и в файл сохранения игрока (его журнал не используется)
+        """
+        self._journal_ready = False
+        self._generation = time.time_ns()
+
+        sections = dict(self._sections)
+        sections["meta"] = {"generation": self._generation}
+        data = save_format.dumps(sections)
+        save_journal.write_atomic(self.autosave_filename, data)
+        save_journal.start(self.journal_filename, self._generation)
+
+        self._entries = 0
+        self._journal_ready = True
+        self.logger.debug(f"Слот автосохранения пересобран (поколение {self._generation})")
+
+        if save_player_file:
+            save_journal.write_atomic(self.filename, data)
+            self.logger.info(f"Игра сохранена в {self.filename}")
+
+
+def _modified(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+# Глобальный экземпляр
+autosave = AutosaveService()
@@ -1,8 +1,11 @@
 import logging
-import pickle
-from typing import Dict
+from typing import Dict, Optional, Set
+
+from . import save_format, save_journal
+from .save_format import SaveFormatError
 
 from ..ui.notification_system import notifications as ns
+from ..world.zone_index import ZoneIndex
 from config import constants as C
 
 
@@ -44,6 +47,19 @@ class GameData:
         # Данные зон для монстров
         self.mob_zones = {}
 
+        # Состояния событий (сундуков и т.п.) - бинарный блок EventStateStore
+        self.event_state_data = b""
+        # Индексы зон по картам (строятся из mob_zones, в сохранение не попадают)
+        self._zone_indexes: Dict[str, ZoneIndex] = {}
+
+        # Обработчики до сохранения и после загрузки (например, синхронизация колонок существ).
+        self._before_save_hooks = []
+        self._after_load_hooks = []
+        self._before_snapshot_hooks = []
+
+        # Изменённые с последнего снимка записи для автосохранения: {раздел: {id записи}}
+        self._dirty: Dict[str, Set[Optional[str]]] = {}
+
         # Шаблоны монстров (дефолтные значения)
         self.mob_templates = {
             "bug": {
@@ -85,35 +101,168 @@ class GameData:
         data = self.get_entity_data(entity_id)
         if data:
             data.update(updates)
+            self.mark_entity_dirty(entity_id)
             # Здесь можно триггерить события
 
     def add_mob(self, mob_id, monster_data):
         """Добавить монстра"""
         self.mobs_data[mob_id] = monster_data
+        self.mark_dirty("mobs", mob_id)
 
     def remove_mob(self, mob_id):
         """Удалить монстра"""
         if mob_id in self.mobs_data:
 
             del self.mobs_data[mob_id]
+            self.mark_dirty("mobs", mob_id)
+
 
 
+    def add_save_hooks(self, before_save=None, after_load=None, before_snapshot=None):
+        """
+        Регистрирует обработчики, вызываемые перед сохранением и после загрузки.
+        before_snapshot(dirty) вызывается перед снимком изменённых записей для автосохранения
+        """
+        if before_save:
+            self._before_save_hooks.append(before_save)
+        if after_load:
+            self._after_load_hooks.append(after_load)
+        if before_snapshot:
+            self._before_snapshot_hooks.append(before_snapshot)
+
+    # ---ИЗМЕНЁННЫЕ ЗАПИСИ---
+    def mark_dirty(self, section: str, record_id: Optional[str] = None):
+        """Отмечает запись раздела (player, mobs, zones, events) изменённой с последнего снимка"""
+        dirty = self._dirty.get(section)
+        if dirty is None:
+            dirty = self._dirty[section] = set()
+        dirty.add(record_id)
+
+    def mark_entity_dirty(self, entity_id):
+        """Отмечает изменённой сущность из сохранения (игрока или монстра; прочие сущности не сохраняются)"""
+        if entity_id == "player":
+            self.mark_dirty("player")
+        elif entity_id in self.mobs_data:
+            self.mark_dirty("mobs", entity_id)
+
+    def clear_dirty(self):
+        self._dirty = {}
 
+    def take_delta(self) -> Optional[bytes]:
+        """
+        Снимок только изменённых записей в формате save_format (None - изменений нет).
+        Удалённые монстры и зоны уходят списками mobs_removed / zones_removed
+        """
+        if not self._dirty:
+            return None
+        dirty, self._dirty = self._dirty, {}
+        try:
+            return self._encode_delta(dirty)
+        except Exception:
+            # Снимок не удался - изменения остаются к следующему
+            for section, ids in dirty.items():
+                self._dirty.setdefault(section, set()).update(ids)
+            raise
+
+    def _encode_delta(self, dirty: dict) -> bytes:
+        for hook in self._before_snapshot_hooks:
+            hook(dirty)
+
+        sections = {}
+        if "player" in dirty:
+            sections["player"] = self.player_data
+        for section, records in (("mobs", self.mobs_data), ("zones", self.mob_zones)):
+            if section not in dirty:
+                continue
+            ids = dirty[section]
+            sections[section] = {record_id: records[record_id] for record_id in ids if record_id in records}
+            removed = [record_id for record_id in ids if record_id not in records]
+            if removed:
+                sections[save_journal.REMOVED_SECTIONS[section]] = removed
+        if "events" in dirty:
+            sections["events"] = self.event_state_data
+
+        return save_format.dumps(sections)
+
+    # ---ФАЙЛЫ---
     def save_to_file(self, filename="savegame.dat"):
-        """Сохраняем в бинарный файл"""
-        # Можно использовать pickle или собственный бинарный формат
-        with open(filename, 'wb') as f:
-            pickle.dump(self.__dict__, f)  # Сохраняем ВСЕ данные класса
+        """Сохраняем в бинарный файл (формат с версией и разделами, см. save_format)"""
+        save_journal.write_atomic(filename, self.dumps())
 
     def load_from_file(self, filename="savegame.dat"):
-        """Загружаем из файла"""
+        """Загружаем из файла (и дописанные к нему записи журнала автосохранения)"""
         try:
             with open(filename, 'rb') as f:
-                data = pickle.load(f)
-                self.__dict__.update(data)  # Обновляем все данные
-
+                data = f.read()
         except FileNotFoundError:
             self.logger.warning("Файл сохранения не найден, используем значения по умолчанию")
+            return
+
+        try:
+            sections = save_format.loads(data)
+
+            generation = sections.get("meta", {}).get("generation")
+            if generation is not None:
+                entries = save_journal.read_entries(save_journal.journal_path(filename), generation)
+                for entry in entries:
+                    save_journal.apply_delta(sections, save_format.loads(entry))
+                if entries:
+                    self.logger.info(f"Из журнала автосохранения применено записей: {len(entries)}")
+        except SaveFormatError as e:
+            self.logger.error(f"Не удалось прочитать сохранение {filename}: {e}")
+            return
+
+        self._apply_sections(sections)
+
+    def import_legacy_save(self, filename="savegame.dat") -> bool:
+        """
+        Переносит сохранение старого формата (pickle). Вызывается только явно:
+        pickle при чтении выполняет код, поэтому load_from_file такие файлы не открывает
+        """
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.logger.warning("Файл сохранения не найден")
+            return False
+
+        try:
+            sections = save_format.import_legacy(data)
+        except SaveFormatError as e:
+            self.logger.error(f"Не удалось перенести сохранение {filename}: {e}")
+            return False
+
+        self._apply_sections(sections)
+        self.logger.info(f"Сохранение старого формата {filename} перенесено")
+        return True
+
+    def dumps(self) -> bytes:
+        """Сохранение в байты: разделы player, mobs, zones, events"""
+        for hook in self._before_save_hooks:
+            hook()
+
+        return save_format.dumps({
+            "player": self.player_data,
+            "mobs": self.mobs_data,
+            "zones": self.mob_zones,
+            "events": self.event_state_data,
+        })
+
+    def loads(self, data: bytes):
+        """Загрузка из байтов сохранения (старые версии мигрируются)"""
+        self._apply_sections(save_format.loads(data))
+
+    def _apply_sections(self, sections: dict):
+        self.player_data = sections.get("player", self.player_data)
+        self.mobs_data = sections.get("mobs", {})
+        self.mob_zones = sections.get("zones", {})
+        self.event_state_data = sections.get("events", b"")
+
+        self._rebuild_zone_indexes()
+        self.clear_dirty()
+
+        for hook in self._after_load_hooks:
+            hook()
 
     # Удобные методы для доступа
     def get_player_position(self):
@@ -130,6 +279,7 @@ class GameData:
         self.player_data["position"]["y"] = y * C.TILE_SIZE
         if map_name:
             self.player_data["position"]["map"] = map_name
+        self.mark_dirty("player")
 
     def change_player_stat(self, stat_name: str, operation: str, value: int):
         """
@@ -165,6 +315,7 @@ class GameData:
             new_value = self._apply_stat_limits(stat_name, new_value)
 
             self.player_data[stat_name] = new_value
+            self.mark_dirty("player")
             self.logger.debug(f"{stat_name}: {current} -> {new_value} ({operation} {value})")
             return True
 
@@ -231,32 +382,51 @@ class GameData:
     def add_mob_zone(self, zone_id, zone_data):
         """Добавить зону для монстров"""
         self.mob_zones[zone_id] = zone_data
+        self.mark_dirty("zones", zone_id)
+        self._get_zone_index(zone_data.get("map_name")).add(zone_id, zone_data)
 
     def get_monster_zone(self, zone_id):
         """Получить зону по ID"""
         return self.mob_zones.get(zone_id)
 
-    def find_nearest_zone(self, x, y, max_distance=1000):
-        """Находит ближайшую зону к точке"""
-        nearest_zone = None
-        min_distance = float('inf')
+    def _get_zone_index(self, map_name) -> ZoneIndex:
+        index = self._zone_indexes.get(map_name)
+        if index is None:
+            index = ZoneIndex()
+            self._zone_indexes[map_name] = index
+        return index
 
+    def _rebuild_zone_indexes(self):
+        """Перестраивает индексы зон по mob_zones (после загрузки сохранения)"""
+        self._zone_indexes = {}
         for zone_id, zone in self.mob_zones.items():
-            zone_x, zone_y, zone_w, zone_h = zone["rect"]
-
-            # Центр зоны
-            center_x = zone_x + zone_w / 2
-            center_y = zone_y + zone_h / 2
+            self._get_zone_index(zone.get("map_name")).add(zone_id, zone)
 
-            # Расстояние до центра зоны
-            distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-
-            if distance < min_distance and distance <= max_distance:
-                min_distance = distance
-                nearest_zone = zone.copy()
-                nearest_zone["id"] = zone_id
-
-        return nearest_zone
+    def find_nearest_zone(self, x, y, max_distance=1000, map_name=None):
+        """
+        Находит зону с ближайшим к точке центром.
+        map_name: искать только среди зон этой карты (None - среди всех).
+        Возвращает общую запись зоны только для чтения (с полем "id") или None
+        """
+        if map_name is not None:
+            index = self._zone_indexes.get(map_name)
+            return index.nearest(x, y, max_distance) if index else None
+
+        nearest = None
+        for index in self._zone_indexes.values():
+            found = index.nearest_with_distance(x, y, max_distance)
+            if found and (nearest is None or found[0] < nearest[0]):
+                nearest = found
+        return nearest[1] if nearest else None
+
+    def find_containing_zone(self, x, y, map_name=None):
+        """Зона, внутри которой лежит точка (запись только для чтения или None)"""
+        indexes = [self._zone_indexes.get(map_name)] if map_name is not None else self._zone_indexes.values()
+        for index in indexes:
+            zone = index.containing(x, y) if index else None
+            if zone:
+                return zone
+        return None
 
     def create_monster_data(self, monster_id, mob_name, monster_type, position, custom_props: Dict=None,  map_name=None, scale=1):
         """Создать данные монстра с учетом дефолтных и кастомных свойств"""
@@ -3,6 +3,8 @@ from typing import Dict, Optional, List
 
 from src.states.base_state import BaseState
 from ..ui.notification_system import notifications as ns
+from ..ui.text_cache import text_cache
+from .profiler import profiler
 from config import constants as C
 
 
@@ -32,6 +34,14 @@ class GameStateManager:
         self.input_manager = None
         self.asset_loader = None
 
+        # Фиксированный шаг симуляции
+        self.fixed_delta = 1 / 60
+        # Сколько шагов можно догнать за один кадр (остальное время отбрасывается)
+        self.max_catch_up_steps = 5
+        self._accumulator = 0.0
+        # Доля шага, прошедшая после последнего обновления (для интерполяции отрисовки)
+        self.interpolation_alpha = 0.0
+
     def register_state(self, state_id: str, state_instance: 'BaseState'):
         """Регистрирует состояние в менеджере"""
         self.states[state_id] = state_instance
@@ -121,10 +131,32 @@ class GameStateManager:
         return self.current_state
 
     def update(self, delta_time: float):
-        """Обновляет активное состояние"""
+        """
+        Копит реальное время и обновляет игру фиксированными шагами fixed_delta.
+        Рывок кадра превращается в несколько обычных шагов (не больше max_catch_up_steps),
+        а не в один большой, поэтому движение не проскакивает сквозь стены
+        """
+        self._accumulator += delta_time
+
+        steps = 0
+        while self._accumulator >= self.fixed_delta and steps < self.max_catch_up_steps:
+            self.fixed_update(self.fixed_delta)
+            self._accumulator -= self.fixed_delta
+            steps += 1
+
+        # Не успеваем - отбрасываем отставание, чтобы не уйти в спираль догоняния
+        if self._accumulator >= self.fixed_delta:
+            self.logger.debug(f"Отброшено {self._accumulator:.3f} с симуляции")
+            self._accumulator %= self.fixed_delta
+
+        self.interpolation_alpha = self._accumulator / self.fixed_delta
+
+    def fixed_update(self, delta_time: float):
+        """Один шаг симуляции: обновляет активное состояние"""
         active_state = self.get_active_state()
         if active_state:
-            active_state.update(delta_time)
+            with profiler.scope("update"):
+                active_state.update(delta_time)
 
         # Обновляем UI
         for ui_element in self.ui_elements:
@@ -140,21 +172,37 @@ class GameStateManager:
             self.current_state.draw()
 
         # Рисуем ВСЕ overlay по порядку (от нижнего к верхнему)
-        for overlay in self.overlay_stack:
-            overlay.draw()
+        with profiler.scope("overlays"):
+            for overlay in self.overlay_stack:
+                overlay.draw()
 
-        # Рисуем UI элементы
-        for ui_element in self.ui_elements:
-                ui_element.draw()
+        with profiler.scope("ui_draw"):
+            # Рисуем UI элементы
+            for ui_element in self.ui_elements:
+                    ui_element.draw()
+
+            # Рисуем уведомления
+            ns.draw(
+                x=C.TILE_SIZE // 2,
+                y=self.window.height - C.TILE_SIZE / 2
+            )
 
-        # Рисуем уведомления
-        ns.draw(
-            x=C.TILE_SIZE // 2,
-            y=self.window.height - C.TILE_SIZE / 2
-        )
+        # Профилировщик (поверх всего)
+        profiler.draw(x=C.TILE_SIZE // 2, y=self.window.height / 2)
+        profiler.end_frame()
+
+        # Удаляем тексты, которые давно не рисовались
+        text_cache.end_frame()
 
     def handle_key_press(self, key: int, modifiers: int):
         """Передает нажатие клавиши активному состоянию"""
+        # Профилировщик доступен в любом состоянии
+        if self.input_manager:
+            if self.input_manager.get_action("profiler"):
+                profiler.toggle_overlay()
+            if self.input_manager.get_action("profiler_dump"):
+                ns.notification(f"Профиль сохранен: {profiler.dump_csv()}")
+
         active_state = self.get_active_state()
         if active_state:
             active_state.handle_key_press(key, modifiers)
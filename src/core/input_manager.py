@@ -34,6 +34,8 @@ class InputManager:
 
             'heal': ["H"],
             'cheat_console': ["F2"],
+            'profiler': ["F3"],
+            'profiler_dump': ["F4"],
             'ghost_mode': ["NUM_0"],
             'debug_mode': ["NUM_1"],
             'show_area_mode': ["NUM_2"]
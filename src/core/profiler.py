@@ -0,0 +1,141 @@
+import csv
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, List
+
+import arcade
+
+from src.ui.text_cache import text_cache
+
+
+class _Scope:
+    """Замер одного именованного участка (with profiler.scope("имя"): ...)"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        frame = self.profiler._frame
+        frame[self.name] = frame.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+
+
+class Profiler:
+    """
+    Профилировщик кадра по подсистемам.
+    Время участков копится за кадр, по последним history_size кадрам считаются p50/p95/p99.
+    Оверлей включается клавишей, трассу последних кадров можно сохранить в CSV (logs/).
+    """
+
+    def __init__(self, history_size: int = 300, trace_size: int = 3600, log_dir: str = "logs"):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Бюджет кадра при 60 FPS
+        self.frame_budget_ms = 1000 / 60
+
+        self.show_overlay = False
+        self.log_dir = log_dir
+
+        self.frame_index = 0
+        self._scopes: Dict[str, _Scope] = {}
+        # Время участков в текущем кадре, мс
+        self._frame: Dict[str, float] = {}
+        self._frame_start = time.perf_counter()
+
+        # Скользящее окно для перцентилей: {участок: deque мс}
+        self.history_size = history_size
+        self._history: Dict[str, deque] = {}
+
+        # Трасса для CSV: (номер кадра, {участок: мс})
+        self._trace = deque(maxlen=trace_size)
+
+    def scope(self, name: str) -> _Scope:
+        """Контекст для замера участка; объект переиспользуется, чтобы не создавать мусор каждый кадр"""
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = _Scope(self, name)
+            self._scopes[name] = scope
+        return scope
+
+    def end_frame(self):
+        """Закрывает кадр: переносит замеры в историю и трассу"""
+        now = time.perf_counter()
+        frame_ms = (now - self._frame_start) * 1000
+        self._frame_start = now
+
+        self._frame["frame_total"] = frame_ms
+        for name, ms in self._frame.items():
+            history = self._history.get(name)
+            if history is None:
+                history = deque(maxlen=self.history_size)
+                self._history[name] = history
+            history.append(ms)
+
+        self._trace.append((self.frame_index, self._frame))
+        self._frame = {}
+        self.frame_index += 1
+
+    def percentiles(self, name: str, points=(50, 95, 99)) -> List[float]:
+        """Перцентили времени участка по скользящему окну, мс"""
+        history = self._history.get(name)
+        if not history:
+            return [0.0 for _ in points]
+        values = sorted(history)
+        last = len(values) - 1
+        return [values[min(last, int(round(point / 100 * last)))] for point in points]
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw(self, x: float, y: float):
+        """Оверлей: по строке на участок, красным - если p95 выходит за бюджет кадра"""
+        if not self.show_overlay:
+            return
+
+        names = sorted(self._history, key=lambda name: (name != "frame_total", name))
+        line_height = 16
+        height = (len(names) + 1) * line_height + 8
+        arcade.draw_rect_filled(arcade.rect.LRBT(x - 4, x + 380, y - height, y + 4), (0, 0, 0, 170))
+
+        text_cache.draw("profiler_header", f"{'участок':<18}{'p50':>8}{'p95':>8}{'p99':>8}  мс",
+                        x, y - line_height, arcade.color.LIGHT_GRAY, 11, font_name="Courier New")
+
+        for i, name in enumerate(names, start=2):
+            p50, p95, p99 = self.percentiles(name)
+            color = arcade.color.RED if p95 > self.frame_budget_ms else arcade.color.WHITE
+            text_cache.draw(("profiler", name), f"{name:<18}{p50:8.2f}{p95:8.2f}{p99:8.2f}",
+                            x, y - i * line_height, color, 11, font_name="Courier New")
+
+    def dump_csv(self, path: str = None) -> str:
+        """Сохраняет трассу последних кадров в CSV. Возвращает путь к файлу"""
+        if path is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            path = os.path.join(self.log_dir, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+
+        names = sorted({name for _, frame in self._trace for name in frame})
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_index"] + names)
+            for frame_index, frame in self._trace:
+                writer.writerow([frame_index] + [f"{frame.get(name, 0.0):.3f}" for name in names])
+
+        self.logger.info(f"Трасса профилировщика сохранена: {path} ({len(self._trace)} кадров)")
+        return path
+
+    def reset(self):
+        self._frame.clear()
+        self._history.clear()
+        self._trace.clear()
+
+
+# Глобальный экземпляр
+profiler = Profiler()
@@ -2,7 +2,8 @@ import os
 from pathlib import Path
 
 import arcade
-from typing import Dict
+from PIL import Image
+from typing import Dict, List
 
 
 class ResourceManager:
@@ -11,6 +12,7 @@ class ResourceManager:
     def __init__(self):
         self._textures: Dict[str, arcade.Texture] = {}
         self._sounds: Dict[str, arcade.Sound] = {}
+        self._tilesets: Dict[str, List[arcade.Texture]] = {}
         self._project_root = None
 
     def get_project_root(self) -> str:
@@ -45,6 +47,30 @@ class ResourceManager:
         grid = arcade.load_spritesheet(path)
         return grid.get_texture_grid(size=size, columns=columns, count=count)
 
+    def load_tileset(self, relative_path: str, tile_size=(16, 16), columns=1, count=1,
+                     spacing: int = 0, margin: int = 0) -> List[arcade.Texture]:
+        """Нарезать картинку тайлсета Tiled на текстуры тайлов (с кэшированием)"""
+        if relative_path in self._tilesets:
+            return self._tilesets[relative_path]
+
+        path = self.get_resource_path(relative_path)
+        width, height = tile_size
+        textures = []
+        with Image.open(path) as image:
+            image = image.convert("RGBA")
+            for index in range(count):
+                row, column = divmod(index, columns)
+                x = margin + column * (width + spacing)
+                y = margin + row * (height + spacing)
+                textures.append(arcade.Texture(
+                    image.crop((x, y, x + width, y + height)),
+                    hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+                    hash=f"{relative_path}:{index}",
+                ))
+
+        self._tilesets[relative_path] = textures
+        return textures
+
     def load_sound(self, relative_path: str) -> arcade.Sound:
         """Загрузить звук с кэшированием"""
         if relative_path in self._sounds:
@@ -59,6 +85,7 @@ class ResourceManager:
         """Очистить кэш ресурсов"""
         self._textures.clear()
         self._sounds.clear()
+        self._tilesets.clear()
 
 
 # Глобальный экземпляр менеджера
@@ -0,0 +1,514 @@
+"""
+Бинарный формат сохранения с версией схемы и разделами.
+
+    заголовок:  b"ITCS", версия схемы (H), число разделов (H)
+    оглавление: для каждого раздела - имя, смещение и длина (Q, Q)
+    разделы:    player - значение в компактной тегированной кодировке (похожа на msgpack),
+                mobs, zones - записи {id: словарь} по колонкам (один array на поле),
+                events - блок EventStateStore как есть
+
+Старые версии поднимаются до текущей цепочкой миграций (@migration(версия)).
+Сохранения старого формата (pickle всего GameData.__dict__) loads не читает:
+pickle при чтении выполняет код, так перенос идёт только явно через import_legacy (как версия 0).
+"""
+import pickle
+import struct
+from array import array
+from itertools import compress, filterfalse, repeat
+from operator import contains, itemgetter
+from typing import Callable, Dict, List
+
+MAGIC = b"ITCS"
+SAVE_VERSION = 1
+
+_HEADER = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<QQ")
+
+
+class SaveFormatError(Exception):
+    """Файл сохранения повреждён или не поддерживается"""
+
+
+# ---ЗНАЧЕНИЯ---
+# Теги: N - None, T/F - bool, i - int64, I - длинное целое (строкой), f - float64,
+# s - строка, b - байты, l - список, t - кортеж, d - словарь
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LEN = struct.Struct("<I")
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def encode_value(value) -> bytes:
+    """Кодирует значение (None, bool, int, float, str, bytes, list, tuple, dict)"""
+    parts: List[bytes] = []
+    _encode(value, parts.append)
+    return b"".join(parts)
+
+
+def _encode(value, put):
+    if value is None:
+        put(b"N")
+    elif value is True:
+        put(b"T")
+    elif value is False:
+        put(b"F")
+    elif isinstance(value, int):
+        if _INT_MIN <= value <= _INT_MAX:
+            put(b"i" + _INT.pack(value))
+        else:
+            raw = str(value).encode("ascii")
+            put(b"I" + _LEN.pack(len(raw)) + raw)
+    elif isinstance(value, float):
+        put(b"f" + _FLOAT.pack(value))
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        put(b"s" + _LEN.pack(len(raw)) + raw)
+    elif isinstance(value, (bytes, bytearray)):
+        put(b"b" + _LEN.pack(len(value)) + bytes(value))
+    elif isinstance(value, (list, tuple)):
+        put((b"l" if isinstance(value, list) else b"t") + _LEN.pack(len(value)))
+        for item in value:
+            _encode(item, put)
+    elif isinstance(value, dict):
+        put(b"d" + _LEN.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, put)
+            _encode(item, put)
+    else:
+        raise TypeError(f"Тип {type(value).__name__} нельзя сохранить")
+
+
+def decode_value(data: bytes):
+    value, offset = _decode(memoryview(data), 0)
+    if offset != len(data):
+        raise SaveFormatError("Лишние данные после значения")
+    return value
+
+
+def _decode(data, offset: int):
+    tag = data[offset]
+    offset += 1
+    if tag == 0x4E:  # N
+        return None, offset
+    if tag == 0x54:  # T
+        return True, offset
+    if tag == 0x46:  # F
+        return False, offset
+    if tag == 0x69:  # i
+        return _INT.unpack_from(data, offset)[0], offset + 8
+    if tag == 0x66:  # f
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+
+    (length,) = _LEN.unpack_from(data, offset)
+    offset += 4
+    if tag == 0x73:  # s
+        return str(_slice(data, offset, length), "utf-8"), offset + length
+    if tag == 0x62:  # b
+        return bytes(_slice(data, offset, length)), offset + length
+    if tag == 0x49:  # I
+        return int(str(_slice(data, offset, length), "ascii")), offset + length
+    if tag == 0x6C or tag == 0x74:  # l, t
+        items = []
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (items if tag == 0x6C else tuple(items)), offset
+    if tag == 0x64:  # d
+        result = {}
+        for _ in range(length):
+            key, offset = _decode(data, offset)
+            result[key], offset = _decode(data, offset)
+        return result, offset
+
+    raise SaveFormatError(f"Неизвестный тег {chr(tag)!r}")
+
+
+def _slice(data, offset: int, size: int):
+    """size байт с offset; обрезанные данные - ошибка, а не короткий срез"""
+    if offset + size > len(data):
+        raise SaveFormatError("Данные обрезаны")
+    return data[offset:offset + size]
+
+
+# ---ЗАПИСИ ПО КОЛОНКАМ---
+# Вид колонки: q - все int (самым узким типом array), d - все float, ? - все bool, s - все str,
+# r - все словари со строковыми ключами (вложенная таблица), l/t - списки/кортежи одной длины (колонка на позицию),
+# g - любые значения (тегированно)
+_COUNT = struct.Struct("<I")
+
+
+def encode_records(records: Dict[str, dict]) -> bytes:
+    """
+    Кодирует {id: словарь} по колонкам: для каждого поля - маска наличия и значения одним блоком.
+    У записей монстров почти одинаковые поля, так кодирование идёт пачками, а не по значению.
+    Если id или имена полей не строки (или записи не словари) - весь раздел тегированно (g)
+    """
+    ids = list(records)
+    rows = list(records.values())
+    fields = _table_fields(rows) if _all_str(ids) and _all_dict(rows) else None
+    if fields is None or not _all_str(fields):
+        return b"g" + encode_value(records)
+    return b"c" + _COUNT.pack(len(ids)) + _encode_strings(ids) + _encode_table(rows, fields)
+
+
+def decode_records(data: bytes) -> Dict[str, dict]:
+    view = memoryview(data)
+    if view[0] == 0x67:  # g
+        records = decode_value(bytes(view[1:]))
+        if not isinstance(records, dict):
+            raise SaveFormatError("Раздел записей - не словарь")
+        return records
+    if view[0] != 0x63:  # c
+        raise SaveFormatError(f"Неизвестный вид раздела записей {chr(view[0])!r}")
+    (count,) = _COUNT.unpack_from(view, 1)
+    ids, offset = _decode_strings(view, 5, count)
+    rows, offset = _decode_table(view, offset, count)
+    if offset != len(view):
+        raise SaveFormatError("Лишние данные после записей")
+    return dict(zip(ids, rows))
+
+
+def _all_str(values) -> bool:
+    return set(map(type, values)) <= {str}
+
+
+def _all_dict(values) -> bool:
+    return set(map(type, values)) <= {dict}
+
+
+def _table_fields(rows: List[dict]) -> List[str]:
+    """
+    Поля записей в порядке первого появления.
+    Обычно почти у всех записей одни и те же поля, так по ключам проходят только записи с новыми полями
+    """
+    fields = list(rows[0]) if rows else []
+    known = set(fields)
+    # known пополняется на ходу - следующие записи с теми же новыми полями отсеиваются
+    for row in filterfalse(known.issuperset, rows):
+        for field in row:
+            if field not in known:
+                known.add(field)
+                fields.append(field)
+    return fields
+
+
+def _encode_table(rows: List[dict], fields: List[str]) -> bytes:
+    """Таблица записей-словарей; fields - из _table_fields, только строки"""
+    parts = [_COUNT.pack(len(fields))]
+    for field in fields:
+        try:
+            values = list(map(itemgetter(field), rows))
+            present = b""
+        except KeyError:
+            present = bytes(map(contains, rows, repeat(field)))
+            values = list(map(itemgetter(field), compress(rows, present)))
+        parts.append(_encode_strings([field]))
+        parts.append(b"P" + present if present else b"A")
+        parts.append(_encode_column(values))
+    return b"".join(parts)
+
+
+def _decode_table(view, offset: int, count: int):
+    (field_count,) = _COUNT.unpack_from(view, offset)
+    offset += 4
+
+    # Поля, что есть у всех записей, собираются в словари одним проходом, остальные - дописываются
+    full_fields, full_columns, partial = [], [], []
+    for _ in range(field_count):
+        (field,), offset = _decode_strings(view, offset, 1)
+        if view[offset] == 0x50:  # P - есть не у всех записей
+            present = bytes(_slice(view, offset + 1, count))
+            offset += 1 + count
+            values, offset = _decode_column(view, offset, present.count(1))
+            partial.append((field, present, values))
+        else:
+            values, offset = _decode_column(view, offset + 1, count)
+            full_fields.append(field)
+            full_columns.append(values)
+
+    if full_columns:
+        rows = list(map(dict, map(zip, repeat(full_fields), zip(*full_columns))))
+    else:
+        rows = list(map(dict, repeat((), count)))
+    for field, present, values in partial:
+        for row, value in zip(compress(rows, present), values):
+            row[field] = value
+    return rows, offset
+
+
+# Строковая колонка со словарём, если уникальных значений не больше этой доли
+_ENUM_RATIO = 0.5
+
+
+def _encode_column(values) -> bytes:
+    """Колонка: вид (1 байт) + данные"""
+    types = set(map(type, values))
+    if types == {int}:
+        code = _int_code(min(values), max(values))
+        if code:
+            return b"q" + code.encode("ascii") + array(code, values).tobytes()
+    elif types == {float}:
+        return b"d" + array("d", values).tobytes()
+    elif types == {bool}:
+        return b"?" + bytes(values)
+    elif types == {str}:
+        uniques = dict.fromkeys(values)
+        if len(uniques) <= len(values) * _ENUM_RATIO:
+            index = {value: i for i, value in enumerate(uniques)}
+            code = _int_code(0, len(index), unsigned=True)
+            return (b"e" + _COUNT.pack(len(index)) + _encode_strings(index) + code.encode("ascii")
+                    + array(code, map(index.__getitem__, values)).tobytes())
+        return b"s" + _encode_strings(values)
+    elif types == {dict}:
+        fields = _table_fields(values)
+        # Вложенные словари с нестроковыми ключами - тегированно
+        if _all_str(fields):
+            return b"r" + _encode_table(values, fields)
+    elif types == {list} or types == {tuple}:
+        lengths = set(map(len, values))
+        if len(lengths) == 1:
+            # Списки одной длины - колонка на каждую позицию
+            kind = b"l" if types == {list} else b"t"
+            return kind + _COUNT.pack(lengths.pop()) + b"".join(map(_encode_column, zip(*values)))
+    payload = encode_value(values)
+    return b"g" + _COUNT.pack(len(payload)) + payload
+
+
+def _decode_column(view, offset: int, count: int):
+    kind = view[offset]
+    offset += 1
+    if kind == 0x71:  # q
+        code = chr(view[offset])
+        offset += 1
+        end = offset + _ITEM_SIZES[code] * count
+        return _array(code, _slice(view, offset, end - offset)).tolist(), end
+    if kind == 0x64:  # d
+        end = offset + 8 * count
+        return _array("d", _slice(view, offset, end - offset)).tolist(), end
+    if kind == 0x3F:  # ?
+        end = offset + count
+        return list(map(bool, _slice(view, offset, count))), end
+    if kind == 0x73:  # s
+        return _decode_strings(view, offset, count)
+    if kind == 0x65:  # e
+        (unique_count,) = _COUNT.unpack_from(view, offset)
+        table, offset = _decode_strings(view, offset + 4, unique_count)
+        code = chr(view[offset])
+        offset += 1
+        end = offset + _ITEM_SIZES[code] * count
+        return list(map(table.__getitem__, _array(code, _slice(view, offset, end - offset)))), end
+    if kind == 0x72:  # r
+        return _decode_table(view, offset, count)
+    if kind == 0x6C or kind == 0x74:  # l, t
+        (length,) = _COUNT.unpack_from(view, offset)
+        offset += 4
+        columns = []
+        for _ in range(length):
+            column, offset = _decode_column(view, offset, count)
+            columns.append(column)
+        rows = zip(*columns) if columns else repeat((), count)
+        return (list(map(list, rows)) if kind == 0x6C else list(rows)), offset
+    if kind == 0x67:  # g
+        (length,) = _COUNT.unpack_from(view, offset)
+        offset += 4
+        return decode_value(bytes(_slice(view, offset, length))), offset + length
+    raise SaveFormatError(f"Неизвестный вид колонки {chr(kind)!r}")
+
+
+# Целые колонки хранятся самым узким типом array, в который влезают все значения
+_INT_CODES = (("b", -(1 << 7), (1 << 7) - 1), ("h", -(1 << 15), (1 << 15) - 1),
+              ("i", -(1 << 31), (1 << 31) - 1), ("q", _INT_MIN, _INT_MAX))
+_UINT_CODES = (("B", 0, (1 << 8) - 1), ("H", 0, (1 << 16) - 1), ("I", 0, (1 << 32) - 1))
+_ITEM_SIZES = {code: array(code).itemsize for code in "bhiqBHI"}
+
+
+def _int_code(low: int, high: int, unsigned: bool = False) -> str:
+    """Код array для целых от low до high ("" - не влезают в 64 бита)"""
+    for code, min_value, max_value in (_UINT_CODES if unsigned else _INT_CODES):
+        if min_value <= low and high <= max_value:
+            return code
+    return ""
+
+
+def _array(code: str, data) -> array:
+    values = array(code)
+    values.frombytes(data)
+    return values
+
+
+def _encode_strings(values) -> bytes:
+    """
+    Строки пачкой: режим (1 байт), длина блока (I), utf-8 блок.
+    Режим 0 - строки через \\0 (разбираются одним split), 1 - перед блоком длины строк (array I)
+    """
+    text = "\0".join(values)
+    if "\0" not in "".join(values):
+        blob = text.encode("utf-8")
+        return b"\0" + _COUNT.pack(len(blob)) + blob
+    encoded = [value.encode("utf-8") for value in values]
+    blob = b"".join(encoded)
+    return b"\1" + _COUNT.pack(len(blob)) + array("I", map(len, encoded)).tobytes() + blob
+
+
+def _decode_strings(data, offset: int, count: int):
+    mode = data[offset]
+    (size,) = _COUNT.unpack_from(data, offset + 1)
+    offset += 5
+    if mode == 0:
+        end = offset + size
+        if not count:
+            return [], end
+        result = str(_slice(data, offset, size), "utf-8").split("\0")
+    else:
+        lengths = _array("I", _slice(data, offset, 4 * count))
+        offset += 4 * count
+        end = offset + size
+        blob = bytes(_slice(data, offset, size))
+        result = []
+        position = 0
+        for length in lengths:
+            result.append(blob[position:position + length].decode("utf-8"))
+            position += length
+    if len(result) != count:
+        raise SaveFormatError("Неверное число строк в блоке")
+    return result, end
+
+
+# ---МИГРАЦИИ---
+# {версия: функция(разделы) -> разделы следующей версии}
+MIGRATIONS: Dict[int, Callable[[dict], dict]] = {}
+
+
+def migration(from_version: int):
+    """Регистрирует миграцию разделов с версии from_version на from_version + 1"""
+    def decorator(func):
+        MIGRATIONS[from_version] = func
+        return func
+    return decorator
+
+
+def migrate(sections: dict, version: int) -> dict:
+    """Поднимает разделы до SAVE_VERSION"""
+    if version > SAVE_VERSION:
+        raise SaveFormatError(f"Сохранение версии {version} новее поддерживаемой {SAVE_VERSION}")
+    while version < SAVE_VERSION:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise SaveFormatError(f"Нет миграции сохранения с версии {version}")
+        sections = step(sections)
+        version += 1
+    return sections
+
+
+@migration(0)
+def _from_pickle(sections: dict) -> dict:
+    """Версия 0 - pickle всего GameData.__dict__ (старые сохранения)"""
+    legacy = sections["legacy"]
+    return {
+        "player": legacy.get("player_data", {}),
+        "mobs": legacy.get("mobs_data", {}),
+        "zones": legacy.get("mob_zones", {}),
+        "events": legacy.get("event_state_data", b""),
+    }
+
+
+# ---РАЗДЕЛЫ---
+# {раздел: (кодировщик, декодировщик)}. Декодировщик проверяет данные целиком: ошибка в любом разделе
+# обнаруживается в loads, до того как GameData начнёт применять загруженное
+SECTION_CODECS = {
+    "player": (encode_value, decode_value),
+    "mobs": (encode_records, decode_records),
+    "zones": (encode_records, decode_records),
+    # Формат блока задаёт EventStateStore, он же регистрирует проверку (register_section)
+    "events": (bytes, bytes),
+    # Служебные: поколение файла для журнала автосохранения и удалённые записи в записях журнала
+    "meta": (encode_value, decode_value),
+    "mobs_removed": (encode_value, decode_value),
+    "zones_removed": (encode_value, decode_value),
+}
+
+
+def register_section(name: str, encode: Callable, decode: Callable):
+    """Кодек раздела, формат которого принадлежит другому модулю"""
+    SECTION_CODECS[name] = (encode, decode)
+
+
+def _decode_section(name: str, payload: bytes):
+    try:
+        return SECTION_CODECS[name][1](payload)
+    except (IndexError, KeyError, TypeError, ValueError, RecursionError, struct.error) as e:
+        # Длины и смещения внутри раздела не сходятся с данными
+        raise SaveFormatError(f"Раздел '{name}' повреждён: {e!r}") from e
+
+
+def dumps(sections: dict) -> bytes:
+    """Собирает файл сохранения из разделов {имя: объект}"""
+    names = list(sections)
+    payloads = [SECTION_CODECS[name][0](sections[name]) for name in names]
+    encoded_names = [name.encode("utf-8") for name in names]
+
+    table_size = sum(1 + len(name) + _ENTRY.size for name in encoded_names)
+    offset = _HEADER.size + table_size
+
+    parts = [_HEADER.pack(MAGIC, SAVE_VERSION, len(names))]
+    for name, payload in zip(encoded_names, payloads):
+        parts.append(struct.pack("<B", len(name)) + name + _ENTRY.pack(offset, len(payload)))
+        offset += len(payload)
+    parts.extend(payloads)
+    return b"".join(parts)
+
+
+def loads(data: bytes) -> dict:
+    """
+    Читает разделы сохранения (с миграцией до текущей версии).
+    Любое повреждение - SaveFormatError, сохранения старого формата - тоже (см. import_legacy)
+    """
+    if data[:4] != MAGIC:
+        if data[:1] == b"\x80":
+            raise SaveFormatError("Сохранение старого формата (pickle) - перенесите его через import_legacy")
+        raise SaveFormatError("Это не файл сохранения")
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("Заголовок обрезан")
+
+    _, version, count = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    sections = {}
+    for _ in range(count):
+        if offset >= len(data):
+            raise SaveFormatError("Оглавление обрезано")
+        name_length = data[offset]
+        if offset + 1 + name_length + _ENTRY.size > len(data):
+            raise SaveFormatError("Оглавление обрезано")
+        try:
+            name = data[offset + 1:offset + 1 + name_length].decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise SaveFormatError(f"Неверное имя раздела: {e}") from e
+        offset += 1 + name_length
+        start, length = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+        if start + length > len(data):
+            raise SaveFormatError(f"Раздел '{name}' обрезан")
+        # Неизвестные разделы (из более новых версий игры) пропускаем
+        if name in SECTION_CODECS:
+            sections[name] = _decode_section(name, data[start:start + length])
+
+    return migrate(sections, version)
+
+
+def import_legacy(data: bytes) -> dict:
+    """
+    Разделы из сохранения старого формата (pickle всего GameData.__dict__).
+    pickle при чтении может выполнить произвольный код - вызывается только явно и только для своих файлов
+    """
+    if data[:1] != b"\x80":
+        raise SaveFormatError("Это не сохранение старого формата")
+    try:
+        legacy = pickle.loads(data)
+    except Exception as e:
+        # pickle сообщает о повреждении исключениями разных типов
+        raise SaveFormatError(f"Не удалось прочитать старое сохранение: {e!r}") from e
+    if not isinstance(legacy, dict):
+        raise SaveFormatError("Старое сохранение не содержит данных GameData")
+    sections = migrate({"legacy": legacy}, 0)
+    sections["events"] = _decode_section("events", bytes(sections["events"]))
+    return sections
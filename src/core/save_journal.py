@@ -0,0 +1,90 @@
+"""
+Журнал автосохранения рядом с основным файлом сохранения.
+
+    заголовок: b"ITCJ", поколение (Q) - совпадает с разделом meta основного файла
+    записи:    длина (I), crc32 (I), байты save_format с изменёнными записями
+
+Журнал только дописывается. Запись, оборванная сбоем, отбрасывается по длине и crc32,
+а журнал чужого поколения (основной файл уже пересобран) при загрузке пропускается.
+Основной файл и новый журнал пишутся атомарно: во временный файл, затем переименование.
+"""
+import os
+import struct
+import zlib
+from typing import List
+
+MAGIC = b"ITCJ"
+
+_HEADER = struct.Struct("<4sQ")
+_ENTRY = struct.Struct("<II")
+
+# Разделы-списки удалённых записей: {раздел: раздел с удалёнными id}
+REMOVED_SECTIONS = {"mobs": "mobs_removed", "zones": "zones_removed"}
+
+
+def journal_path(filename: str) -> str:
+    return filename + ".journal"
+
+
+def write_atomic(path: str, data: bytes):
+    """Пишет файл целиком: во временный файл, fsync, затем замена старого"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def start(path: str, generation: int):
+    """Новый пустой журнал для основного файла поколения generation"""
+    write_atomic(path, _HEADER.pack(MAGIC, generation))
+
+
+def append(path: str, payload: bytes):
+    """Дописывает запись в конец журнала"""
+    with open(path, "ab") as f:
+        f.write(_ENTRY.pack(len(payload), zlib.crc32(payload)) + payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_entries(path: str, generation: int) -> List[bytes]:
+    """Целые записи журнала поколения generation (оборванный хвост отбрасывается)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+
+    if len(data) < _HEADER.size:
+        return []
+    magic, journal_generation = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or journal_generation != generation:
+        return []
+
+    entries = []
+    offset = _HEADER.size
+    while offset + _ENTRY.size <= len(data):
+        length, checksum = _ENTRY.unpack_from(data, offset)
+        start_offset = offset + _ENTRY.size
+        payload = data[start_offset:start_offset + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            break
+        entries.append(payload)
+        offset = start_offset + length
+    return entries
+
+
+def apply_delta(sections: dict, delta: dict):
+    """Накладывает изменения из записи журнала на разделы сохранения"""
+    removed_names = set(REMOVED_SECTIONS.values())
+    for name, value in delta.items():
+        if name in REMOVED_SECTIONS:
+            sections.setdefault(name, {}).update(value)
+        elif name not in removed_names and name != "meta":
+            sections[name] = value
+
+    for name, removed_name in REMOVED_SECTIONS.items():
+        for record_id in delta.get(removed_name, ()):
+            sections.setdefault(name, {}).pop(record_id, None)
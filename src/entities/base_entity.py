@@ -27,6 +27,7 @@ class Entity(arcade.Sprite):
     @name.setter
     def name(self, value):
         self.data["name"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def health(self):
@@ -35,6 +36,7 @@ class Entity(arcade.Sprite):
     @health.setter
     def health(self, value):
         self.data["health"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def max_health(self):
@@ -43,6 +45,7 @@ class Entity(arcade.Sprite):
     @max_health.setter
     def max_health(self, value):
         self.data["max_health"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def damage(self):
@@ -51,6 +54,7 @@ class Entity(arcade.Sprite):
     @damage.setter
     def damage(self, value):
         self.data["damage"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def behavior(self):
@@ -59,6 +63,7 @@ class Entity(arcade.Sprite):
     @behavior.setter
     def behavior(self, value):
         self.data["behavior"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def is_alive(self):
@@ -67,6 +72,7 @@ class Entity(arcade.Sprite):
     @is_alive.setter
     def is_alive(self, value: bool):
         self.data["is_alive"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
 
     @property
@@ -76,6 +82,7 @@ class Entity(arcade.Sprite):
     @change_x.setter
     def change_x(self, value):
         self.data.get("position")[0] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def change_y(self):
@@ -84,6 +91,7 @@ class Entity(arcade.Sprite):
     @change_y.setter
     def change_y(self, value):
         self.data.get("position")[1] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def active_topic(self):
@@ -92,6 +100,7 @@ class Entity(arcade.Sprite):
     @active_topic.setter
     def active_topic(self, value):
         self.data["active_topic"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def can_dialogue(self):
@@ -100,6 +109,7 @@ class Entity(arcade.Sprite):
     @can_dialogue.setter
     def can_dialogue(self, value):
         self.data["can_dialogue"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     @property
     def speed(self):
@@ -108,6 +118,7 @@ class Entity(arcade.Sprite):
     @speed.setter
     def speed(self, value):
         self.data["speed"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
 
     def update(self, delta_time: float = 1 / 60, *args, **kwargs) -> None:
         """Базовое обновление"""
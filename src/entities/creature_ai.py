@@ -0,0 +1,231 @@
+import logging
+import math
+import random
+
+from .creature_store import creature_store
+from ..world.movement import sweep_box
+from ..world.zone_index import zone_bounds
+
+# Режим существа на этот тик
+MODE_NONE = 0       # видит игрока, но ничего не делает
+MODE_CHASE = 1      # преследует игрока
+MODE_DIALOGUE = 2   # видит игрока, готов к диалогу и блуждает
+MODE_RETURN = 3     # вне своей зоны - возвращается
+MODE_WANDER = 4     # блуждает в зоне
+
+# Направления блуждания по коду (последнее - стоять на месте)
+WANDER_DIRECTIONS = ((0, 1), (0, -1), (-1, 0), (1, 0), (0, 0))
+
+
+class CreatureBatchAI:
+    """
+    Шаг ИИ существ - единственное место, где существа думают и двигаются.
+    Каждое запланированное на тик существо проходится один раз: анимация, зрение, выбор режима,
+    направление блуждания, вектор движения, перемещение с коллизиями и запись результата.
+    Характеристики читаются прямо из колонок CreatureStore, прямоугольники хитбокса
+    и зоны кэшируются на существе и пересчитываются только при их смене.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.aggressive_code = creature_store.behavior_code("aggressive")
+        self.passive_code = creature_store.behavior_code("passive")
+
+        # Сколько существ обработано за последний тик
+        self.last_count = 0
+
+    def step(self, scheduled, player=None, watchers=(), collision_grid=None, pathfinder=None,
+             line_of_sight=None) -> list:
+        """
+        scheduled: [(существо, delta_time)] из LODScheduler
+        watchers: существа, которым передаётся игрок (остальные его не видят)
+        Возвращает сдвинувшихся существ
+        """
+        self.last_count = len(scheduled)
+        moved_creatures = []
+        if not scheduled:
+            return moved_creatures
+
+        columns = creature_store.columns
+        behavior_column = columns["behavior"]
+        speed_column = columns["speed"]
+        chase_column = columns["chase_speed"]
+        vision_column = columns["vision_range"]
+        aggressive, passive = self.aggressive_code, self.passive_code
+        zone_bounds_of = self._zone_bounds
+        hit_box_extent = self._hit_box_extent
+        randrange, uniform = random.randrange, random.uniform
+        copysign = math.copysign
+
+        if player and watchers:
+            px, py = player.position
+        else:
+            watchers = ()
+
+        for monster, elapsed in scheduled:
+            slot = monster.slot
+            speed = speed_column[slot]
+            dir_x, dir_y = monster.wander_direction
+
+            # ---АНИМАЦИЯ И ПОЛОСКА ЗДОРОВЬЯ---
+            monster.time_elapsed += elapsed
+            current_direction = None
+            if abs(dir_x) > abs(dir_y):
+                current_direction = "right" if dir_x > 0 else "left"
+            elif dir_y != 0:
+                current_direction = "up" if dir_y > 0 else "down"
+            monster._update_animation(elapsed, current_direction)
+
+            x, y = monster.position
+            health_bar = monster.health_bar
+            health_bar.x = x
+            health_bar.y = y + monster.height
+
+            # ---ЗРЕНИЕ---
+            seen = False
+            if monster in watchers and (x - px) ** 2 + (y - py) ** 2 <= vision_column[slot] ** 2:
+                if line_of_sight:
+                    visible = line_of_sight.is_visible(x, y, px, py)
+                    # Бюджет лучей исчерпан - используем прошлый результат
+                    if visible is not None:
+                        monster.saw_player = visible
+                    seen = monster.saw_player
+                else:
+                    seen = True
+
+            # ---ВЫБОР РЕЖИМА---
+            zone = zone_bounds_of(monster)
+            mode = MODE_NONE
+            if seen:
+                behavior = behavior_column[slot]
+                if behavior == aggressive:
+                    mode = MODE_CHASE
+                elif behavior == passive and monster.can_dialogue:
+                    mode = MODE_DIALOGUE
+            elif not _contains(zone, x, y):
+                mode = MODE_RETURN
+            else:
+                mode = MODE_WANDER
+            wandering = mode == MODE_WANDER or mode == MODE_DIALOGUE
+
+            # ---ТАЙМЕР И НОВОЕ НАПРАВЛЕНИЕ БЛУЖДАНИЯ---
+            timer = monster.wander_timer
+            if timer <= 0 and wandering:
+                unit_x, unit_y = WANDER_DIRECTIONS[randrange(len(WANDER_DIRECTIONS))]
+                dir_x, dir_y = unit_x * speed, unit_y * speed
+                timer = uniform(1.0, 3.0)
+
+            # ---ВЕКТОР ДВИЖЕНИЯ---
+            # Преследование и возврат идут по 4 направлениям по преобладающей оси
+            scale = elapsed * 60
+            step_x = step_y = 0.0
+            slide = None
+            if wandering:
+                step_x, step_y = dir_x * scale, dir_y * scale
+            elif mode == MODE_CHASE or mode == MODE_RETURN:
+                # Путь строится с запасом под хитбокс, чтобы крупное существо не вело в узкий проход
+                clearance = pathfinder.clearance(hit_box_extent(monster, x, y)) if pathfinder else 0
+                if mode == MODE_CHASE:
+                    move_speed = chase_column[slot] * scale
+                    target = pathfinder.flow_waypoint(x, y, clearance) if pathfinder else None
+                    if target is None:
+                        target = player.position
+                else:
+                    move_speed = speed * scale
+                    # Центр зоны, а по пути - следующий тайл A*
+                    left, bottom, right, top = zone
+                    target = ((left + right) / 2, (bottom + top) / 2)
+                    if pathfinder:
+                        target = pathfinder.next_waypoint(x, y, target[0], target[1], clearance) or target
+
+                dx = target[0] - x
+                dy = target[1] - y
+                if abs(dx) > abs(dy):
+                    step_x = copysign(move_speed, dx)
+                    if dy:
+                        slide = (0.0, copysign(move_speed, dy))
+                elif dx or dy:
+                    step_y = copysign(move_speed, dy)
+                    if dx:
+                        slide = (copysign(move_speed, dx), 0.0)
+
+            # ---ПЕРЕМЕЩЕНИЕ С КОЛЛИЗИЯМИ---
+            moved = False
+            if step_x or step_y:
+                box = hit_box_extent(monster, x, y)
+                x, y, normal_x, normal_y = sweep_box(collision_grid, x, y, box, step_x, step_y)
+
+                if wandering:
+                    # Упёрлись в стену - разворачиваемся, чтобы не биться в неё каждый кадр
+                    if normal_x:
+                        dir_x = -dir_x
+                    if normal_y:
+                        dir_y = -dir_y
+                elif (normal_x or normal_y) and slide:
+                    # Скользим вдоль стены по второй оси
+                    x, y, _, _ = sweep_box(collision_grid, x, y, box, slide[0], slide[1])
+                    dir_x, dir_y = slide
+                else:
+                    dir_x, dir_y = step_x, step_y
+                moved = True
+            elif mode == MODE_CHASE or mode == MODE_RETURN:
+                # Уже в цели - стоим
+                dir_x, dir_y = 0, 0
+
+            # ---ЗАПИСЬ РЕЗУЛЬТАТА---
+            if moved:
+                monster.position = (x, y)
+                moved_creatures.append(monster)
+            monster.wander_direction = (dir_x, dir_y)
+
+            if mode == MODE_CHASE:
+                monster.current_state = "chase"
+            elif mode == MODE_RETURN:
+                monster.current_state = "idle" if _contains(zone, x, y) else "return"
+            elif wandering:
+                monster.can_start_dialogue = mode == MODE_DIALOGUE
+                monster.current_state = "return" if moved and not _contains(zone, x, y) else "idle"
+
+            monster.wander_timer = timer - elapsed
+            if monster.return_timer > 0:
+                monster.return_timer -= elapsed
+
+        return moved_creatures
+
+    @staticmethod
+    def _zone_bounds(monster):
+        """(left, bottom, right, top) зоны существа или None, если зоны нет (кэш до смены zone_rect)"""
+        zone_rect = monster.zone_rect
+        if not zone_rect:
+            return None
+        cached = monster.zone_extent
+        if cached is None or cached[0] is not zone_rect:
+            cached = monster.zone_extent = (zone_rect, zone_bounds(zone_rect))
+        return cached[1]
+
+    @staticmethod
+    def _hit_box_extent(monster, x: float, y: float):
+        """
+        Прямоугольник хитбокса относительно позиции (left, bottom, right, top).
+        Пересчитывается, только если у хитбокса сменились точки (текстура), масштаб или угол
+        """
+        hit_box = monster.hit_box
+        points, scale, angle = hit_box.points, hit_box.scale, hit_box.angle
+        cached = monster.hit_box_extent
+        if cached is not None and cached[0] is points and cached[1] == scale and cached[2] == angle:
+            return cached[3]
+
+        adjusted = hit_box.get_adjusted_points()
+        box = (min(p[0] for p in adjusted) - x, min(p[1] for p in adjusted) - y,
+               max(p[0] for p in adjusted) - x, max(p[1] for p in adjusted) - y)
+        monster.hit_box_extent = (points, scale, angle, box)
+        return box
+
+
+def _contains(bounds, x: float, y: float) -> bool:
+    """Находится ли точка в зоне (без зоны - везде можно)"""
+    if bounds is None:
+        return True
+    left, bottom, right, top = bounds
+    return left <= x <= right and bottom <= y <= top
@@ -0,0 +1,198 @@
+import logging
+from array import array
+from typing import Dict, List, Optional
+
+from ..core.game_data import game_data
+
+
+class CreatureStore:
+    """
+    Состояние существ в колонках (структура массивов): одна колонка array на характеристику,
+    существо - индекс (слот) во всех колонках. Словари mobs_data в GameData
+    обновляются только при освобождении слота и перед сохранением.
+    """
+
+    # {характеристика: (тип array, значение по умолчанию)}
+    COLUMNS = {
+        "health": ("q", 0),
+        "max_health": ("q", 100),
+        "damage": ("q", 0),
+        "speed": ("d", 0.0),
+        "chase_speed": ("d", 0.0),
+        "vision_range": ("d", 0.0),
+        "is_alive": ("b", 1),
+        "behavior": ("B", 0),
+    }
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.columns: Dict[str, array] = {name: array(typecode) for name, (typecode, _) in self.COLUMNS.items()}
+
+        # Поведение хранится кодом: индекс в списке строк
+        self.behaviors: List[str] = ["passive"]
+        self._behavior_codes: Dict[str, int] = {"passive": 0}
+
+        # {слот: (id сущности, словарь данных в GameData)}
+        self._records: Dict[int, tuple] = {}
+        # {id сущности: слот}
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+
+        game_data.add_save_hooks(before_save=self.sync, after_load=self.reload, before_snapshot=self.sync_dirty)
+
+    def __len__(self):
+        return len(self._records)
+
+    # ---СЛОТЫ---
+    def acquire(self, entity_id: str, data: dict) -> int:
+        """Выделяет слот под существо и заполняет его из словаря данных"""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self.columns["health"])
+            for name, column in self.columns.items():
+                column.append(self.COLUMNS[name][1])
+
+        self._records[slot] = (entity_id, data)
+        self._slots[entity_id] = slot
+        self._load(slot, data)
+        return slot
+
+    def release(self, slot: int):
+        """Возвращает данные слота в словарь и освобождает слот"""
+        if slot not in self._records:
+            return
+        self._store(slot)
+        entity_id, _ = self._records.pop(slot)
+        if self._slots.get(entity_id) == slot:
+            del self._slots[entity_id]
+        self._free.append(slot)
+
+    def _load(self, slot: int, data: dict):
+        columns = self.columns
+        columns["health"][slot] = int(data.get("health", 0))
+        columns["max_health"][slot] = int(data.get("max_health", 100))
+        columns["damage"][slot] = int(data.get("damage", 0))
+        columns["speed"][slot] = float(data.get("speed") or 0)
+        columns["chase_speed"][slot] = float(data.get("chase_speed", data.get("speed")) or 0)
+        columns["vision_range"][slot] = float(data.get("vision_range") or 0)
+        columns["is_alive"][slot] = 1 if data.get("is_alive", True) else 0
+        columns["behavior"][slot] = self.behavior_code(data.get("behavior", "passive"))
+
+    def _store(self, slot: int):
+        _, data = self._records[slot]
+        columns = self.columns
+        for name in ("health", "max_health", "damage"):
+            data[name] = columns[name][slot]
+        for name in ("speed", "chase_speed", "vision_range"):
+            value = columns[name][slot]
+            data[name] = int(value) if value.is_integer() else value
+        data["is_alive"] = bool(columns["is_alive"][slot])
+        data["behavior"] = self.behaviors[columns["behavior"][slot]]
+
+    # ---СИНХРОНИЗАЦИЯ С GameData---
+    def sync(self):
+        """Записывает колонки обратно в словари mobs_data (перед сохранением)"""
+        for slot in self._records:
+            self._store(slot)
+
+    def sync_dirty(self, dirty: dict):
+        """Записывает в словари только изменённых существ (перед снимком автосохранения)"""
+        for entity_id in dirty.get("mobs", ()):
+            slot = self._slots.get(entity_id)
+            if slot is not None:
+                self._store(slot)
+
+    def reload(self):
+        """Перечитывает колонки из словарей GameData (после загрузки сохранения)"""
+        for slot, (entity_id, data) in list(self._records.items()):
+            new_data = game_data.get_entity_data(entity_id)
+            if new_data is None:
+                continue
+            self._records[slot] = (entity_id, new_data)
+            self._load(slot, new_data)
+
+    def get_data(self, slot: int) -> Optional[dict]:
+        record = self._records.get(slot)
+        return record[1] if record else None
+
+    # ---ПОВЕДЕНИЕ---
+    def behavior_code(self, behavior: str) -> int:
+        code = self._behavior_codes.get(behavior)
+        if code is None:
+            code = len(self.behaviors)
+            self.behaviors.append(behavior)
+            self._behavior_codes[behavior] = code
+        return code
+
+
+class StoreColumn:
+    """
+    Свойство существа - тонкое представление колонки CreatureStore (по слоту существа).
+    Без слота (существо уже удалено) читает и пишет словарь данных, как раньше
+    """
+
+    def __init__(self, column: str, cast=None):
+        self.column = column
+        self.cast = cast
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if obj.slot is None:
+            return obj.data.get(self.column, CreatureStore.COLUMNS[self.column][1])
+        return creature_store.columns[self.column][obj.slot]
+
+    def __set__(self, obj, value):
+        obj.data_source.mark_entity_dirty(obj.entity_id)
+        if obj.slot is None:
+            obj.data[self.column] = value
+            return
+        creature_store.columns[self.column][obj.slot] = self.cast(value) if self.cast else value
+
+
+class BehaviorColumn(StoreColumn):
+    """Поведение: в колонке хранится код строки"""
+
+    def __init__(self):
+        super().__init__("behavior")
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if obj.slot is None:
+            return obj.data.get("behavior", "passive")
+        return creature_store.behaviors[creature_store.columns["behavior"][obj.slot]]
+
+    def __set__(self, obj, value):
+        obj.data_source.mark_entity_dirty(obj.entity_id)
+        if obj.slot is None:
+            obj.data["behavior"] = value
+            return
+        creature_store.columns["behavior"][obj.slot] = creature_store.behavior_code(value)
+
+
+class AliveColumn(StoreColumn):
+    """Жив ли: в колонке хранится 0/1"""
+
+    def __init__(self):
+        super().__init__("is_alive")
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if obj.slot is None:
+            return obj.data.get("is_alive", True)
+        return creature_store.columns["is_alive"][obj.slot] != 0
+
+    def __set__(self, obj, value):
+        obj.data_source.mark_entity_dirty(obj.entity_id)
+        if obj.slot is None:
+            obj.data["is_alive"] = value
+            return
+        creature_store.columns["is_alive"][obj.slot] = 1 if value else 0
+
+
+# Глобальный экземпляр
+creature_store = CreatureStore()
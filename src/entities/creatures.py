@@ -1,23 +1,35 @@
-import math
-import random
-from random import randint
 from typing import Tuple
 
-import arcade
-
 from config.creature_config import CreatureConfig as MC
 from .base_entity import Entity
+from .creature_store import AliveColumn, BehaviorColumn, CreatureStore, StoreColumn, creature_store
 from ..core.asset_loader import AssetLoader
 from ..core.resource_manager import resource_manager
 from ..core.game_data import game_data
 from ..ui.health_bar import HealthBar
 from ..ui.notification_system import notifications as ns
+from ..ui.text_cache import text_cache
 from config import constants as C
 
 
 class Creature(Entity):
     """Простой монстр"""
 
+    # Горячие характеристики живут в колонках CreatureStore, а не в словаре GameData
+    slot = None
+    # Прямоугольник хитбокса относительно позиции: (точки, масштаб, угол, (left, bottom, right, top))
+    hit_box_extent = None
+    # Границы зоны: (zone_rect, (left, bottom, right, top))
+    zone_extent = None
+    health = StoreColumn("health", int)
+    max_health = StoreColumn("max_health", int)
+    damage = StoreColumn("damage", int)
+    speed = StoreColumn("speed", float)
+    chase_speed = StoreColumn("chase_speed", float)
+    vision_range = StoreColumn("vision_range", float)
+    behavior = BehaviorColumn()
+    is_alive = AliveColumn()
+
     def __init__(self, creature_id: str, mob_name: str, creature_type: str, position: list[float], properties=None,
                  scale=1.0):
         # Грузим текстуру
@@ -65,6 +77,9 @@ class Creature(Entity):
             scale=scale
         )
 
+        # Слот в колонках CreatureStore
+        self.slot = creature_store.acquire(creature_id, self.data)
+
         # Инициализация анимации
         self.texture_indexes = {
             "up": 0,  # текстуры 0 и 1
@@ -121,13 +136,17 @@ class Creature(Entity):
 
         self.can_start_dialogue = False
 
+        # Последний известный результат проверки прямой видимости
+        self.saw_player = False
+
     def _load_properties_from_data(self):
         """Загружает свойства из GameData"""
         data = self.data_source.get_entity_data(self.entity_id)
         if data:
             # Устанавливаем свойства как атрибуты
             for key, value in data.items():
-                if key not in ["id", "type", "position"]:  # Исключаем базовые поля
+                # Исключаем базовые поля и то, что уже лежит в CreatureStore
+                if key not in ["id", "type", "position"] and key not in CreatureStore.COLUMNS:
                     setattr(self, key, value)
 
             # Если монстр мертв - скрываем
@@ -190,233 +209,36 @@ class Creature(Entity):
 
         return False  # Ничего не произошло
 
-    def update(self, delta_time: float = 1 / 60, player=None, collision_layer=None):
-        """Обновление с поддержкой поведения"""
-        super().update(delta_time)
-
-        # Определяем направление движения (для анимации)
-        dx, dy = self.wander_direction
-        current_direction = None
-        if abs(dx) > abs(dy):
-            current_direction = "right" if dx > 0 else "left"
-        elif dy != 0:
-            current_direction = "up" if dy > 0 else "down"
-
-        # Обновляем анимацию
-        self._update_animation(delta_time, current_direction)
-
-        # Обновляем полоску здоровья
-        self.health_bar.x = self.center_x
-        self.health_bar.y = self.center_y + self.height
-
-        # Основная логика поведения
-        if self.can_see_player(player):
-            if self.behavior == "aggressive":
-                self.current_state = "chase"
-                self._chase_player(player, delta_time, collision_layer)
-            if self.behavior == "passive" and self.can_dialogue:
-                self.can_start_dialogue = True
-                self.current_state = "idle"
-                self._wander_behavior(delta_time, collision_layer)
-        elif not self._is_point_in_zone():
-            self.current_state = "return"
-            self._return_to_zone(delta_time)
-        else:
-            self.current_state = "idle"
-            self.can_start_dialogue = False
-            self._wander_behavior(delta_time, collision_layer)
-
-        # Обновляем таймеры
-        self.wander_timer -= delta_time
+    def fast_forward(self, elapsed: float):
+        """Прокручивает таймеры за время сна (без движения и проверок коллизий)"""
+        self.time_elapsed += elapsed
+        self.wander_timer -= elapsed
         if self.return_timer > 0:
-            self.return_timer -= delta_time
+            self.return_timer = max(0, self.return_timer - elapsed)
 
     def draw(self):
-
-        self.health_bar.draw()
+        """Отладочная информация (полоска здоровья рисуется общим HealthBarBatch)"""
         self._draw_debug()
 
     def _draw_debug(self):
         if C.debug_mode:
-            arcade.Text(
+            text_cache.draw(
+                ("creature_debug", id(self)),
                 f"{self.behavior} {self.name}({self.zone_id}): {self.current_state}",
                 x=self.center_x,
                 y=self.center_y - self.height,
                 anchor_x="center",
                 align="center",
                 font_size=15
-            ).draw()
-
-    def _chase_player(self, player, delta_time, collision_layer=None):
-        """Преследование игрока с коллизиями и движением по 4 направлениям"""
-        if not hasattr(self, 'chase_speed') or not player:
-            self.chase_speed = self.speed
-            return
-
-        # Определяем направление (только 4 стороны)
-        direction = self._get_cardinal_direction_to_player(player)
-        if not direction:
-            return
-
-        # Вычисляем смещение
-        speed = self.chase_speed * delta_time * 60
-
-        dx, dy = 0, 0
-        if direction == "up":
-            dy = speed
-        elif direction == "down":
-            dy = -speed
-        elif direction == "left":
-            dx = -speed
-        elif direction == "right":
-            dx = speed
-
-        # Перемещаемся с проверкой коллизий
-        self._move_with_collision(dx, dy, collision_layer)
-
-        # Обновляем направление для анимации
-        self.wander_direction = (dx, dy)
-
-    def _move_with_collision(self, dx, dy, collision_layer):
-        """Перемещение с проверкой коллизий"""
-        old_x, old_y = self.center_x, self.center_y
-
-        # Пробуем переместиться
-        self.center_x += dx
-        self.center_y += dy
-
-        # Проверяем коллизию
-        if collision_layer and arcade.check_for_collision_with_list(self, collision_layer):
-            # Если есть коллизия - возвращаем на старое место
-            self.center_x = old_x
-            self.center_y = old_y
-            return False
-
-        return True
-
-    def _get_cardinal_direction_to_player(self, player):
-        """Определяет направление к игроку по 4 сторонам (без диагоналей)"""
-        if not player:
-            return None
-
-        dx = player.center_x - self.center_x
-        dy = player.center_y - self.center_y
-
-        # Выбираем преобладающее направление
-        if abs(dx) > abs(dy):
-            # Горизонтальное направление сильнее
-            return "right" if dx > 0 else "left"
-        else:
-            # Вертикальное направление сильнее
-            return "up" if dy > 0 else "down"
-
-    def _return_to_zone(self, delta_time, collision_layer=None):
-        """Возврат в свою зону с коллизиями"""
-        # Определяем целевую позицию в зоне (центр зоны)
-        zone_x, zone_y, zone_w, zone_h = self.zone_rect
-        target_x = zone_x + zone_w / 2
-        target_y = zone_y + zone_h / 2
-
-        # Вычисляем направление к центру зоны (по 4 сторонам)
-        dx = target_x - self.center_x
-        dy = target_y - self.center_y
-
-        # Выбираем преобладающее направление
-        if abs(dx) > abs(dy):
-            direction = "right" if dx > 0 else "left"
-        else:
-            direction = "up" if dy > 0 else "down"
-
-        # Вычисляем смещение
-        return_speed = getattr(self, 'speed', 1.5)
-        speed = return_speed * delta_time * 60
-
-        dx_move, dy_move = 0, 0
-        if direction == "up":
-            dy_move = speed
-        elif direction == "down":
-            dy_move = -speed
-        elif direction == "left":
-            dx_move = -speed
-        elif direction == "right":
-            dx_move = speed
-
-        # Перемещаемся
-        moved = self._move_with_collision(dx_move, dy_move, collision_layer)
-        self.wander_direction = (dx_move, dy_move)
-
-        # Если вернулись в зону, сбрасываем состояние
-        if self._is_point_in_zone():
-            self.current_state = "idle"
-
-    def _wander_behavior(self, delta_time, collision_layer=None):
-        """Случайное блуждание в зоне с коллизиями"""
-        if self.wander_timer <= 0:
-            # Выбираем случайное направление из 4 возможных
-            directions = ["up", "down", "left", "right", None]  # None - стоять на месте
-            direction = random.choice(directions)
-
-            if direction:
-                if direction == "up":
-                    self.wander_direction = (0, self.speed)
-                elif direction == "down":
-                    self.wander_direction = (0, -self.speed)
-                elif direction == "left":
-                    self.wander_direction = (-self.speed, 0)
-                elif direction == "right":
-                    self.wander_direction = (self.speed, 0)
-            else:
-                self.wander_direction = (0, 0)
-
-            self.wander_timer = random.uniform(1.0, 3.0)
-
-        # Двигаемся в выбранном направлении с коллизиями
-        dx = self.wander_direction[0] * delta_time * 60
-        dy = self.wander_direction[1] * delta_time * 60
-
-        if dx != 0 or dy != 0:
-            self._move_with_collision(dx, dy, collision_layer)
+            )
 
-            # Проверяем, не вышел ли за зону
-            if not self._is_point_in_zone():
-                self.current_state = "return"
-
-
-    def _update_behavior(self, delta_time, player, collision_layer):
+    def _update_behavior(self, delta_time, player, collision_grid):
         """Обновляет поведение монстра"""
         # Базовое поведение
         # Пока просто стоим на месте
         pass
 
 
-    def _is_point_in_zone(self):
-        """Проверяет, находится ли точка в зоне монстра"""
-        if not self.zone_rect:
-            return True  # Если зоны нет, считаем что везде можно
-
-        zone_x, zone_y, zone_w, zone_h = self.zone_rect
-        zone_h = abs(zone_h)
-        zone_y -= zone_h
-
-        return (zone_x <= self.center_x <= zone_x + zone_w and
-                zone_y <= self.center_y <= zone_y + zone_h)
-
-
-    def can_see_player(self, player) -> bool:
-        """Может ли монстр видеть игрока"""
-        if not player:
-            return False
-
-        distance = self._get_distance_to_player(player)
-
-        # Проверяем зрение
-        if distance > self.vision_range:
-            return False
-
-        # TODO: Добавить проверку на препятствия (стены)
-        return True
-
-
     def _get_distance_to_player(self, player):
         """Расстояние до игрока"""
         return ((self.center_x - player.center_x) ** 2 +
@@ -475,27 +297,9 @@ class Creature(Entity):
             self.set_texture(self.cur_texture_index)
 
 
-    @property
-    def chase_speed(self):
-        """Читаем из GameData, не копируем"""
-        data = self.data_source.get_entity_data(self.entity_id)
-        return data.get("chase_speed", self.speed)
-
-
-    @chase_speed.setter
-    def chase_speed(self, value):
-        data = self.data_source.get_entity_data(self.entity_id)
-        data["chase_speed"] = value
-
-
-    @property
-    def vision_range(self):
-        """Читаем из GameData, не копируем"""
-        data = self.data_source.get_entity_data(self.entity_id)
-        return data.get("vision_range")
-
-
-    @vision_range.setter
-    def vision_range(self, value):
-        data = self.data_source.get_entity_data(self.entity_id)
-        data["vision_range"] = value
+    def release_slot(self):
+        """Возвращает характеристики в GameData и освобождает слот в CreatureStore"""
+        if self.slot is not None:
+            creature_store.release(self.slot)
+            self.data = game_data.get_entity_data(self.entity_id) or self.data
+            self.slot = None
@@ -2,8 +2,16 @@ import logging
 import arcade
 from typing import Dict, List
 from .base_entity import Entity
+from .creature_ai import CreatureBatchAI
 from .creatures import Creature
+from .lod_scheduler import LODScheduler
+from .swap_list import SwapRemoveList
 from ..core.game_data import game_data
+from ..ui.text_cache import text_cache
+from ..world.spatial_grid import SpatialGrid
+from ..world.pathfinding import Pathfinder
+from ..world.line_of_sight import LineOfSight
+from config import constants as C
 
 
 class EntityManager:
@@ -12,27 +20,74 @@ class EntityManager:
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.entities: Dict[str, Entity] = {}  # Все сущности по ID
-        self.mob: List[Creature] = []  # Только монстры
+        self.mob: SwapRemoveList[Creature] = SwapRemoveList()  # Только монстры (удаление за O(1))
+        # id сущностей, которые уберутся в конце тика (flush_removals)
+        self._pending_removals: Dict[str, None] = {}
+        # Монстры по картам: {карта: SpriteList} (сразу годится для отрисовки)
+        self.map_mobs: Dict[str, arcade.SpriteList] = {}
         self.current_map_name = None
 
+        # Пространственный индекс монстров (отдельная сетка на каждую карту)
+        self.cell_size = C.TILE_SIZE * 4
+        self.spatial_grids: Dict[str, SpatialGrid] = {}
+
+        # Радиусы для выборки соседей
+        self.contact_radius = C.TILE_SIZE * 2
+        self.max_vision_range = 0
+
+        # Уровни детализации симуляции
+        self.lod = LODScheduler()
+
+        # Пакетный шаг ИИ всех запланированных на тик существ
+        self.ai = CreatureBatchAI()
+
+        # Поиск пути и прямая видимость (пересоздаются при смене сетки коллизий)
+        self.pathfinder = None
+        self.line_of_sight = None
+
     def set_current_map(self, map_name: str):
         """Устанавливает текущую карту и очищает визуальные монстры"""
         self.current_map_name = map_name
         self.logger.info(f"Установлена карта: {map_name}")
 
     def get_monsters_for_current_map(self):
-        """Возвращает монстров только для текущей карты (на основе данных в GameData)"""
+        """Монстры текущей карты (общий SpriteList реестра - не изменять)"""
         if not self.current_map_name:
             return []
+        return self.get_map_mobs(self.current_map_name)
 
-        current_map_monsters = []
-
-        for monster in self.mob:
-            # Простая проверка по ID - если в ID есть имя текущей карты
-            if self.current_map_name in monster.entity_id:
-                current_map_monsters.append(monster)
+    def get_map_mobs(self, map_name: str) -> arcade.SpriteList:
+        """
+        SpriteList монстров карты (создаёт при первом обращении).
+        Пополняется в spawn_monster, а удалённые монстры покидают его сами (remove_from_sprite_lists)
+        """
+        sprite_list = self.map_mobs.get(map_name)
+        if sprite_list is None:
+            sprite_list = arcade.SpriteList()
+            self.map_mobs[map_name] = sprite_list
+        return sprite_list
+
+    def _get_grid(self, map_name: str) -> SpatialGrid:
+        """Возвращает сетку карты (создаёт при первом обращении)"""
+        grid = self.spatial_grids.get(map_name)
+        if grid is None:
+            grid = SpatialGrid(self.cell_size)
+            self.spatial_grids[map_name] = grid
+        return grid
+
+    def query_radius(self, x: float, y: float, radius: float, map_name: str = None) -> List[Creature]:
+        """Монстры в радиусе от точки (по умолчанию - на текущей карте)"""
+        grid = self.spatial_grids.get(map_name or self.current_map_name)
+        if grid is None:
+            return []
+        return grid.query_radius(x, y, radius)
 
-        return current_map_monsters
+    def query_rect(self, left: float, bottom: float, right: float, top: float, map_name: str = None) -> List[Creature]:
+        """Монстры внутри прямоугольника (по умолчанию - на текущей карте)"""
+        grid = self.spatial_grids.get(map_name or self.current_map_name)
+        if grid is None:
+            return []
+        return grid.query_rect(left, bottom, right, top)
 
     def spawn_monster(self, mob_id: str, mob_name: str, mob_type: str, position, properties=None, map_name: str = None):
         """
@@ -64,7 +119,7 @@ class EntityManager:
         )
 
         # Находим ближайшую зону
-        nearest_zone = game_data.find_nearest_zone(position[0], position[1])
+        nearest_zone = game_data.find_nearest_zone(position[0], position[1], map_name=map_name)
         if nearest_zone:
             monster_data["zone_id"] = nearest_zone["id"]
             monster_data["zone_rect"] = nearest_zone["rect"]
@@ -92,19 +147,81 @@ class EntityManager:
         game_data.add_mob(mob_id, monster_data)
 
         # Добавляем в менеджер
+        monster.map_name = map_name
         self.entities[mob_id] = monster
         self.mob.append(monster)
+        self.get_map_mobs(map_name).append(monster)
+        self._get_grid(map_name).insert(monster, monster.center_x, monster.center_y)
+        self.max_vision_range = max(self.max_vision_range, monster.vision_range or 0)
 
         self.logger.info(f"{mob_name} создан: {mob_id} на ({position[0]:.0f}, {position[1]:.0f})")
         return monster
 
-    def update_all(self, delta_time: float, player=None, collision_layer=None):
-        """Обновляет всех монстров"""
-        for monster in self.mob[:]:  # Копия списка для безопасного удаления
+    def update_all(self, delta_time: float, player=None, collision_grid=None, focus=None):
+        """
+        Единственное место, где обновляются монстры (один раз за тик).
+        focus: точка (x, y), от которой считаются радиусы LOD (обычно позиция камеры)
+
+        Возвращает результаты тика:
+            contacts - монстры, касающиеся игрока
+            dialogue - монстры, готовые начать диалог
+            deaths - id монстров, убранных из мира как мертвые (в конце тика)
+        """
+        result = {"contacts": [], "dialogue": [], "deaths": []}
+
+        if focus is None:
+            if not player:
+                self.flush_removals()
+                return result
+            focus = (player.center_x, player.center_y)
+
+        # Игрока видят только монстры рядом с ним - остальным его не передаём
+        watchers = set()
+        if player:
+            watchers = set(self.query_radius(player.center_x, player.center_y, self.max_vision_range))
+
+        # Поле потока к игроку общее для всех преследователей
+        pathfinder, line_of_sight = self._get_navigation(collision_grid)
+        if pathfinder and player:
+            pathfinder.update_flow_field(player.center_x, player.center_y)
+            line_of_sight.begin_frame(player.center_x, player.center_y)
+
+        focus_x, focus_y = focus
+        candidates = self.query_radius(focus_x, focus_y, self.lod.max_radius)
+
+        alive = []
+        for monster in candidates:
             if monster.is_alive:
-                monster.update(delta_time, player, collision_layer)
+                alive.append(monster)
             else:
-                self.remove_entity(monster.entity_id)
+                result["deaths"].append(monster.entity_id)
+                self.queue_removal(monster.entity_id)
+
+        scheduled = self.lod.schedule(alive, focus_x, focus_y, delta_time, len(self.mob))
+        moved = self.ai.step(scheduled, player, watchers, collision_grid, pathfinder, line_of_sight)
+        for monster in moved:
+            self._get_grid(monster.map_name).move(monster, monster.center_x, monster.center_y)
+
+        if player:
+            for monster in self.query_radius(player.center_x, player.center_y, self.contact_radius):
+                if monster.is_alive and monster.collides_with_sprite(player):
+                    result["contacts"].append(monster)
+
+            for monster in watchers:
+                if monster.is_alive and monster.can_start_dialogue:
+                    result["dialogue"].append(monster)
+
+        self.flush_removals()
+        return result
+
+    def _get_navigation(self, collision_grid):
+        """Возвращает поиск пути и проверку видимости для текущей сетки коллизий"""
+        if collision_grid is None:
+            return None, None
+        if self.pathfinder is None or self.pathfinder.grid is not collision_grid:
+            self.pathfinder = Pathfinder(collision_grid)
+            self.line_of_sight = LineOfSight(collision_grid)
+        return self.pathfinder, self.line_of_sight
 
     def remove_entity(self, entity_id: str):
         """Удаляет сущность"""
@@ -112,8 +229,12 @@ class EntityManager:
             entity = self.entities[entity_id]
 
             # Удаляем из списков
-            if isinstance(entity, Creature) and entity in self.mob:
-                self.mob.remove(entity)
+            if isinstance(entity, Creature) and self.mob.remove(entity):
+                grid = self.spatial_grids.get(entity.map_name)
+                if grid is not None:
+                    grid.remove(entity)
+                self.lod.forget(entity)
+                entity.release_slot()
 
             # Удаляем спрайт
             entity.remove_from_sprite_lists()
@@ -121,10 +242,24 @@ class EntityManager:
             # Удаляем из словаря
             del self.entities[entity_id]
 
-    def draw_debug(self):
-        """Отрисовывает отладочную информацию (зоны и радиусы)"""
-        from config import constants as C
+    def queue_removal(self, entity_id: str):
+        """Откладывает удаление сущности до конца тика (безопасно во время обхода монстров)"""
+        self._pending_removals[entity_id] = None
 
+    def flush_removals(self):
+        """Удаляет отложенные сущности: O(k) для k удалённых, а не O(N) на каждую"""
+        if not self._pending_removals:
+            return
+        pending = self._pending_removals
+        self._pending_removals = {}
+        for entity_id in pending:
+            self.remove_entity(entity_id)
+
+    def draw_debug(self, view_rect=None):
+        """
+        Отрисовывает отладочную информацию (зоны и радиусы).
+        view_rect: (left, bottom, right, top) видимой области - монстры за её пределами пропускаются
+        """
         if not C.show_area_mode:
             return
 
@@ -139,19 +274,24 @@ class EntityManager:
             )
 
             # Название зоны
-            arcade.Text(
+            text_cache.draw(
+                ("zone_debug", zone_id),
                 f"Zone: {zone_id}",
                 x + w / 2, y + h / 2,
                 arcade.color.YELLOW, 15,
                 anchor_x="center", anchor_y="center"
-            ).draw()
+            )
 
         # Рисуем информацию о монстрах
-        for monster in self.mob:
-
-            if game_data.get_entity_data(monster.entity_id)["map_name"] != self.current_map_name:
-                continue
-
+        if view_rect:
+            # Запас на радиус зрения, чтобы круги у края экрана не пропадали
+            left, bottom, right, top = view_rect
+            margin = self.max_vision_range
+            monsters = self.query_rect(left - margin, bottom - margin, right + margin, top + margin)
+        else:
+            monsters = list(self.spatial_grids.get(self.current_map_name, ()))
+
+        for monster in monsters:
             if monster.is_alive:
                 data = game_data.get_entity_data(monster.entity_id)
                 # Радиус агрессии
@@ -163,12 +303,13 @@ class EntityManager:
                     )
 
                 # ID и координаты
-                arcade.Text(
+                text_cache.draw(
+                    ("monster_debug", id(monster)),
                     data["id"],
                     monster.center_x, monster.center_y + monster.height+10,
                     arcade.color.WHITE, 15,
                     anchor_x="center"
-                ).draw()
+                )
 
                 # arcade.Text(
                 #     f"({int(monster.center_x)},{int(monster.center_y)})",
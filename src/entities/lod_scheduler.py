@@ -0,0 +1,104 @@
+import itertools
+import logging
+from typing import Dict, List, Tuple
+
+from config.creature_config import CreatureConfig as MC
+
+
+class LODScheduler:
+    """
+    Планировщик уровней детализации симуляции существ.
+    Близкие к камере существа обновляются каждый тик, средние - реже с накопленным delta_time,
+    дальние спят и ничего не стоят.
+    """
+
+    def __init__(self, tiers=None, dormant_mode: str = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Уровни по возрастанию радиуса: (имя, радиус, период в тиках)
+        self.tiers = sorted(tiers or MC.LOD_TIERS, key=lambda tier: tier[1])
+        self.dormant_mode = dormant_mode or MC.LOD_DORMANT_MODE
+
+        self.tick = 0
+        self.sim_time = 0.0
+
+        # Счётчики существ на каждом уровне за последний тик
+        self.counters: Dict[str, int] = {}
+        self._reset_counters()
+
+        # Время последнего обновления и фаза (чтобы редкие обновления не совпадали в один тик)
+        self._last_update: Dict[object, float] = {}
+        self._phases: Dict[object, int] = {}
+        self._phase_counter = itertools.count()
+
+        # Существа, которые не спали в прошлом тике
+        self._awake = set()
+
+    @property
+    def max_radius(self) -> float:
+        """Радиус, за которым существа спят"""
+        return self.tiers[-1][1]
+
+    def _reset_counters(self):
+        self.counters = {name: 0 for name, _, _ in self.tiers}
+        self.counters["dormant"] = 0
+
+    def schedule(self, candidates, focus_x: float, focus_y: float, delta_time: float,
+                 total: int = 0) -> List[Tuple[object, float]]:
+        """
+        Распределяет существ по уровням и возвращает тех, кого нужно обновить в этом тике.
+        candidates: существа в пределах max_radius от фокуса (из пространственного индекса)
+        total: общее число существ (для счётчика спящих)
+        Возвращает список (существо, delta_time для его обновления)
+        """
+        self.tick += 1
+        self.sim_time += delta_time
+        self._reset_counters()
+
+        scheduled = []
+        awake = set()
+
+        for monster in candidates:
+            dist_sq = (monster.center_x - focus_x) ** 2 + (monster.center_y - focus_y) ** 2
+            name, period = self._get_tier(dist_sq)
+            self.counters[name] += 1
+            awake.add(monster)
+
+            # Пробуждение: пропущенное время прокручиваем разом, а не одним огромным шагом
+            if monster not in self._awake:
+                self._wake(monster, delta_time)
+
+            phase = self._phases.setdefault(monster, next(self._phase_counter))
+            if (self.tick + phase) % period != 0:
+                continue
+
+            elapsed = self.sim_time - self._last_update[monster]
+            self._last_update[monster] = self.sim_time
+            scheduled.append((monster, elapsed))
+
+        self._awake = awake
+        self.counters["dormant"] = max(0, total - len(awake))
+        return scheduled
+
+    def _get_tier(self, dist_sq: float) -> Tuple[str, int]:
+        for name, radius, period in self.tiers:
+            if dist_sq <= radius * radius:
+                return name, max(1, period)
+        name, _, period = self.tiers[-1]
+        return name, max(1, period)
+
+    def _wake(self, monster, delta_time: float):
+        """Будит существо, учитывая время сна"""
+        last = self._last_update.get(monster)
+        if last is not None:
+            skipped = self.sim_time - delta_time - last
+            if skipped > 0 and self.dormant_mode == "fast_forward":
+                monster.fast_forward(skipped)
+
+        self._last_update[monster] = self.sim_time - delta_time
+
+    def forget(self, monster):
+        """Удаляет существо из планировщика"""
+        self._last_update.pop(monster, None)
+        self._phases.pop(monster, None)
+        self._awake.discard(monster)
@@ -5,6 +5,7 @@ from .base_entity import Entity
 from .creatures import Creature
 from config import constants as C
 from ..core.game_data import game_data
+from ..world.movement import move_and_collide
 
 
 class Player(Entity):
@@ -37,6 +38,9 @@ class Player(Entity):
         # Инициализируем текстуру
         self.set_texture(self.cur_texture_index)
 
+        # Нормаль последнего контакта со стеной
+        self.contact_normal = (0, 0)
+
 
 
     @property
@@ -83,29 +87,24 @@ class Player(Entity):
             self.last_direction = current_direction
 
         # Перемещение с учетом коллизий
-        collision_layer = kwargs.get('collision_layer')
+        collision_grid = kwargs.get('collision_grid')
 
-        self._move_with_tiled_collision(collision_layer, dx, dy)
+        self._move_with_tiled_collision(collision_grid, dx, dy)
         self._update_ghost_appearance()
 
-    def _move_with_tiled_collision(self, collision_layer, dx, dy):
+    def _move_with_tiled_collision(self, collision_grid, dx, dy):
         """
         метод коллизий.
+        Оси X и Y обрабатываются раздельно - у стены игрок скользит вдоль неё.
         """
         # Если режим призрака
         if C.ghost_mode:
             self.center_x += dx
             self.center_y += dy
+            self.contact_normal = (0, 0)
             return
 
-        # Сохраняем старую позицию
-        old_x, old_y = self.center_x, self.center_y
-
-        self.center_x += dx
-        self.center_y += dy
-        if arcade.check_for_collision_with_list(self, collision_layer):
-            self.center_x = old_x
-            self.center_y = old_y
+        self.contact_normal = move_and_collide(self, dx, dy, collision_grid)
 
     def _set_direction_texture(self, direction):
         """Сразу устанавливает первую текстуру направления"""
@@ -177,4 +176,5 @@ class Player(Entity):
     @strength.setter
     def strength(self, value):
         data = self.data_source.get_entity_data(self.entity_id)
-        data["strength"] = value
\ No newline at end of file
+        data["strength"] = value
+        self.data_source.mark_entity_dirty(self.entity_id)
\ No newline at end of file
@@ -0,0 +1,51 @@
+from typing import Dict, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SwapRemoveList(Generic[T]):
+    """
+    Плотный массив с удалением за O(1): на место удаляемого элемента встаёт последний.
+    Индекс каждого элемента хранится в словаре, поэтому проверка "есть ли" тоже O(1).
+    Порядок элементов при удалении не сохраняется.
+    """
+
+    def __init__(self):
+        self._items: List[T] = []
+        # {элемент: индекс в _items}
+        self._index: Dict[T, int] = {}
+
+    def append(self, item: T):
+        if item in self._index:
+            return
+        self._index[item] = len(self._items)
+        self._items.append(item)
+
+    def remove(self, item: T) -> bool:
+        """Удаляет элемент. False - его и не было"""
+        index = self._index.pop(item, None)
+        if index is None:
+            return False
+
+        # Сравниваем по индексу: словарь ищет по равенству, и равный элемент может быть другим объектом
+        last = self._items.pop()
+        if index < len(self._items):
+            self._items[index] = last
+            self._index[last] = index
+        return True
+
+    def clear(self):
+        self._items.clear()
+        self._index.clear()
+
+    def __contains__(self, item) -> bool:
+        return item in self._index
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> T:
+        return self._items[index]
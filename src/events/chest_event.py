@@ -4,13 +4,23 @@ import arcade
 
 from ..core.game_data import game_data
 from ..ui.notification_system import notifications as ns
+from ..ui.text_cache import text_cache
 
 from .event import GameEvent
+from .event_registry import register_event
+from .event_state_store import event_states
 from src.entities.items.item_factory import ItemFactory
 
+
+@register_event
 class ChestEvent(GameEvent):
     """Событие сундука"""
 
+    tiled_type = "chest"
+    state_schema = {"is_empty": "?"}
+    interaction = "select"
+    draws_names = True
+
     def __init__(self, event_id: str, name: str, rect: tuple, properties: Dict[str, Any]):
         super().__init__(event_id, name,"chest", rect, properties)
         # Ссылка на спайт
@@ -21,11 +31,9 @@ class ChestEvent(GameEvent):
         # Парсим свойства
         self.lock_sequence = properties.get("lock", "")
         self.is_locked = len(self.lock_sequence) > 0
-        self.is_empty = False
+        self._is_empty = False
         self.player_sequence = ""
 
-        self.map_name = None
-
         # Добыча
         loot_str = properties.get("loot", "")
         self.loot_items = ItemFactory.parse_loot_string(loot_str)
@@ -51,8 +59,21 @@ class ChestEvent(GameEvent):
                                         player=player)
         else:
             self._open_chest(player)
-        self.activated = True
-        self.cooldown = self.max_cooldown
+        self.start_cooldown()
+
+    @property
+    def is_empty(self) -> bool:
+        return self._is_empty
+
+    @is_empty.setter
+    def is_empty(self, value: bool):
+        """Визуал сундука обновляется только при смене состояния, а не каждый кадр"""
+        value = bool(value)
+        if value == self._is_empty:
+            return
+        self._is_empty = value
+        if self.sprite:
+            self.sprite.update_visual()
 
 
     def draw_names(self):
@@ -62,7 +83,8 @@ class ChestEvent(GameEvent):
             if self.is_empty:
                 color = arcade.color.TAN
             """"""
-            arcade.Text(
+            text_cache.draw(
+                ("chest_name", id(self)),
                 text,
                 self.sprite_center_x,
                 self.sprite_center_y+  self.sprite_height*0.8,
@@ -72,7 +94,7 @@ class ChestEvent(GameEvent):
                 anchor_x="center",
                 anchor_y="center",
                 bold=True
-            ).draw()
+            )
             self.show_text_description = False
 
 
@@ -85,6 +107,8 @@ class ChestEvent(GameEvent):
         self.sprite_height = self.sprite.height
         if sprite:
             sprite.event = self  # Двусторонняя связь
+            if self.is_empty:
+                sprite.update_visual()
 
     def _open_chest(self, player):
         """Открыть сундук и выдать добычу"""
@@ -92,12 +116,9 @@ class ChestEvent(GameEvent):
         for item in self.loot_items:
             self._add_to_inventory(item)
 
+        # Визуал спрайта обновит сеттер is_empty
         self.is_empty = True
 
-        # Обновляем визуал если есть спрайт
-        if self.sprite:
-            self.sprite.update_visual()
-
         # Сохраняем состояние
         self._save_state()
         print(player.inventory)
@@ -105,17 +126,8 @@ class ChestEvent(GameEvent):
 
 
     def _save_state(self):
-        """Сохраняет состояние сундука"""
-
-        # Создаем или обновляем данные о сундуке
-        chest_data = {
-                "id": self.event_id,
-                "type": "chest",
-                "is_empty": self.is_empty,
-                "map_name": self.map_name
-            }
-            # Можно сохранить в monsters_data или создать отдельное хранилище
-        game_data.mobs_data[self.event_id] = chest_data #TODO
+        """Сохраняет состояние сундука (в хранилище состояний событий, а не в mobs_data)"""
+        event_states.save(self)
 
     def _add_to_inventory(self, item):
         """Добавляет предмет в инвентарь игрока через GameData"""
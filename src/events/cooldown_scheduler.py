@@ -0,0 +1,38 @@
+import heapq
+import itertools
+from typing import List, Tuple
+
+
+class CooldownScheduler:
+    """
+    Планировщик окончаний кулдаунов событий: мин-куча (тик окончания, событие).
+    За тик обрабатываются только события, чей кулдаун истёк, - остальные ничего не стоят.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self._heap: List[Tuple[int, int, object]] = []
+        # Номер добавления - чтобы события с одинаковым тиком не сравнивались между собой
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, event, ticks: int):
+        """Кулдаун события закончится через ticks тиков (прошлая запись события устаревает)"""
+        until = self.tick + ticks
+        event.cooldown_until = until
+        heapq.heappush(self._heap, (until, next(self._counter), event))
+
+    def advance(self, ticks: int = 1):
+        """Следующий тик: завершает истёкшие кулдауны"""
+        self.tick += ticks
+        heap = self._heap
+        while heap and heap[0][0] <= self.tick:
+            until, _, event = heapq.heappop(heap)
+            # Запись устарела, если кулдаун с тех пор перезапускали
+            if event.cooldown_until == until:
+                event.end_cooldown()
+
+    def clear(self):
+        self._heap.clear()
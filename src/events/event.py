@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any
 from config import constants as C
+from src.ui.text_cache import text_cache
 
 import arcade
 
@@ -8,6 +9,15 @@ import arcade
 class GameEvent:
     """Базовый класс для игровых событий"""
 
+    # Тип объекта в Tiled, по которому EventRegistry создаёт событие этого класса
+    tiled_type: str = None
+    # Сохраняемое состояние: {атрибут: код struct} (хранится в EventStateStore)
+    state_schema: Dict[str, str] = {}
+    # Как срабатывает: "touch" - при касании, "select" - по кнопке взаимодействия
+    interaction = "touch"
+    # Рисует ли подписи (draw_names)
+    draws_names = False
+
     def __init__(self, event_id: str, name: str, event_type: str, rect: tuple, properties: Dict[str, Any] = None):
         self.logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
         self.show_text_description = False
@@ -18,9 +28,13 @@ class GameEvent:
         self.type = event_type  # "chest", "teleport", "dialogue"
         self.rect = rect  # (x, y, width, height)
         self.properties = properties or {}
+        self.map_name = None
         self.activated = False
         self.cooldown = 0
         self.max_cooldown = 30  # 0.5 секунды при 60 FPS
+        # Планировщик кулдаунов EventManager (без него кулдаун тикает в update) и тик окончания кулдауна
+        self.scheduler = None
+        self.cooldown_until = 0
 
         # координаты события
         self.x, self.y, self.width, self.height = self.rect
@@ -46,8 +60,20 @@ class GameEvent:
         """Активировать событие - будет переопределено"""
         pass
 
+    def start_cooldown(self):
+        """Событие сработало: повторно не активируется max_cooldown тиков"""
+        self.activated = True
+        self.cooldown = self.max_cooldown
+        if self.scheduler is not None:
+            self.scheduler.schedule(self, self.cooldown)
+
+    def end_cooldown(self):
+        """Кулдаун истёк (вызывается планировщиком)"""
+        self.cooldown = 0
+        self.activated = False
+
     def update(self, delta_time: float):
-        """Обновление кулдауна"""
+        """Обновление кулдауна по кадрам (для событий без планировщика)"""
         if self.cooldown > 0:
             self.cooldown -= 1
         if self.cooldown <= 0:
@@ -63,13 +89,14 @@ class GameEvent:
             C.DEEPSEEK_COLOR_TRANSLUCENT
         )
 
-        arcade.Text(
+        text_cache.draw(
+            ("event_debug", id(self)),
             self.name,
             self.x,
             self.center_y ,
             C.DEEPSEEK_COLOR,
             20
-        ).draw()
+        )
 
     def set_sprite(self, sprite):
         pass
@@ -0,0 +1,111 @@
+import math
+from typing import Dict, List, Tuple
+
+from config import constants as C
+from ..world.spatial_grid import SpatialGrid
+
+Cell = Tuple[int, int]
+
+
+class EventIndex:
+    """
+    Пространственный хэш событий карты.
+    Прямоугольник события лежит во всех ячейках, которые он накрывает (для проверки коллизий с игроком),
+    центры событий зарегистрированных типов - в SpatialGrid своего tiled_type
+    (для поиска ближайшего события типа, например сундука под спрайт).
+    Запросы возвращают события в порядке добавления, как при обходе списка events.
+    """
+
+    def __init__(self, cell_size: float = C.TILE_SIZE * 4):
+        self.cell_size = cell_size
+
+        # {ячейка: [событие, ...]}
+        self._cells: Dict[Cell, List] = {}
+        # {событие: порядковый номер добавления}
+        self._order: Dict[object, int] = {}
+        self._counter = 0
+
+        # Центры по типам из реестра: {tiled_type: SpatialGrid}
+        self._centers: Dict[str, SpatialGrid] = {}
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _covered_cells(self, left: float, bottom: float, right: float, top: float):
+        min_cx, min_cy = self._cell_of(left, bottom)
+        max_cx, max_cy = self._cell_of(right, top)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                yield cx, cy
+
+    @staticmethod
+    def _bounds(event):
+        x, y, width, height = event.rect
+        return min(x, x + width), min(y, y + height), max(x, x + width), max(y, y + height)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, event) -> bool:
+        return event in self._order
+
+    def add(self, event):
+        if event in self._order:
+            return
+        self._order[event] = self._counter
+        self._counter += 1
+
+        for cell in self._covered_cells(*self._bounds(event)):
+            self._cells.setdefault(cell, []).append(event)
+
+        # Тип берётся из класса события (EventRegistry), события без класса не индексируются
+        tiled_type = event.tiled_type
+        if tiled_type:
+            grid = self._centers.get(tiled_type)
+            if grid is None:
+                grid = self._centers[tiled_type] = SpatialGrid(self.cell_size)
+            grid.insert(event, event.center_x, event.center_y)
+
+    def remove(self, event):
+        if self._order.pop(event, None) is None:
+            return
+
+        for cell in self._covered_cells(*self._bounds(event)):
+            bucket = self._cells.get(cell)
+            if bucket and event in bucket:
+                bucket.remove(event)
+                if not bucket:
+                    del self._cells[cell]
+
+        grid = self._centers.get(event.tiled_type)
+        if grid is not None:
+            grid.remove(event)
+
+    def clear(self):
+        self._cells.clear()
+        self._order.clear()
+        self._centers.clear()
+
+    # ---ЗАПРОСЫ---
+    def query_rect(self, left: float, bottom: float, right: float, top: float) -> List:
+        """События, чьи ячейки пересекаются с прямоугольником (точная проверка - за вызывающим)"""
+        found = {}
+        for cell in self._covered_cells(left, bottom, right, top):
+            for event in self._cells.get(cell, ()):
+                found[event] = self._order[event]
+        return sorted(found, key=found.get)
+
+    def nearest(self, tiled_type: str, x: float, y: float, max_distance: float):
+        """Событие типа tiled_type с ближайшим центром не дальше max_distance (при равенстве - добавленное раньше)"""
+        grid = self._centers.get(tiled_type)
+        if grid is None:
+            return None
+
+        nearest = None
+        best_key = None
+        for event in grid.query_radius(x, y, max_distance):
+            key = ((x - event.center_x) ** 2 + (y - event.center_y) ** 2, self._order[event])
+            if best_key is None or key < best_key:
+                best_key = key
+                nearest = event
+        return nearest
@@ -1,12 +1,15 @@
 import logging
 
 import arcade
-from typing import List
+from typing import Dict, List
 from .event import GameEvent
-from .chest_event import ChestEvent
-from .teleport_event import TeleportEvent
+from .cooldown_scheduler import CooldownScheduler
+from .event_index import EventIndex
+from .event_registry import event_registry
+from .event_state_store import event_states
+# Модули типов событий регистрируют свои классы в event_registry при импорте
+from . import chest_event, teleport_event
 from config import constants as C
-from ..core.game_data import game_data
 from ..core.resource_manager import resource_manager
 
 
@@ -23,21 +26,27 @@ class EventManager:
 
         # Логика событий (зоны взаимодействия из event Layer)
         self.events: List[GameEvent] = []
+        # События по типам: {type: [событие, ...]}
+        self.events_by_type: Dict[str, List[GameEvent]] = {}
+        # События с подписями (рисуются в draw)
+        self.named_events: List[GameEvent] = []
+        # Пространственный хэш событий (коллизии с игроком и поиск ближайшего сундука)
+        self.index = EventIndex()
+        # Кулдауны событий: за тик обрабатываются только истёкшие
+        self.cooldowns = CooldownScheduler()
 
         # Визуальные спрайты (будут созданы из Tile Layer "chests_visual")
         self.chest_sprites = arcade.SpriteList()
 
-        # Словарь для сохранения состояния событий (можно сохранять в GameData или в файл)
-        self.event_states = {}  # {event_id: {"is_empty": bool, ...}}
-
-    def save_event_state(self, event_id: str, state_data: dict):
-        """Сохраняет состояние события"""
-        self.event_states[event_id] = state_data.copy()
-        self.logger.debug(f"Сохранено состояние для события {event_id}: {state_data}")
+        # Срабатывание событий по способу взаимодействия (interaction класса события)
+        self._interactions = {
+            "touch": self._interact_on_touch,
+            "select": self._interact_on_select,
+        }
 
     def get_event_state(self, event_id: str) -> dict:
         """Возвращает сохраненное состояние события"""
-        return self.event_states.get(event_id, {})
+        return event_states.get_state(event_id)
 
     def load_events_from_objects(self, object_list, scale: float = 1.0, map_name: str = None):
         """Загружает события (зоны взаимодействия) из events"""
@@ -45,12 +54,19 @@ class EventManager:
             event = self._create_event_from_object(obj, scale, i, map_name)
             if event:
                 # Восстанавливаем состояние из сохраненного
-                saved_state = self.get_event_state(event.event_id)
-                if saved_state:
-                    event.is_empty = saved_state.get("is_empty", False)
-                    event.logger.info(f"Восстановлено состояние для {event.event_id}: is_empty={event.is_empty}")
+                if event_states.restore(event):
+                    event.logger.info(f"Восстановлено состояние для {event.event_id}")
+
+                self.add_event(event)
 
-                self.events.append(event)
+    def add_event(self, event: GameEvent):
+        """Добавляет событие в список и в пространственный индекс"""
+        self.events.append(event)
+        self.index.add(event)
+        self.events_by_type.setdefault(event.type, []).append(event)
+        if event.draws_names:
+            self.named_events.append(event)
+        event.scheduler = self.cooldowns
 
     def _create_event_from_object(self, obj, scale: float, index: int, map_name: str = None):
         """Создаёт события"""
@@ -78,24 +94,10 @@ class EventManager:
             name = getattr(obj, 'name', '!')
             event_id = properties.get('id', f"{event_type}_{index}_{map_name or 'unknown'}")
 
-            # Создаем событие
-            if event_type == "chest":
-                event = ChestEvent(event_id, name, (x, y, width, height), properties)
-                event.map_name = map_name
-                # Восстанавливаем состояние из game_data
-                saved_data = game_data.mobs_data.get(event_id)
-                if saved_data and saved_data.get("is_empty", False):
-                    event.is_empty = True
-                    if event.sprite:
-                        event.sprite.update_visual()
-
-                return event
-            elif event_type == "teleport":
-                event = TeleportEvent(event_id, name, (x, y, width, height), properties)
-                return event
-            else:
-                event = GameEvent(event_id, name, event_type, (x, y, width, height), properties)
-                return event
+            # Создаем событие класса, зарегистрированного под этим типом
+            event = event_registry.create(event_type, event_id, name, (x, y, width, height), properties)
+            event.map_name = map_name
+            return event
 
         except Exception as e:
             self.logger.warning(f"Ошибка создания события {index}({name}): {e}")
@@ -106,30 +108,14 @@ class EventManager:
         if max_distance is None:
             max_distance = self.tile_size * 3
 
-        nearest_event = None
-        min_distance = float('inf')
-
-        for event in self.events:
-            if event.type == "chest":
-
-                # Вычисляем расстояние
-                distance = ((x - event.center_x) ** 2 + (y - event.center_y) ** 2) ** 0.5
-
-                if distance < min_distance and distance <= max_distance:
-                    min_distance = distance
-                    nearest_event = event
-
-        return nearest_event
+        return self.index.nearest(chest_event.ChestEvent.tiled_type, x, y, max_distance)
 
     def update(self, delta_time: float):
-        """Обновляет логику событий"""
-        for event in self.events:
-            event.update(delta_time)
-
-        # Обновляем визуалы сундуков
-        for sprite in self.chest_sprites:
-            if hasattr(sprite, 'update_visual'):
-                sprite.update_visual()
+        """
+        Обновляет логику событий: завершает истёкшие кулдауны.
+        Визуалы сундуков обновляются сами при смене is_empty, простаивающие события ничего не стоят
+        """
+        self.cooldowns.advance()
 
     def check_collisions(self, player, game_state):
         """Проверяет коллизии игрока с событиями"""
@@ -143,21 +129,28 @@ class EventManager:
             player.height
         )
 
-        for event in self.events:
+        # Только события из ячеек, которые накрывает игрок
+        px, py, pw, ph = player_rect
+        for event in self.index.query_rect(px, py, px + pw, py + ph):
             if event.check_collision(player_rect):
 
                 # ДЛЯ ВСЕХ СОБЫТИЙ проверяем дистанцию через общий метод
                 if self._is_player_close_enough(player, event):
-                    # Для сундуков проверяем кнопку взаимодействия
-                    if event.type == "chest":
-                        event.show_text_description = True
-                        if hasattr(player, 'input_manager') and player.input_manager:
-                            if player.input_manager.get_action('select'):
-                                event.activate(player, game_state)
-                                player.input_manager.reset_action("select")
-                    else:
-                        # Для других событий (телепортов) активируем сразу
-                        event.activate(player, game_state)
+                    self._interactions[event.interaction](event, player, game_state)
+
+    @staticmethod
+    def _interact_on_touch(event, player, game_state):
+        """События вроде телепортов срабатывают сразу"""
+        event.activate(player, game_state)
+
+    @staticmethod
+    def _interact_on_select(event, player, game_state):
+        """События вроде сундуков показывают подпись и ждут кнопку взаимодействия"""
+        event.show_text_description = True
+        if hasattr(player, 'input_manager') and player.input_manager:
+            if player.input_manager.get_action('select'):
+                event.activate(player, game_state)
+                player.input_manager.reset_action("select")
 
     def _is_player_close_enough(self, player, event) -> bool:
         """Проверяет, достаточно ли близко игрок к событию."""
@@ -175,9 +168,8 @@ class EventManager:
         """Отрисовывает визуальные элементы событий"""
         self.chest_sprites.draw()
 
-        for i in self.events:
-            if i.type == "chest":
-                i.draw_names()
+        for i in self.named_events:
+            i.draw_names()
 
         if C.show_area_mode:
             for i in self.events:
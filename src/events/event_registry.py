@@ -0,0 +1,46 @@
+import logging
+from typing import Dict, Type
+
+from .event import GameEvent
+
+
+class EventRegistry:
+    """
+    Реестр типов событий: класс события объявляет свой type из Tiled (tiled_type)
+    и схему сохраняемого состояния (state_schema), а создание по объекту карты
+    идёт через таблицу {type: класс} вместо цепочки if/elif.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.types: Dict[str, Type[GameEvent]] = {}
+
+    def register(self, event_class: Type[GameEvent]) -> Type[GameEvent]:
+        """Регистрирует класс события (можно использовать как декоратор)"""
+        tiled_type = event_class.tiled_type
+        if not tiled_type:
+            raise ValueError(f"{event_class.__name__}: не задан tiled_type")
+        if tiled_type in self.types and self.types[tiled_type] is not event_class:
+            self.logger.warning(f"Тип события '{tiled_type}' переопределён классом {event_class.__name__}")
+        self.types[tiled_type] = event_class
+        return event_class
+
+    def get(self, tiled_type: str) -> Type[GameEvent]:
+        """Класс события для типа из Tiled (неизвестные типы - базовый GameEvent)"""
+        return self.types.get(tiled_type, GameEvent)
+
+    def create(self, tiled_type: str, event_id: str, name: str, rect: tuple, properties: dict) -> GameEvent:
+        """Создаёт событие нужного класса"""
+        event_class = self.types.get(tiled_type)
+        if event_class is None:
+            return GameEvent(event_id, name, tiled_type, rect, properties)
+        return event_class(event_id, name, rect, properties)
+
+
+# Глобальный экземпляр
+event_registry = EventRegistry()
+
+
+def register_event(event_class: Type[GameEvent]) -> Type[GameEvent]:
+    """Декоратор: @register_event над классом события"""
+    return event_registry.register(event_class)
@@ -0,0 +1,206 @@
+import logging
+import struct
+from typing import Dict, Optional, Tuple
+
+from ..core import save_format
+from ..core.game_data import game_data
+
+MAGIC = b"EVST"
+VERSION = 1
+
+# Схема состояния: ((поле, код struct), ...)
+Schema = Tuple[Tuple[str, str], ...]
+
+
+class EventStateStore:
+    """
+    Хранилище состояний событий (открыт ли сундук и т.п.), отдельное от mobs_data.
+    Запись - кортеж значений по схеме state_schema класса события, в сохранение
+    уходит компактным бинарным блоком (game_data.event_state_data).
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # {id события: (тип события, значения по схеме)}
+        self.records: Dict[str, Tuple[str, tuple]] = {}
+        # {тип события: схема}
+        self.schemas: Dict[str, Schema] = {}
+
+        game_data.add_save_hooks(before_save=self.sync, after_load=self.reload, before_snapshot=self.sync_dirty)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, event_id) -> bool:
+        return event_id in self.records
+
+    # ---СОСТОЯНИЕ СОБЫТИЙ---
+    def save(self, event):
+        """Запоминает состояние события по схеме его класса"""
+        schema = tuple(event.state_schema.items())
+        if not schema:
+            return
+        self.schemas[event.type] = schema
+        self.records[event.event_id] = (event.type, tuple(getattr(event, name) for name, _ in schema))
+        game_data.mark_dirty("events")
+
+    def restore(self, event) -> bool:
+        """Применяет сохранённое состояние к событию. False - состояния нет"""
+        state = self.get_state(event.event_id)
+        if not state:
+            return False
+        for name in event.state_schema:
+            if name in state:
+                setattr(event, name, state[name])
+        return True
+
+    def get_state(self, event_id: str) -> dict:
+        """Состояние события словарём {поле: значение} (пустой, если его нет)"""
+        record = self.records.get(event_id)
+        if record is None:
+            return {}
+        event_type, values = record
+        return {name: value for (name, _), value in zip(self.schemas[event_type], values)}
+
+    def set_state(self, event_id: str, event_type: str, state: dict, schema: Optional[Schema] = None):
+        """Записывает состояние напрямую (без объекта события)"""
+        schema = schema or self.schemas.get(event_type)
+        if not schema:
+            raise ValueError(f"Нет схемы состояния для типа события '{event_type}'")
+        self.schemas[event_type] = schema
+        self.records[event_id] = (event_type, tuple(state.get(name) for name, _ in schema))
+        game_data.mark_dirty("events")
+
+    def clear(self):
+        self.records.clear()
+
+    # ---СЕРИАЛИЗАЦИЯ---
+    def to_bytes(self) -> bytes:
+        """
+        Бинарный блок: заголовок, таблица типов со схемами, затем записи
+        (индекс типа, id, значения struct по схеме)
+        """
+        type_names = sorted({event_type for event_type, _ in self.records.values()})
+        type_index = {name: i for i, name in enumerate(type_names)}
+
+        parts = [MAGIC, struct.pack("<BH", VERSION, len(type_names))]
+        for name in type_names:
+            schema = self.schemas[name]
+            parts.append(_pack_str(name))
+            parts.append(struct.pack("<B", len(schema)))
+            for field, code in schema:
+                parts.append(_pack_str(field))
+                parts.append(code.encode("ascii"))
+
+        formats = {name: struct.Struct("<" + "".join(code for _, code in self.schemas[name])) for name in type_names}
+        parts.append(struct.pack("<I", len(self.records)))
+        for event_id, (event_type, values) in self.records.items():
+            parts.append(struct.pack("<H", type_index[event_type]))
+            parts.append(_pack_str(event_id, "<H"))
+            parts.append(formats[event_type].pack(*values))
+
+        return b"".join(parts)
+
+    def load_bytes(self, data: bytes):
+        """Заменяет содержимое хранилища блоком из to_bytes"""
+        schemas, records = parse_block(data)
+        self.schemas.update(schemas)
+        self.records.clear()
+        self.records.update(records)
+
+    # ---СИНХРОНИЗАЦИЯ С GameData---
+    def sync(self):
+        """Перед сохранением: кладёт блок состояний в GameData"""
+        game_data.event_state_data = self.to_bytes()
+
+    def sync_dirty(self, dirty: dict):
+        """Перед снимком автосохранения: обновляет блок, если состояния менялись"""
+        if "events" in dirty:
+            self.sync()
+
+    def reload(self):
+        """После загрузки: читает блок состояний и переносит старые записи сундуков из mobs_data"""
+        self.load_bytes(getattr(game_data, "event_state_data", b""))
+
+        legacy = [event_id for event_id, data in game_data.mobs_data.items() if data.get("type") == "chest"]
+        for event_id in legacy:
+            data = game_data.mobs_data.pop(event_id)
+            self.set_state(event_id, "chest", {"is_empty": bool(data.get("is_empty", False))},
+                           schema=(("is_empty", "?"),))
+        if legacy:
+            self.logger.info(f"Перенесено состояний сундуков из mobs_data: {len(legacy)}")
+
+
+def parse_block(data: bytes) -> Tuple[Dict[str, Schema], Dict[str, Tuple[str, tuple]]]:
+    """
+    Разбирает блок из to_bytes: ({тип: схема}, {id: (тип, значения)}).
+    Повреждённый блок - ValueError, IndexError или struct.error
+    """
+    schemas: Dict[str, Schema] = {}
+    records: Dict[str, Tuple[str, tuple]] = {}
+    if not data:
+        return schemas, records
+    if data[:4] != MAGIC:
+        raise ValueError("Неверный формат блока состояний событий")
+
+    offset = 4
+    version, type_count = struct.unpack_from("<BH", data, offset)
+    offset += 3
+    if version > VERSION:
+        raise ValueError(f"Версия блока состояний событий {version} новее поддерживаемой {VERSION}")
+
+    type_names = []
+    formats = []
+    for _ in range(type_count):
+        name, offset = _unpack_str(data, offset)
+        (field_count,) = struct.unpack_from("<B", data, offset)
+        offset += 1
+        schema = []
+        for _ in range(field_count):
+            field, offset = _unpack_str(data, offset)
+            schema.append((field, chr(data[offset])))
+            offset += 1
+        schemas[name] = tuple(schema)
+        type_names.append(name)
+        formats.append(struct.Struct("<" + "".join(code for _, code in schema)))
+
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    for _ in range(count):
+        (index,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        event_id, offset = _unpack_str(data, offset, "<H")
+        values = formats[index].unpack_from(data, offset)
+        offset += formats[index].size
+        records[event_id] = (type_names[index], values)
+
+    if offset != len(data):
+        raise ValueError("Лишние данные после блока состояний событий")
+    return schemas, records
+
+
+def _decode_section(data) -> bytes:
+    """Раздел events сохранения: блок проверяется при чтении файла, а в GameData остаётся байтами"""
+    data = bytes(data)
+    parse_block(data)
+    return data
+
+
+def _pack_str(value: str, length_format: str = "<B") -> bytes:
+    encoded = value.encode("utf-8")
+    return struct.pack(length_format, len(encoded)) + encoded
+
+
+def _unpack_str(data: bytes, offset: int, length_format: str = "<B"):
+    (length,) = struct.unpack_from(length_format, data, offset)
+    offset += struct.calcsize(length_format)
+    if offset + length > len(data):
+        raise ValueError("Строка в блоке состояний событий обрезана")
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+save_format.register_section("events", bytes, _decode_section)
+
+# Глобальный экземпляр
+event_states = EventStateStore()
@@ -1,8 +1,13 @@
 from typing import Dict, Any
 
 from  .event import GameEvent
+from .event_registry import register_event
 
+
+@register_event
 class TeleportEvent(GameEvent):
+    tiled_type = "teleport"
+
     def __init__(self, event_id: str,name: str, rect: tuple, properties: Dict[str, Any]):
         super().__init__(event_id, name, "teleport", rect, properties)
 
@@ -18,5 +23,4 @@ class TeleportEvent(GameEvent):
 
         game_state.teleport_to(self.target_x, self.target_y, self.target_map)
 
-        self.activated = True
-        self.cooldown = self.max_cooldown
+        self.start_cooldown()
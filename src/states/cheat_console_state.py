@@ -1,8 +1,9 @@
 import arcade
 
+from src.core.autosave import autosave
 from src.states.base_state import BaseState
-from src.world.map_loader import MapLoader
 from config import constants as C
+from src.ui.text_cache import text_cache
 
 
 class CheatConsoleState(BaseState):
@@ -10,7 +11,6 @@ class CheatConsoleState(BaseState):
 
     def __init__(self, gsm, asset_loader):
         super().__init__("cheat_console", gsm, asset_loader)
-        self.map_loader = MapLoader()
 
         self.input_buffer = "|"  # Введенный текст
         self.cursor_visible = True
@@ -90,12 +90,13 @@ class CheatConsoleState(BaseState):
         text = self.current_line
         if not self.text_to_draw:
             text = "Бог, слушает тебя..."
-        arcade.Text(
+        text_cache.draw(
+            "console_speech",
             text,
             self.gsm.window.width // 2 - self.tile_size, self.gsm.window.height - self.tile_size,
             self.main_color, 24,
             anchor_x="center"
-        ).draw()
+        )
 
         # ---ПОЛЕ ДЛЯ ВВОДА---
         arcade.draw_rect_filled(
@@ -112,11 +113,12 @@ class CheatConsoleState(BaseState):
         )
 
         # ---ТЕКСТ---
-        arcade.Text(
+        text_cache.draw(
+            "console_input",
             self.input_buffer,
             5.2 * self.tile_size, self.gsm.window.height - 2 * self.tile_size,
             self.main_color, 20
-        ).draw()
+        )
 
         # ---ИСТОРИЯ КОМАНД---
         panel_width = self.tile_size * 3.2
@@ -143,11 +145,12 @@ class CheatConsoleState(BaseState):
             text = self.history[i]
             if len(text) > 10:
                 text = text[:15] + "..."
-            arcade.Text(
+            text_cache.draw(
+                ("console_history", i),
                 text,
                 0.7 * self.tile_size, self.gsm.window.height - self.tile_size - self.tile_size // 3 * i,
                 color, 9
-            ).draw()
+            )
 
         # ---РЕЧЬ ДИП СИКА---
         panel_width = self.tile_size * 5
@@ -166,12 +169,13 @@ class CheatConsoleState(BaseState):
         )
 
         for i in range(len(self.deep_seek_speech)):
-            arcade.Text(
+            text_cache.draw(
+                ("console_deepseek", i),
                 self.deep_seek_speech[i],
                 self.gsm.window.width * 0.75,
                 self.gsm.window.height * 0.93 - self.tile_size // 3 * i,
                 self.text_color, 14
-            ).draw()
+            )
 
     def on_enter(self, **kwargs):
         pass
@@ -214,16 +218,38 @@ class CheatConsoleState(BaseState):
                 "Теперь тебя тоже не убить"
             ]
         elif command == "SAVE":
-            self.game_data.save_to_file()
+            # Не блокирует кадр: запись идёт в фоновом потоке автосохранения
+            autosave.save_now()
 
             self.text_to_draw = ["Сохраняю..."]
 
 
         elif command == "LOAD":
+            # Более свежее из сохранения и автосохранения
+            loaded = autosave.load()
+
+            if loaded is None:
+                self.text_to_draw = ["Нечего загружать..."]
+            elif loaded == autosave.autosave_filename:
+                self.text_to_draw = ["Загружаю автосохранение..."]
+            else:
+                self.text_to_draw = ["Загружаю..."]
+
+        elif command == "LOAD_SAVE":
+            autosave.load(autosave.filename)
+
+            self.text_to_draw = ["Загружаю сохранение..."]
+
+        elif command == "LOAD_AUTO":
+            autosave.load(autosave.autosave_filename)
+
+            self.text_to_draw = ["Загружаю автосохранение..."]
 
-            self.game_data.load_from_file()
+        elif command == "IMPORT":
+            # Старое сохранение (pickle) переносится только по явной команде
+            autosave.import_legacy()
 
-            self.text_to_draw = ["Загружаю..."]
+            self.text_to_draw = ["Переношу старое сохранение..."]
 
         elif command.startswith("TP_"):
             parts = command.split("_")
@@ -250,9 +276,6 @@ class CheatConsoleState(BaseState):
                         "Бессмысленная трата ресурсов..."
                     ]
                 else:
-                    self.map_loader.load(
-                        f"maps/{mp}.tmx"
-                    )
                     self.text_to_draw = [
                         "Дарую новые координаты!",
                         f"x:{x}, y:{y}, map:{mp}",
@@ -6,9 +6,13 @@ from arcade import SpriteList, Camera2D
 from .base_state import BaseState
 from ..entities import Player
 from ..ui.health_bar import HealthBar
+from ..ui.health_bar_batch import HealthBarBatch
 from ..ui.notification_system import notifications as ns
+from ..ui.text_cache import text_cache
+from ..core.autosave import autosave
+from ..core.profiler import profiler
 from ..ui.vertical_bar import VerticalBar
-from ..world.map_loader import MapLoader
+from ..world.map_cache import MapCache
 from config import constants as C
 from src.entities.entity_manager import entity_manager
 
@@ -48,21 +52,23 @@ class GameplayState(BaseState):
         self.player_list = SpriteList()
         self.player_list.append(self.player)
 
-        self.map_loader = MapLoader()
+        # Полоски здоровья существ рисуются одним батчем
+        self.health_bar_batch = HealthBarBatch()
+
+        # Собранные карты хранятся в кэше, соседние подгружаются заранее
+        self.map_cache = MapCache()
 
         # Загружаем Tiled карту
         start_map = "secmap"
-        self.map_loader.load(f"maps/{start_map}.tmx")
-        self.mobs = arcade.SpriteList()
-
-        # Загружаем монстров для стартовой карты
-        for monster in self.entity_manager.mob:
-            if monster and monster.is_alive and start_map in monster.entity_id:
-                self.mobs.append(monster)
-
+        self.map_loader = self.map_cache.get(start_map)
+        if self.map_loader:
+            self.map_cache.prefetch_neighbours(self.map_loader)
         # Устанавливаем текущую карту
         self.entity_manager.set_current_map(start_map)
 
+        # Монстры стартовой карты - SpriteList из реестра EntityManager
+        self.mobs = self.entity_manager.get_monsters_for_current_map()
+
         self.map_left = 0
         self.map_bottom = 0
         self.map_right = 0
@@ -71,8 +77,8 @@ class GameplayState(BaseState):
         bounds = self.map_loader.get_bounds()
         self.setup_map_limits(bounds["left"], bounds["bottom"], bounds["right"], bounds["top"])
 
-        # Получаем слой коллизий
-        self.collision_layer = self.map_loader.get_collision_layer()
+        # Получаем сетку коллизий
+        self.collision_grid = self.map_loader.get_collision_grid()
 
         # Камера
         self.camera = arcade.camera.Camera2D()
@@ -116,6 +122,12 @@ class GameplayState(BaseState):
 
         self.select_pressed = False
 
+        # Положения до последнего шага симуляции - отрисовка интерполирует между ними и текущими
+        self._previous_positions = []
+        self._current_positions = []
+        self._previous_camera = None
+        self._current_camera = None
+
     def setup_map_limits(self, left, bottom, width, height):
         self.map_left = left
         self.map_bottom = bottom
@@ -128,31 +140,26 @@ class GameplayState(BaseState):
         """
         # Если нужно сменить карту
         if map:
-            path = f"maps/{map}.tmx"
             self.logger.info(f"Смена карты: {map}")
 
-            # Устанавливаем текущую карту
-            self.entity_manager.set_current_map(map)
-
-            # Загружаем новую карту
-            success = self.map_loader.load(path)
-            if not success:
+            # Берём карту из кэша (или собираем, если её там нет)
+            map_loader = self.map_cache.get(map)
+            if not map_loader:
                 self.logger.error(f"Не удалось загрузить карту: {map}")
                 return False
 
-            # Очищаем список монстров для отрисовки
-            self.mobs.clear()
+            self.map_loader = map_loader
+            self.map_cache.prefetch_neighbours(self.map_loader)
 
-            # Получаем монстров для этой карты из EntityManager
-            current_map_monsters = self.entity_manager.get_monsters_for_current_map()
+            # Устанавливаем текущую карту
+            self.entity_manager.set_current_map(map)
 
-            for monster in current_map_monsters:
-                if monster and monster.is_alive and self.entity_manager.current_map_name in monster.entity_id:
-                    print(f'монстр {monster.entity_id} добавлен на карту {self.entity_manager.current_map_name}')
-                    self.mobs.append(monster)
+            # Монстры новой карты для отрисовки - её SpriteList из реестра EntityManager
+            self.mobs = self.entity_manager.get_monsters_for_current_map()
+            self.health_bar_batch.clear()
 
-            # Обновляем слой коллизий
-            self.collision_layer = self.map_loader.get_collision_layer()
+            # Обновляем сетку коллизий
+            self.collision_grid = self.map_loader.get_collision_grid()
 
             # Обновляем границы карты для камеры
             bounds = self.map_loader.get_bounds()
@@ -182,6 +189,10 @@ class GameplayState(BaseState):
         # ПРИМЕНЕНИЕ (Для мгновенного следования)
         self.camera.position = (final_x, final_y)
 
+        # Телепорт не интерполируем
+        self._previous_positions = []
+        self._previous_camera = None
+
         ns.notification(f"Телепорт в ({x}, {y}). карта: {map or 'текущая'}")
         return True
 
@@ -194,6 +205,9 @@ class GameplayState(BaseState):
         # Инициализируем UI
         self._init_ui()
 
+        # Автосохранение идёт в фоне, пока открыта игра
+        autosave.start()
+
     def on_exit(self):
         """Вызывается при выходе из состояния"""
         # Сбрасываем флаги
@@ -205,6 +219,9 @@ class GameplayState(BaseState):
     def on_pause(self):
         """Вызывается при постановке игры на паузу (для overlay)"""
         self.is_paused = True
+        # На паузе симуляция стоит - рисуем последние положения без интерполяции
+        self._previous_positions = []
+        self._previous_camera = None
 
     def on_resume(self):
         """Вызывается при возобновлении игры"""
@@ -214,28 +231,38 @@ class GameplayState(BaseState):
         """Обновление игровой логики"""
         if self.is_paused:
             return
-        # Обновляем монстров
-        for monster in self.mobs:
-            if monster.is_alive:
-                monster.update(delta_time, self.player, self.collision_layer)
-                if monster.collides_with_sprite(self.player):
-                    monster.interact(self.player)
-                if monster.can_start_dialogue and self.select_pressed:
-                    self.gsm.push_overlay("dialogue", npc=monster)
-                    monster.can_start_dialogue = False
-                    self.select_pressed = False
-                    break
-
-        self.entity_manager.update_all(delta_time, self.player, self.collision_layer)
+
+        self._snapshot_positions()
+
+        # Достраиваем подгруженные в фоне карты
+        self.map_cache.update()
+
+        # Обновляем монстров (один раз за тик - всё делает EntityManager)
+        with profiler.scope("entity_update"):
+            result = self.entity_manager.update_all(
+                delta_time, self.player, self.collision_grid, focus=self.camera.position
+            )
+
+        for monster in result["contacts"]:
+            monster.interact(self.player)
+
+        if self.select_pressed:
+            for monster in result["dialogue"]:
+                self.gsm.push_overlay("dialogue", npc=monster)
+                monster.can_start_dialogue = False
+                self.select_pressed = False
+                break
 
         # Обновляем игрока
-        self.player.update(delta_time, collision_layer=self.collision_layer)
+        with profiler.scope("player_update"):
+            self.player.update(delta_time, collision_grid=self.collision_grid)
 
 
         # Обновляем и проверяем события (КОЛЛИЗИИ!)
         if hasattr(self.map_loader, 'event_manager') and self.map_loader.event_manager:
-            self.map_loader.event_manager.update(delta_time)
-            self.map_loader.event_manager.check_collisions(self.player, self)
+            with profiler.scope("event_collisions"):
+                self.map_loader.event_manager.update(delta_time)
+                self.map_loader.event_manager.check_collisions(self.player, self)
 
         target_x = self.player.center_x
         target_y = self.player.center_y
@@ -255,6 +282,9 @@ class GameplayState(BaseState):
         for ui_element in self.ui_elements:
             ui_element.update(delta_time)
 
+        # Изменённые записи - в журнал автосохранения (раз в несколько секунд, запись в фоне)
+        autosave.update(delta_time)
+
         # Счет FPS
         if C.debug_mode:
             self.frame_count += 1
@@ -266,21 +296,35 @@ class GameplayState(BaseState):
 
     def draw(self):
         """Отрисовка игры"""
+        # Между шагами симуляции рисуем промежуточное положение
+        self._apply_interpolation(self.gsm.interpolation_alpha)
+
         # Активируем камеру для игрового мира
         self.camera.use()
 
-        # Рисуем карту
-        self.map_loader.draw()
+        view_rect = self._get_view_rect()
+
+        # Рисуем карту (только видимые чанки)
+        with profiler.scope("map_draw"):
+            self.map_loader.draw(view_rect)
 
-        # Рисуем сундуки
-        self.map_loader.event_manager.draw()
+            # Рисуем сундуки
+            self.map_loader.event_manager.draw()
 
-        self.entity_manager.draw_debug()
-        # Рисуем игрока и монстров
-        self.player_list.draw()
-        self.mobs.draw()
-        for monster in self.mobs:
-            monster.draw()
+        with profiler.scope("entity_draw"):
+            self.entity_manager.draw_debug(view_rect)
+            # Рисуем игрока и монстров
+            self.player_list.draw()
+            self.mobs.draw()
+            visible_monsters = self.entity_manager.query_rect(*view_rect)
+            for monster in visible_monsters:
+                monster.draw()
+
+            # Полоски здоровья всех видимых существ - одним батчем
+            self.health_bar_batch.draw(monster.health_bar for monster in visible_monsters)
+
+        # Возвращаем настоящие положения
+        self._restore_positions()
 
         # Переключаемся на UI камеру (полный экран)
         self.default_camera.use()
@@ -289,21 +333,65 @@ class GameplayState(BaseState):
         if C.debug_mode:
             # FPS и координаты
             text = f"x:{int(self.player.center_x // self.tile_size)} y:{int(self.player.center_y // self.tile_size)}"
-            arcade.Text(text,
-                        self.gsm.window.width - 3 * self.tile_size,
-                        self.gsm.window.height - self.tile_size,
-                        C.DEEPSEEK_COLOR, 18).draw()
-
-            arcade.Text(f"FPS: {self.fps}",
-                        self.gsm.window.width - 3 * self.tile_size,
-                        self.gsm.window.height - 0.5 * self.tile_size,
-                        C.DEEPSEEK_COLOR, 18).draw()
+            text_cache.draw("hud_coords", text,
+                            self.gsm.window.width - 3 * self.tile_size,
+                            self.gsm.window.height - self.tile_size,
+                            C.DEEPSEEK_COLOR, 18)
+
+            text_cache.draw("hud_fps", f"FPS: {self.fps}",
+                            self.gsm.window.width - 3 * self.tile_size,
+                            self.gsm.window.height - 0.5 * self.tile_size,
+                            C.DEEPSEEK_COLOR, 18)
+
+            # Сколько существ на каждом уровне детализации
+            lod = " ".join(f"{name}:{count}" for name, count in self.entity_manager.lod.counters.items())
+            text_cache.draw("hud_lod", f"LOD {lod}",
+                            self.gsm.window.width - 6 * self.tile_size,
+                            self.gsm.window.height - 1.5 * self.tile_size,
+                            C.DEEPSEEK_COLOR, 14)
 
         # Рисуем UI элементы
-        for ui_element in self.ui_elements:
-            ui_element.draw()
-
-
+        with profiler.scope("ui_draw"):
+            for ui_element in self.ui_elements:
+                ui_element.draw()
+
+
+
+    def _snapshot_positions(self):
+        """Запоминает положения игрока, видимых монстров и камеры перед шагом симуляции"""
+        sprites = [self.player] + self.entity_manager.query_rect(*self._get_view_rect())
+        self._previous_positions = [(sprite, sprite.center_x, sprite.center_y) for sprite in sprites]
+        self._previous_camera = tuple(self.camera.position)
+
+    def _apply_interpolation(self, alpha: float):
+        """Ставит спрайты и камеру между прошлым и текущим шагом (alpha - доля шага)"""
+        self._current_positions = []
+        for sprite, x, y in self._previous_positions:
+            current_x, current_y = sprite.center_x, sprite.center_y
+            self._current_positions.append((sprite, current_x, current_y))
+            sprite.position = (x + (current_x - x) * alpha, y + (current_y - y) * alpha)
+
+        self._current_camera = None
+        if self._previous_camera is not None:
+            self._current_camera = tuple(self.camera.position)
+            self.camera.position = arcade.math.lerp_2d(self._previous_camera, self._current_camera, alpha)
+
+    def _restore_positions(self):
+        """Возвращает положения, посчитанные симуляцией"""
+        for sprite, x, y in self._current_positions:
+            sprite.position = (x, y)
+        self._current_positions = []
+
+        if self._current_camera is not None:
+            self.camera.position = self._current_camera
+            self._current_camera = None
+
+    def _get_view_rect(self):
+        """Видимая область мира (left, bottom, right, top) с запасом в один тайл"""
+        cam_x, cam_y = self.camera.position
+        half_w = self.gsm.window.width / 2 + self.tile_size
+        half_h = self.gsm.window.height / 2 + self.tile_size
+        return cam_x - half_w, cam_y - half_h, cam_x + half_w, cam_y + half_h
 
     def handle_key_press(self, key: int, modifiers: int):
         if not self.input_manager:
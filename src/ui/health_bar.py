@@ -1,6 +1,7 @@
 import arcade
 
 from .ui_component import UIComponent
+from .text_cache import text_cache
 
 
 class HealthBar(UIComponent):
@@ -48,10 +49,11 @@ class HealthBar(UIComponent):
         )
 
         # Текст (опционально)
-        arcade.Text(
+        text_cache.draw(
+            ("health_bar", id(self)),
             f"{self.entity.health}/{self.entity.max_health}",
             self.x, self.y,
             arcade.color.WHITE,
             self.font_size,
             anchor_x="center", anchor_y="center"
-        ).draw()
\ No newline at end of file
+        )
\ No newline at end of file
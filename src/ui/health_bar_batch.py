@@ -0,0 +1,122 @@
+import arcade
+import pyglet
+
+
+class _BarSprites:
+    """Спрайты и текст одной полоски здоровья в общем батче"""
+
+    def __init__(self, sprite_list: arcade.SpriteList, batch: pyglet.graphics.Batch):
+        self.border = arcade.SpriteSolidColor(1, 1)
+        self.background = arcade.SpriteSolidColor(1, 1)
+        self.fill = arcade.SpriteSolidColor(1, 1)
+        sprite_list.extend((self.border, self.background, self.fill))
+
+        self.text = arcade.Text("", 0, 0, arcade.color.WHITE, 8,
+                                anchor_x="center", anchor_y="center", batch=batch)
+
+        # Что было выставлено в прошлый раз (чтобы не трогать геометрию без изменений)
+        self.state = None
+        self.has_fill = False
+        self.last_frame = 0
+
+    def set_visible(self, visible: bool):
+        self.border.visible = visible
+        self.background.visible = visible
+        self.fill.visible = visible and self.has_fill
+        self.text.visible = visible
+
+    def update(self, bar):
+        health = bar.entity.health
+        max_health = bar.entity.max_health
+        state = (bar.x, bar.y, bar.width, bar.height, bar.border_width, bar.font_size, health, max_health)
+        if state == self.state:
+            if not self.border.visible:
+                self.set_visible(True)
+            return
+
+        x, y, width, height = bar.x, bar.y, bar.width, bar.height
+
+        # Рамка - прямоугольник чуть больше фона
+        border = bar.border_width
+        self.border.color = bar.border_color
+        self.border.width = width + 2 * border
+        self.border.height = height + 2 * border
+        self.border.position = (x, y)
+
+        self.background.color = bar.bg_color
+        self.background.width = width
+        self.background.height = height
+        self.background.position = (x, y)
+
+        # Заполнение (процент здоровья), прижато к левому краю
+        fill_width = max(0, (health / max(health, max_health)) * width)
+        if fill_width > 0:
+            self.fill.color = bar.fill_color
+            self.fill.width = fill_width
+            self.fill.height = height
+            self.fill.position = (x - width / 2 + fill_width / 2, y)
+
+        text = f"{health}/{max_health}"
+        if self.text.text != text:
+            self.text.text = text
+        if self.text.font_size != bar.font_size:
+            self.text.font_size = bar.font_size
+        self.text.position = (x, y)
+
+        self.state = state
+        self.has_fill = fill_width > 0
+        self.set_visible(True)
+
+
+class HealthBarBatch:
+    """
+    Отрисовка полосок здоровья всех существ за два вызова:
+    одна SpriteList (рамка, фон, заполнение) и один батч текста.
+    Геометрия полоски обновляется, только когда меняются здоровье или положение.
+    """
+
+    def __init__(self, max_idle_frames: int = 120):
+        self.sprite_list = arcade.SpriteList()
+        self.batch = pyglet.graphics.Batch()
+        self.max_idle_frames = max_idle_frames
+        self.frame = 0
+
+        # {id полоски: спрайты}, и свободные спрайты для повторного использования
+        self._bars = {}
+        self._free = []
+
+    def draw(self, health_bars):
+        """Рисует переданные полоски, остальные скрывает"""
+        self.frame += 1
+
+        for bar in health_bars:
+            if not bar.visible:
+                continue
+            entry = self._bars.get(id(bar))
+            if entry is None:
+                entry = self._free.pop() if self._free else _BarSprites(self.sprite_list, self.batch)
+                entry.state = None
+                self._bars[id(bar)] = entry
+            entry.update(bar)
+            entry.last_frame = self.frame
+
+        # Не нарисованные в этом кадре полоски прячем, а давно не нужные отдаем в пул
+        oldest = self.frame - self.max_idle_frames
+        for key, entry in list(self._bars.items()):
+            if entry.last_frame == self.frame:
+                continue
+            if entry.border.visible:
+                entry.set_visible(False)
+            if entry.last_frame < oldest:
+                del self._bars[key]
+                self._free.append(entry)
+
+        self.sprite_list.draw()
+        self.batch.draw()
+
+    def clear(self):
+        """Прячет все полоски (например, при смене карты)"""
+        for entry in self._bars.values():
+            entry.set_visible(False)
+            self._free.append(entry)
+        self._bars.clear()
@@ -1,5 +1,6 @@
 import arcade
 from config import constants as C
+from .text_cache import text_cache
 
 
 class NotificationSystem:
@@ -35,13 +36,14 @@ class NotificationSystem:
             alpha = min(255, int(self.timers[i] * 255))
             color = (*C.DEEPSEEK_COLOR, alpha)
 
-            arcade.Text(
+            text_cache.draw(
+                ("notification", i),
                 text,
                 x,
                 y - i * 17,
                 color,
                 15
-            ).draw()
+            )
 
     def clear(self):
         """Очистить все оповещения"""
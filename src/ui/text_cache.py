@@ -0,0 +1,65 @@
+import arcade
+
+
+class TextCache:
+    """
+    Общий кэш arcade.Text для всех отрисовок.
+    Один объект Text на место вызова (ключ); раскладка глифов пересчитывается
+    только при смене текста или стиля, а позиция и цвет просто обновляются.
+    Тексты, которые не рисовались max_idle_frames кадров, удаляются.
+    """
+
+    def __init__(self, max_idle_frames: int = 120):
+        self.max_idle_frames = max_idle_frames
+        self.frame = 0
+
+        # {ключ: [Text, стиль, последний кадр отрисовки]}
+        self._texts = {}
+
+        # Статистика: сколько раз пришлось создать новый Text
+        self.created = 0
+
+    def draw(self, key, text: str, x: float, y: float, color=arcade.color.WHITE, font_size: float = 12, **style):
+        """Рисует текст, переиспользуя Text с тем же ключом"""
+        style_key = (font_size, tuple(sorted(style.items())))
+        entry = self._texts.get(key)
+
+        if entry is None or entry[1] != style_key:
+            label = arcade.Text(text, x, y, color, font_size, **style)
+            entry = [label, style_key, self.frame]
+            self._texts[key] = entry
+            self.created += 1
+        else:
+            label = entry[0]
+            # Сеттеры arcade.Text пересобирают раскладку - трогаем только изменившееся
+            if label.text != text:
+                label.text = text
+            if label.x != x or label.y != y:
+                label.position = (x, y)
+            color = arcade.types.Color.from_iterable(color)
+            if label.color != color:
+                label.color = color
+            entry[2] = self.frame
+
+        label.draw()
+        return label
+
+    def end_frame(self):
+        """Конец кадра: удаляет давно не рисовавшиеся тексты"""
+        self.frame += 1
+        if self.frame % self.max_idle_frames:
+            return
+
+        oldest = self.frame - self.max_idle_frames
+        for key in [key for key, entry in self._texts.items() if entry[2] < oldest]:
+            del self._texts[key]
+
+    def clear(self):
+        self._texts.clear()
+
+    def __len__(self):
+        return len(self._texts)
+
+
+# Глобальный экземпляр
+text_cache = TextCache()
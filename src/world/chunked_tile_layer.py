@@ -0,0 +1,113 @@
+import logging
+from typing import Dict, Tuple
+
+import arcade
+
+from config import constants as C
+from src.world.map_compiler import GID_MASK
+
+Chunk = Tuple[int, int]
+
+
+class ChunkedTileLayer:
+    """
+    Статический слой тайлов, разбитый на квадратные чанки со своими SpriteList.
+    Рисуются только чанки, пересекающие видимую область; чанк собирается при первом
+    появлении в кадре и выбрасывается, когда камера уходит от него дальше keep_radius чанков.
+    """
+
+    def __init__(self, compiled_map, layer_name: str, textures: Dict[int, arcade.Texture],
+                 scale: float = C.SCALE_FACTOR, chunk_size: int = 16, keep_radius: int = 2):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.compiled_map = compiled_map
+        self.layer_name = layer_name
+        self.textures = textures
+        self.scale = scale
+
+        # Размер чанка в тайлах и в пикселях
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * C.TILE_SIZE
+        self.keep_radius = keep_radius
+
+        self.chunks_x = (compiled_map.width + chunk_size - 1) // chunk_size
+        self.chunks_y = (compiled_map.height + chunk_size - 1) // chunk_size
+
+        # {(cx, cy): спрайты чанка}, cy считается снизу, как и тайлы
+        self._chunks: Dict[Chunk, arcade.SpriteList] = {}
+
+        # Статистика последнего кадра
+        self.chunks_drawn = 0
+
+    @property
+    def sprite_count(self) -> int:
+        """Число спрайтов в собранных чанках"""
+        return sum(len(sprite_list) for sprite_list in self._chunks.values())
+
+    def _build_chunk(self, cx: int, cy: int) -> arcade.SpriteList:
+        """Создает спрайты одного чанка по массиву id тайлов"""
+        sprite_list = arcade.SpriteList(use_spatial_hash=False)
+        gids = self.compiled_map.get_layer(self.layer_name)
+        width = self.compiled_map.width
+        height = self.compiled_map.height
+
+        tx0 = cx * self.chunk_size
+        ty0 = cy * self.chunk_size
+        for ty in range(ty0, min(ty0 + self.chunk_size, height)):
+            # В массиве строки идут сверху вниз
+            row = (height - 1 - ty) * width
+            for tx in range(tx0, min(tx0 + self.chunk_size, width)):
+                texture = self.textures.get(gids[row + tx] & GID_MASK)
+                if texture is None:
+                    continue
+                sprite = arcade.Sprite(texture, scale=self.scale)
+                sprite.center_x = (tx + 0.5) * C.TILE_SIZE
+                sprite.center_y = (ty + 0.5) * C.TILE_SIZE
+                sprite_list.append(sprite)
+
+        return sprite_list
+
+    def _chunk_range(self, low: float, high: float, count: int):
+        """Диапазон чанков (включительно) по одной оси, обрезанный по карте"""
+        first = max(int(low // self.chunk_pixels), 0)
+        last = min(int(high // self.chunk_pixels), count - 1)
+        return first, last
+
+    def draw(self, view_rect=None):
+        """
+        Рисует чанки, пересекающие view_rect (left, bottom, right, top).
+        Без view_rect рисуется вся карта
+        """
+        if view_rect is None:
+            x0, x1 = 0, self.chunks_x - 1
+            y0, y1 = 0, self.chunks_y - 1
+        else:
+            left, bottom, right, top = view_rect
+            x0, x1 = self._chunk_range(left, right, self.chunks_x)
+            y0, y1 = self._chunk_range(bottom, top, self.chunks_y)
+
+        self.chunks_drawn = 0
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                sprite_list = self._chunks.get((cx, cy))
+                if sprite_list is None:
+                    sprite_list = self._build_chunk(cx, cy)
+                    self._chunks[(cx, cy)] = sprite_list
+                if len(sprite_list):
+                    sprite_list.draw()
+                    self.chunks_drawn += 1
+
+        self._evict(x0, x1, y0, y1)
+
+    def _evict(self, x0: int, x1: int, y0: int, y1: int):
+        """Выбрасывает чанки дальше keep_radius от видимых"""
+        radius = self.keep_radius
+        far = [
+            key for key in self._chunks
+            if key[0] < x0 - radius or key[0] > x1 + radius or key[1] < y0 - radius or key[1] > y1 + radius
+        ]
+        for key in far:
+            del self._chunks[key]
+
+    def clear(self):
+        """Выбрасывает все собранные чанки"""
+        self._chunks.clear()
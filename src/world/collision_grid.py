@@ -0,0 +1,159 @@
+import math
+
+from config import constants as C
+
+# Допуск, чтобы касание стены не считалось пересечением из-за погрешности float
+EPSILON = 1e-6
+
+
+class CollisionGrid:
+    """
+    Сетка занятости тайлов, запечённая из слоя коллизий.
+    Одна ячейка на тайл (0 - свободно, 1 - стена), индекс = ty * width + tx, ty считается снизу.
+    """
+
+    def __init__(self, width: int, height: int, tile_size: float = C.TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.cells = bytearray(width * height)
+
+    @classmethod
+    def from_sprite_list(cls, sprite_list, width: int, height: int, tile_size: float = C.TILE_SIZE):
+        """Строит сетку по спрайтам слоя коллизий (тайл определяется по центру спрайта)"""
+        grid = cls(width, height, tile_size)
+        if sprite_list:
+            for sprite in sprite_list:
+                tx = int(sprite.center_x // tile_size)
+                ty = int(sprite.center_y // tile_size)
+                grid.set_blocked(tx, ty)
+        return grid
+
+    @classmethod
+    def from_bits(cls, bits, width: int, height: int, tile_size: float = C.TILE_SIZE):
+        """Строит сетку из упакованного битового набора (бит i = ячейка i)"""
+        grid = cls(width, height, tile_size)
+        cells = grid.cells
+        for byte_index, byte in enumerate(bits):
+            if not byte:
+                continue
+            base = byte_index * 8
+            for bit in range(8):
+                if byte & (1 << bit) and base + bit < len(cells):
+                    cells[base + bit] = 1
+        return grid
+
+    def to_bits(self) -> bytes:
+        """Упаковывает сетку в битовый набор (в 8 раз компактнее)"""
+        bits = bytearray((len(self.cells) + 7) // 8)
+        for index, blocked in enumerate(self.cells):
+            if blocked:
+                bits[index >> 3] |= 1 << (index & 7)
+        return bytes(bits)
+
+    def set_blocked(self, tx: int, ty: int, blocked: bool = True):
+        """Помечает тайл как стену (или освобождает его)"""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            self.cells[ty * self.width + tx] = 1 if blocked else 0
+
+    def is_blocked(self, tx: int, ty: int) -> bool:
+        """Является ли тайл стеной (за пределами карты стен нет)"""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return self.cells[ty * self.width + tx] != 0
+        return False
+
+    def is_blocked_at(self, x: float, y: float) -> bool:
+        """Является ли стеной тайл под точкой в пикселях"""
+        return self.is_blocked(int(x // self.tile_size), int(y // self.tile_size))
+
+    def tile_range(self, low: float, high: float):
+        """Диапазон тайлов (включительно), которые пересекает отрезок [low, high) по одной оси"""
+        first = math.floor(low / self.tile_size + EPSILON)
+        last = math.ceil(high / self.tile_size - EPSILON) - 1
+        return first, last
+
+    def collides_rect(self, left: float, bottom: float, right: float, top: float) -> bool:
+        """Пересекает ли прямоугольник (AABB) хотя бы одну стену"""
+        x0, x1 = self.tile_range(left, right)
+        y0, y1 = self.tile_range(bottom, top)
+
+        x0, x1 = max(x0, 0), min(x1, self.width - 1)
+        y0, y1 = max(y0, 0), min(y1, self.height - 1)
+
+        cells = self.cells
+        for ty in range(y0, y1 + 1):
+            row = ty * self.width
+            for tx in range(x0, x1 + 1):
+                if cells[row + tx]:
+                    return True
+
+        return False
+
+    def _column_blocked(self, tx: int, y0: int, y1: int) -> bool:
+        if not 0 <= tx < self.width:
+            return False
+        for ty in range(max(y0, 0), min(y1, self.height - 1) + 1):
+            if self.cells[ty * self.width + tx]:
+                return True
+        return False
+
+    def _row_blocked(self, ty: int, x0: int, x1: int) -> bool:
+        if not 0 <= ty < self.height:
+            return False
+        row = ty * self.width
+        for tx in range(max(x0, 0), min(x1, self.width - 1) + 1):
+            if self.cells[row + tx]:
+                return True
+        return False
+
+    def sweep_x(self, left: float, bottom: float, right: float, top: float, dx: float):
+        """
+        Сдвигает прямоугольник по X до первой стены на пути.
+        Возвращает (допустимое смещение, было ли столкновение)
+        """
+        if dx == 0:
+            return 0, False
+
+        y0, y1 = self.tile_range(bottom, top)
+        if dx > 0:
+            _, current = self.tile_range(left, right)
+            _, target = self.tile_range(left + dx, right + dx)
+            for tx in range(current + 1, target + 1):
+                if self._column_blocked(tx, y0, y1):
+                    return max(0.0, tx * self.tile_size - right), True
+        else:
+            current, _ = self.tile_range(left, right)
+            target, _ = self.tile_range(left + dx, right + dx)
+            for tx in range(current - 1, target - 1, -1):
+                if self._column_blocked(tx, y0, y1):
+                    return min(0.0, (tx + 1) * self.tile_size - left), True
+
+        return dx, False
+
+    def sweep_y(self, left: float, bottom: float, right: float, top: float, dy: float):
+        """
+        Сдвигает прямоугольник по Y до первой стены на пути.
+        Возвращает (допустимое смещение, было ли столкновение)
+        """
+        if dy == 0:
+            return 0, False
+
+        x0, x1 = self.tile_range(left, right)
+        if dy > 0:
+            _, current = self.tile_range(bottom, top)
+            _, target = self.tile_range(bottom + dy, top + dy)
+            for ty in range(current + 1, target + 1):
+                if self._row_blocked(ty, x0, x1):
+                    return max(0.0, ty * self.tile_size - top), True
+        else:
+            current, _ = self.tile_range(bottom, top)
+            target, _ = self.tile_range(bottom + dy, top + dy)
+            for ty in range(current - 1, target - 1, -1):
+                if self._row_blocked(ty, x0, x1):
+                    return min(0.0, (ty + 1) * self.tile_size - bottom), True
+
+        return dy, False
+
+    def collides_sprite(self, sprite) -> bool:
+        """Пересекает ли хитбокс спрайта стену"""
+        return self.collides_rect(sprite.left, sprite.bottom, sprite.right, sprite.top)
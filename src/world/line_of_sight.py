@@ -0,0 +1,97 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+Tile = Tuple[int, int]
+
+
+class LineOfSight:
+    """
+    Проверка прямой видимости лучом по сетке коллизий (DDA по тайлам).
+    Результаты кэшируются по паре (тайл наблюдателя, тайл цели),
+    а число лучей за кадр ограничено бюджетом.
+    """
+
+    def __init__(self, collision_grid, max_rays_per_frame: int = 64):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.grid = collision_grid
+
+        self.max_rays_per_frame = max_rays_per_frame
+        self.rays_cast = 0
+
+        # {(тайл наблюдателя, тайл цели): виден ли}
+        self._cache: Dict[Tuple[Tile, Tile], bool] = {}
+        self._target_tile: Optional[Tile] = None
+
+    def world_to_tile(self, x: float, y: float) -> Tile:
+        return int(x // self.grid.tile_size), int(y // self.grid.tile_size)
+
+    def begin_frame(self, target_x: float, target_y: float):
+        """
+        Начало кадра: сбрасывает бюджет лучей.
+        Кэш очищается, только когда цель сменила тайл (все ключи содержат её тайл)
+        """
+        self.rays_cast = 0
+        target_tile = self.world_to_tile(target_x, target_y)
+        if target_tile != self._target_tile:
+            self._target_tile = target_tile
+            self._cache.clear()
+
+    def is_visible(self, x0: float, y0: float, x1: float, y1: float) -> Optional[bool]:
+        """
+        Виден ли (x1, y1) из (x0, y0).
+        None - результата нет в кэше, а бюджет лучей на этот кадр исчерпан
+        """
+        key = (self.world_to_tile(x0, y0), self.world_to_tile(x1, y1))
+        visible = self._cache.get(key)
+        if visible is not None:
+            return visible
+
+        if self.rays_cast >= self.max_rays_per_frame:
+            return None
+
+        self.rays_cast += 1
+        visible = self.raycast(x0, y0, x1, y1)
+        self._cache[key] = visible
+        return visible
+
+    def raycast(self, x0: float, y0: float, x1: float, y1: float) -> bool:
+        """Проходит луч по тайлам (Amanatides-Woo). True - стен между точками нет"""
+        tile_size = self.grid.tile_size
+        tx, ty = self.world_to_tile(x0, y0)
+        end_tx, end_ty = self.world_to_tile(x1, y1)
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+
+        # Параметр t (0..1 вдоль луча), на котором пересекается следующая граница тайла
+        if dx:
+            next_x = (tx + 1) * tile_size if dx > 0 else tx * tile_size
+            t_max_x = (next_x - x0) / dx
+            t_delta_x = tile_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = float('inf')
+
+        if dy:
+            next_y = (ty + 1) * tile_size if dy > 0 else ty * tile_size
+            t_max_y = (next_y - y0) / dy
+            t_delta_y = tile_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = float('inf')
+
+        # Количество переходов между тайлами известно заранее
+        for _ in range(abs(end_tx - tx) + abs(end_ty - ty)):
+            if t_max_x < t_max_y:
+                tx += step_x
+                t_max_x += t_delta_x
+            else:
+                ty += step_y
+                t_max_y += t_delta_y
+
+            if (tx, ty) == (end_tx, end_ty):
+                break
+            if self.grid.is_blocked(tx, ty):
+                return False
+
+        return True
@@ -0,0 +1,177 @@
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from src.core.resource_manager import resource_manager
+from src.world.map_compiler import load_compiled_map
+from src.world.map_loader import MapLoader
+
+
+class MapCache:
+    """
+    Кэш полностью собранных карт (MapLoader) с вытеснением по LRU.
+    Карты-цели телепортов заранее открываются в фоне и достраиваются по шагам в update
+    (не дольше build_budget секунд за кадр), поэтому смена карты - это просто смена ссылки.
+    """
+
+    def __init__(self, max_maps: int = 4, max_sprite_count: int = 200_000, build_budget: float = 0.004):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.rm = resource_manager
+
+        # Размер кэша: число карт и суммарное число созданных в них спрайтов тайлов (счёт, не байты)
+        self.max_maps = max_maps
+        self.max_sprite_count = max_sprite_count
+
+        # Время на достройку подгруженных карт за кадр, с; хотя бы один шаг за кадр делается всегда
+        self.build_budget = build_budget
+
+        # {имя карты: собранная карта}, в порядке последнего использования
+        self._maps: "OrderedDict[str, MapLoader]" = OrderedDict()
+        self.current_map_name: Optional[str] = None
+
+        # Фоновое открытие (и при необходимости компиляция) карт: {имя карты: future с CompiledMap}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="map_prefetch")
+        self._pending: Dict[str, object] = {}
+        # Карта, которая достраивается по шагам: (имя, карта, её шаги load_steps)
+        self._building: Optional[Tuple[str, MapLoader, Iterator]] = None
+
+    @staticmethod
+    def get_map_file(map_name: str) -> str:
+        return f"maps/{map_name}.tmx"
+
+    def get(self, map_name: str) -> Optional[MapLoader]:
+        """Возвращает собранную карту и делает её текущей (собирает, если её нет в кэше)"""
+        if self._building is not None and self._building[0] == map_name:
+            # Карта уже достраивается - доводим до конца сейчас
+            self._finish_steps()
+        loader = self._maps.get(map_name)
+        if loader is not None:
+            self._maps.move_to_end(map_name)
+            self.logger.debug(f"Карта {map_name} взята из кэша")
+        else:
+            loader = self._build(map_name)
+            if loader is None:
+                return None
+
+        self.current_map_name = map_name
+        self._evict()
+        return loader
+
+    def _build(self, map_name: str) -> Optional[MapLoader]:
+        """Собирает карту целиком (используя результат фонового разбора, если он готов)"""
+        loader = MapLoader()
+        if not loader.load(self.get_map_file(map_name), compiled_map=self._take_compiled(map_name)):
+            loader.unload()
+            return None
+
+        self._maps[map_name] = loader
+        return loader
+
+    def _take_compiled(self, map_name: str):
+        """Скомпилированная карта из фоновой подгрузки (None - её нет или она не удалась)"""
+        future = self._pending.pop(map_name, None)
+        if future is None:
+            return None
+        try:
+            # Если загрузка ещё идёт - дожидаемся её, а не начинаем заново
+            return future.result()
+        except Exception as e:
+            self.logger.warning(f"Ошибка фоновой загрузки карты {map_name}: {e}")
+            return None
+
+    def prefetch(self, map_name: str):
+        """Запускает фоновую загрузку скомпилированной карты"""
+        if not map_name or map_name in self._maps or map_name in self._pending:
+            return
+        if self._building is not None and self._building[0] == map_name:
+            return
+
+        map_path = Path(self.rm.get_resource_path(self.get_map_file(map_name)))
+        if not map_path.exists():
+            self.logger.warning(f"Нечего подгружать - файл не найден: {map_path}")
+            return
+
+        self.logger.info(f"Фоновая подгрузка карты: {map_name}")
+        self._pending[map_name] = self._executor.submit(load_compiled_map, map_path)
+
+    def prefetch_neighbours(self, loader: MapLoader):
+        """Подгружает карты, на которые ведут телепорты карты"""
+        for map_name in loader.get_teleport_targets():
+            self.prefetch(map_name)
+
+    def update(self):
+        """
+        Достраивает подгруженные в фоне карты по шагам, не дольше build_budget за кадр.
+        Спрайты и сцена создаются только в основном потоке.
+        """
+        if self._building is None:
+            ready = next((name for name, future in self._pending.items() if future.done()), None)
+            if ready is None:
+                return
+            self.logger.info(f"Сборка подгруженной карты: {ready}")
+            loader = MapLoader()
+            steps = loader.load_steps(self.get_map_file(ready), compiled_map=self._take_compiled(ready))
+            self._building = (ready, loader, steps)
+
+        deadline = time.perf_counter() + self.build_budget
+        while self._building is not None and not self._step():
+            if time.perf_counter() >= deadline:
+                break
+
+    def _step(self) -> bool:
+        """Один шаг достраиваемой карты. True - карта готова (или сборка не удалась)"""
+        map_name, loader, steps = self._building
+        try:
+            next(steps)
+            return False
+        except StopIteration:
+            pass
+        except Exception as e:
+            self.logger.error(f"Ошибка загрузки карты {map_name}: {e}")
+
+        self._building = None
+        if loader.loaded:
+            self._maps[map_name] = loader
+            self._evict()
+        else:
+            loader.unload()
+        return True
+
+    def _finish_steps(self):
+        while self._building is not None:
+            self._step()
+
+    def _evict(self):
+        """Вытесняет давно не использованные карты сверх бюджета (текущую - никогда)"""
+        while len(self._maps) > 1:
+            total_sprites = sum(loader.get_sprite_count() for loader in self._maps.values())
+            if len(self._maps) <= self.max_maps and total_sprites <= self.max_sprite_count:
+                break
+
+            oldest = next((name for name in self._maps if name != self.current_map_name), None)
+            if oldest is None:
+                break
+
+            self._maps.pop(oldest).unload()
+            self.logger.info(f"Карта {oldest} вытеснена из кэша")
+
+    def clear(self):
+        """Очищает кэш, закрывая файлы карт (и тех, что ещё открываются в фоне)"""
+        for loader in self._maps.values():
+            loader.unload()
+        self._maps.clear()
+        if self._building is not None:
+            self._building[1].unload()
+            self._building = None
+        for future in self._pending.values():
+            future.add_done_callback(_close_compiled)
+        self._pending.clear()
+
+
+def _close_compiled(future):
+    """Закрывает скомпилированную карту из фоновой подгрузки, которая больше не нужна"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,345 @@
+"""
+Компиляция карт Tiled (.tmx) в компактный бинарный формат.
+
+Скомпилированная карта хранит всё, что MapLoader раньше вычислял при каждой загрузке:
+массивы id тайлов по слоям, битовую сетку коллизий, зоны, события и точки появления существ.
+TMX разбирается заново, только если изменился сам файл (mtime/размер, затем SHA-1).
+
+Запуск для всех карт: python -m src.world.map_compiler
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pytiled_parser
+
+from config import constants as C
+from src.core.resource_manager import resource_manager
+from src.world.collision_grid import CollisionGrid
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ITCM"
+FORMAT_VERSION = 1
+
+# magic, версия, резерв, mtime_ns исходника, размер исходника, sha1 исходника,
+# смещение и размер метаданных, смещение и размер битовой сетки коллизий
+HEADER = struct.Struct("<4sHHQQ20sIIII")
+
+# Флаги отражения в старших битах id тайла (Tiled)
+GID_MASK = 0x0FFFFFFF
+
+# Слои тайлов, которые не рисуются, а превращаются в данные
+COLLISIONS_LAYER = "collisions"
+CONTAINERS_LAYER = "containers"
+
+BUNDLE_DIR = "maps/.compiled"
+BUNDLE_EXTENSION = ".itcmap"
+
+
+def get_bundle_path(tmx_path: Path) -> Path:
+    """Путь к скомпилированной карте для TMX"""
+    return Path(resource_manager.get_resource_path(BUNDLE_DIR)) / (tmx_path.stem + BUNDLE_EXTENSION)
+
+
+def _file_sha1(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def _json_value(value):
+    """Приводит значение свойства Tiled к типу, который можно сохранить в JSON"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    return str(value)
+
+
+def _iter_layers(layers):
+    """Обходит слои, раскрывая группы"""
+    for layer in layers:
+        if hasattr(layer, "layers"):
+            yield from _iter_layers(layer.layers)
+        else:
+            yield layer
+
+
+def _convert_object(tiled_object, map_height_px: float, scale: float) -> Optional[dict]:
+    """
+    Переводит объект Tiled в координаты arcade (ось Y вверх, с масштабом) - так же, как arcade.TileMap:
+    точка -> (x, y), прямоугольник -> [[left, top], [right, top], [right, bottom], [left, bottom]]
+    """
+    x = tiled_object.coordinates.x
+    y = tiled_object.coordinates.y
+
+    def to_world(px, py):
+        return [px * scale, (map_height_px - py) * scale]
+
+    if isinstance(tiled_object, pytiled_parser.tiled_object.Point):
+        shape = to_world(x, y)
+    elif isinstance(tiled_object, (pytiled_parser.tiled_object.Polygon, pytiled_parser.tiled_object.Polyline)):
+        shape = [to_world(x + point.x, y + point.y) for point in tiled_object.points]
+    elif hasattr(tiled_object, "size"):
+        width = tiled_object.size.width
+        height = tiled_object.size.height
+        shape = [to_world(x, y), to_world(x + width, y), to_world(x + width, y + height), to_world(x, y + height)]
+    else:
+        return None
+
+    return {
+        "shape": shape,
+        "name": tiled_object.name,
+        "type": getattr(tiled_object, "class_", None) or getattr(tiled_object, "type", None) or "",
+        "properties": {key: _json_value(value) for key, value in (tiled_object.properties or {}).items()},
+    }
+
+
+def _relative_image_path(image_path) -> str:
+    """Путь к картинке тайлсета относительно res/ (если получится)"""
+    image_path = Path(image_path).resolve()
+    res_dir = Path(resource_manager.get_resource_path("")).resolve()
+    try:
+        return image_path.relative_to(res_dir).as_posix()
+    except ValueError:
+        return str(image_path)
+
+
+def compile_map(tmx_path: Path, bundle_path: Path = None, scale: float = C.SCALE_FACTOR) -> Path:
+    """Разбирает TMX и записывает скомпилированную карту. Возвращает путь к ней"""
+    tmx_path = Path(tmx_path)
+    bundle_path = Path(bundle_path) if bundle_path else get_bundle_path(tmx_path)
+    tiled_map = pytiled_parser.parse_map(tmx_path)
+
+    width = tiled_map.map_size.width
+    height = tiled_map.map_size.height
+    tile_width = tiled_map.tile_size.width
+    tile_height = tiled_map.tile_size.height
+    map_height_px = height * tile_height
+
+    tilesets = []
+    for firstgid, tileset in sorted(tiled_map.tilesets.items()):
+        tilesets.append({
+            "firstgid": firstgid,
+            "image": _relative_image_path(tileset.image) if tileset.image else None,
+            "tile_width": tileset.tile_width,
+            "tile_height": tileset.tile_height,
+            "spacing": tileset.spacing,
+            "margin": tileset.margin,
+            "columns": tileset.columns,
+            "tile_count": tileset.tile_count,
+        })
+
+    tile_layers = []
+    objects: Dict[str, List[dict]] = {}
+    collision_grid = CollisionGrid(width, height)
+
+    for layer in _iter_layers(tiled_map.layers):
+        if hasattr(layer, "tiled_objects"):
+            converted = [_convert_object(obj, map_height_px, scale) for obj in layer.tiled_objects]
+            objects[layer.name] = [obj for obj in converted if obj]
+        elif getattr(layer, "data", None):
+            gids = array("I", (gid for row in layer.data for gid in row))
+            tile_layers.append((layer.name, gids))
+
+            if layer.name.lower() == COLLISIONS_LAYER:
+                for index, gid in enumerate(gids):
+                    if gid & GID_MASK:
+                        row, col = divmod(index, width)
+                        collision_grid.set_blocked(col, height - 1 - row)
+
+    # Сначала массивы тайлов (выровнены по 4 байта), затем сетка коллизий, метаданные в конце
+    layers_meta = []
+    body = bytearray()
+    offset = HEADER.size
+    for name, gids in tile_layers:
+        layers_meta.append({"name": name, "offset": offset + len(body), "count": len(gids)})
+        body += gids.tobytes()
+
+    bits = collision_grid.to_bits()
+    bits_offset = offset + len(body)
+    body += bits
+
+    meta = json.dumps({
+        "width": width,
+        "height": height,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "scale": scale,
+        "tilesets": tilesets,
+        "layers": layers_meta,
+        "objects": objects,
+    }, ensure_ascii=False).encode("utf-8")
+    meta_offset = offset + len(body)
+
+    stat = tmx_path.stat()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, stat.st_mtime_ns, stat.st_size, _file_sha1(tmx_path),
+                         meta_offset, len(meta), bits_offset, len(bits))
+
+    # Пишем во временный файл и подменяем - недописанная карта никогда не окажется на месте готовой
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = bundle_path.with_suffix(bundle_path.suffix + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.write(meta)
+    os.replace(temp_path, bundle_path)
+
+    logger.info(f"Карта скомпилирована: {tmx_path.name} -> {bundle_path}")
+    return bundle_path
+
+
+def is_bundle_fresh(tmx_path: Path, bundle_path: Path) -> bool:
+    """Соответствует ли скомпилированная карта текущему TMX"""
+    if not bundle_path.exists():
+        return False
+
+    try:
+        with open(bundle_path, "rb") as f:
+            raw = f.read(HEADER.size)
+        magic, version, _, mtime_ns, size, sha1, *_ = HEADER.unpack(raw)
+    except (OSError, struct.error):
+        return False
+
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return False
+
+    stat = tmx_path.stat()
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+        return True
+
+    # mtime изменился (например, после checkout) - сверяем содержимое
+    return stat.st_size == size and _file_sha1(tmx_path) == sha1
+
+
+def _shape_from_json(shape):
+    """Точка -> (x, y), многоугольник -> [(x, y), ...], как у arcade.TileMap"""
+    if shape and isinstance(shape[0], list):
+        return [tuple(point) for point in shape]
+    return tuple(shape)
+
+
+class CompiledMap:
+    """
+    Скомпилированная карта, отображённая в память (mmap).
+    Отображение держит файл открытым, пока карту не закроют (close или with):
+    до этого, например, в Windows бандл нельзя перезаписать при перекомпиляции
+    """
+
+    def __init__(self, bundle_path: Path):
+        self.path = Path(bundle_path)
+
+        with open(self.path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (_, _, _, _, _, _, meta_offset, meta_size, self._bits_offset, self._bits_size) = \
+            HEADER.unpack_from(self._buffer, 0)
+        meta = json.loads(bytes(self._buffer[meta_offset:meta_offset + meta_size]).decode("utf-8"))
+
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.tile_width = meta["tile_width"]
+        self.tile_height = meta["tile_height"]
+        self.scale = meta["scale"]
+        self.tilesets = meta["tilesets"]
+        self._layers = {layer["name"]: layer for layer in meta["layers"]}
+        self._objects = meta["objects"]
+
+    @property
+    def layer_names(self) -> List[str]:
+        """Слои тайлов в порядке отрисовки"""
+        return list(self._layers)
+
+    def get_layer(self, name: str):
+        """id тайлов слоя (строки сверху вниз) прямо из отображённого файла"""
+        layer = self._layers.get(name)
+        if layer is None:
+            return None
+        start = layer["offset"]
+        return memoryview(self._buffer)[start:start + layer["count"] * 4].cast("I")
+
+    def get_collision_grid(self, tile_size: float = C.TILE_SIZE) -> CollisionGrid:
+        bits = self._buffer[self._bits_offset:self._bits_offset + self._bits_size]
+        return CollisionGrid.from_bits(bits, self.width, self.height, tile_size)
+
+    @property
+    def object_lists(self) -> Dict[str, list]:
+        """Объекты по слоям в том же виде, что и у arcade.TileMap (shape, name, type, properties)"""
+        return {
+            layer_name: [SimpleNamespace(shape=_shape_from_json(obj["shape"]), name=obj["name"],
+                                         type=obj["type"], properties=obj["properties"]) for obj in objects]
+            for layer_name, objects in self._objects.items()
+        }
+
+    def get_tile_positions(self, layer_name: str, tile_size: float = C.TILE_SIZE):
+        """Центры непустых тайлов слоя в координатах мира"""
+        gids = self.get_layer(layer_name)
+        if gids is None:
+            return []
+
+        positions = []
+        for index, gid in enumerate(gids):
+            if gid & GID_MASK:
+                row, col = divmod(index, self.width)
+                positions.append(((col + 0.5) * tile_size, (self.height - row - 0.5) * tile_size))
+        return positions
+
+    @property
+    def closed(self) -> bool:
+        return self._buffer.closed
+
+    def close(self):
+        """Закрывает отображение файла (после этого слои карты не читаются)"""
+        if not self._buffer.closed:
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_compiled_map(tmx_path: Path, scale: float = C.SCALE_FACTOR) -> CompiledMap:
+    """Открывает скомпилированную карту, перекомпилируя её, если TMX или масштаб изменились"""
+    tmx_path = Path(tmx_path)
+    bundle_path = get_bundle_path(tmx_path)
+
+    if is_bundle_fresh(tmx_path, bundle_path):
+        compiled = CompiledMap(bundle_path)
+        if compiled.scale == scale:
+            return compiled
+        # Бандл под другой масштаб - закрываем до перезаписи
+        compiled.close()
+
+    compile_map(tmx_path, bundle_path, scale)
+    return CompiledMap(bundle_path)
+
+
+def compile_maps(force: bool = False) -> List[Path]:
+    """Компилирует все карты из res/maps"""
+    maps_dir = Path(resource_manager.get_resource_path("maps"))
+    compiled = []
+    for tmx_path in sorted(maps_dir.glob("*.tmx")):
+        bundle_path = get_bundle_path(tmx_path)
+        if force or not is_bundle_fresh(tmx_path, bundle_path):
+            try:
+                compiled.append(compile_map(tmx_path, bundle_path))
+            except Exception as e:
+                logger.error(f"Ошибка компиляции {tmx_path.name}: {e}")
+    return compiled
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    result = compile_maps(force="--force" in sys.argv)
+    logger.info(f"Скомпилировано карт: {len(result)}")
@@ -1,4 +1,3 @@
-import arcade
 import logging
 
 from src.core.resource_manager import resource_manager
@@ -7,6 +6,8 @@ from src.events.event_manager import EventManager
 from config import constants as C
 from pathlib import Path
 from src.entities.chest import ChestSprite
+from src.world.chunked_tile_layer import ChunkedTileLayer
+from src.world.map_compiler import COLLISIONS_LAYER, CONTAINERS_LAYER, load_compiled_map
 from src.core.game_data import game_data
 
 
@@ -19,109 +20,142 @@ class MapLoader:
         self.event_manager = None
 
         # Загруженная карта
-        self.tile_map = None
-        self.scene = None
+        self.map_name = None
+        self.compiled_map = None
 
-        # Слои
+        # Видимые слои тайлов (рисуются чанками)
+        self.tile_layers = {}
         self.ground_layer = None
         self.walls_layer = None
-        self.collisions_layer = None
-        self.containers_layer = None
+
+        # Сетка занятости тайлов (хранится в скомпилированной карте)
+        self.collision_grid = None
 
         # Границы карты
         self.bounds = None
 
-    def load(self, map_file: str, scale: float = C.SCALE_FACTOR) -> bool:
+        # Карта загружена полностью (все шаги load_steps пройдены)
+        self.loaded = False
+
+    def load(self, map_file: str, scale: float = C.SCALE_FACTOR, compiled_map=None) -> bool:
         """
-        Загружает Tiled карту.
+        Загружает карту Tiled из скомпилированного файла (TMX разбирается, только если изменился).
+        compiled_map: уже открытая скомпилированная карта, например из фоновой подгрузки
         """
         try:
-            # Извлекаем имя карты из пути
-            map_name = Path(map_file).stem
-
-            self.event_manager = EventManager()
-
-            # Полный путь к файлу
-            project_root = Path(self.rm.get_project_root())
-            map_path = project_root / "res" / map_file
-
-            self.logger.info(f"Загрузка карты: {map_path}")
-
-            if not map_path.exists():
-                self.logger.warning(f"Файл не найден: {map_path}")
-                return False
-
-            # Загружаем карту
-            self.tile_map = arcade.load_tilemap(
-                str(map_path),
-                scaling=scale,
-                layer_options={
-                    "ground": {"use_spatial_hash": False},
-                    "walls": {"use_spatial_hash": False},
-                    "collisions": {"use_spatial_hash": True},
-                    "containers": {"use_spatial_hash": False}
-                }
-            )
-
-            # Получаем границы
-            self._calculate_bounds()
-
-            # Получаем слои
-            self.ground_layer = self.tile_map.sprite_lists.get("ground")
-            self.walls_layer = self.tile_map.sprite_lists.get("walls")
-            self.collisions_layer = self.tile_map.sprite_lists.get("collisions")
-            self.containers_layer = self.tile_map.sprite_lists.get("containers")
-
-            # Загружаем события (сундуки, телепорты)
-            self._load_events(scale, map_name)
+            for _ in self.load_steps(map_file, scale, compiled_map):
+                pass
+        except Exception as e:
+            self.logger.error(f"Ошибка загрузки карты: {e}")
+            return False
+        return self.loaded
 
-            # Создаем сцену
-            self.scene = arcade.Scene.from_tilemap(self.tile_map)
+    def load_steps(self, map_file: str, scale: float = C.SCALE_FACTOR, compiled_map=None):
+        """
+        Та же загрузка по шагам (каждый yield - граница шага), чтобы растянуть сборку карты на несколько кадров.
+        Шаги: открытие карты, текстуры, слои тайлов по одному, события, сундуки, зоны, существа по одному.
+        Ошибки не перехватываются - их ловит тот, кто ведёт шаги
+        """
+        # Извлекаем имя карты из пути
+        map_name = Path(map_file).stem
+        self.map_name = map_name
 
-            # Скрываем невидимые слои
-            if self.collisions_layer:
-                for sprite in self.collisions_layer:
-                    sprite.visible = False
-            if self.containers_layer:
-                for container in self.containers_layer:
-                    container.visible = False
-            # При загрузке зон добавляем имя карты
-            self.load_mob_zones(map_name)
+        self.event_manager = EventManager()
 
-            # При загрузке существ передаем имя карты
-            self.load_entities(map_name)
+        # Полный путь к файлу
+        project_root = Path(self.rm.get_project_root())
+        map_path = project_root / "res" / map_file
 
+        self.logger.info(f"Загрузка карты: {map_path}")
 
-            return True
+        if not map_path.exists():
+            self.logger.warning(f"Файл не найден: {map_path}")
+            return
 
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки карты: {e}")
-            return False
+        # Загружаем карту
+        self.compiled_map = compiled_map or load_compiled_map(map_path, scale)
+
+        # Получаем границы
+        self._calculate_bounds()
+
+        # Коллизии уже запечены в сетку тайлов
+        self.collision_grid = self.compiled_map.get_collision_grid()
+        yield
+
+        # Видимые слои: спрайты создаются по чанкам при первом появлении в кадре
+        textures = self._get_tile_textures()
+        yield
+        self.tile_layers = {}
+        for layer_name in self.compiled_map.layer_names:
+            if layer_name.lower() in (COLLISIONS_LAYER, CONTAINERS_LAYER):
+                continue
+            self.tile_layers[layer_name] = ChunkedTileLayer(self.compiled_map, layer_name, textures, scale)
+            yield
+
+        # Получаем слои
+        self.ground_layer = self.tile_layers.get("ground")
+        self.walls_layer = self.tile_layers.get("walls")
+
+        # Загружаем события (сундуки, телепорты)
+        yield from self._load_events(scale, map_name)
+
+        # При загрузке зон добавляем имя карты
+        self.load_mob_zones(map_name)
+        yield
+
+        # При загрузке существ передаем имя карты; каждое существо - свой шаг (загрузка его текстур)
+        mob_count = 0
+        for index, obj in enumerate(self._object_list("entities")):
+            if self._create_entity_from_object(obj, index, map_name):
+                mob_count += 1
+            yield
+        self.logger.info(f"Загружено существ для карты '{map_name}': {mob_count}")
+
+        self.loaded = True
+
+    def _object_list(self, name: str):
+        """Объекты слоя объектов Tiled по имени (без учёта регистра)"""
+        for layer_name, object_list in self.compiled_map.object_lists.items():
+            if layer_name.lower() == name:
+                return object_list
+        return []
+
+    def _get_tile_textures(self):
+        """Текстуры тайлов по id (gid) из всех тайлсетов карты"""
+        textures = {}
+        for tileset in self.compiled_map.tilesets:
+            if not tileset["image"]:
+                continue
+            tileset_textures = self.rm.load_tileset(
+                tileset["image"],
+                tile_size=(tileset["tile_width"], tileset["tile_height"]),
+                columns=tileset["columns"],
+                count=tileset["tile_count"],
+                spacing=tileset["spacing"],
+                margin=tileset["margin"],
+            )
+            for index, texture in enumerate(tileset_textures):
+                textures[tileset["firstgid"] + index] = texture
+        return textures
 
     def _load_events(self, scale: float, map_name: str = None):
-        """Загружает события из Tiled с восстановлением состояния"""
-        for layer_name, object_list in self.tile_map.object_lists.items():
-            if layer_name.lower() == "events":
-                # Передаем имя карты в менеджер событий
-                self.event_manager.load_events_from_objects(object_list, scale, map_name)
-                break
+        """Загружает события из Tiled с восстановлением состояния (шаги: события, спрайты сундуков)"""
+        # Передаем имя карты в менеджер событий
+        self.event_manager.load_events_from_objects(self._object_list("events"), scale, map_name)
+        yield
 
         # Создаем визуальные спрайты сундуков
-        if self.containers_layer:
-            self._create_chest_sprites_from_layer(self.containers_layer, scale, map_name)
-
-    def _create_chest_sprites_from_layer(self, containers_layer, scale, map_name: str = None):
-        """Создает спрайты сундуков"""
-        if not containers_layer:
-            return
-
-        for tile_sprite in containers_layer:
-            sprite_x = tile_sprite.center_x
-            sprite_y = tile_sprite.center_y
-
+        chest_positions = self.compiled_map.get_tile_positions(CONTAINERS_LAYER)
+        if chest_positions:
+            self._create_chest_sprites(chest_positions, scale, map_name)
+        yield
+
+    def _create_chest_sprites(self, chest_positions, scale, map_name: str = None):
+        """Создает спрайты сундуков в центрах тайлов слоя контейнеров"""
+        for sprite_x, sprite_y in chest_positions:
             chest_event = self.event_manager.find_nearest_chest_event(
                 sprite_x, sprite_y,
-                max_distance=self.tile_map.tile_width * 3
+                max_distance=self.compiled_map.tile_width * 3
             )
 
             if chest_event:
@@ -136,26 +170,19 @@ class MapLoader:
                     )
                     chest_event.set_sprite(sprite)
                     chest_event.map_name = map_name  # Устанавливаем карту для сундука
+                    # Сохранённое состояние сундук получил при загрузке событий, визуал - в set_sprite
                     self.event_manager.chest_sprites.append(sprite)
 
-                    # Восстанавливаем состояние сундука
-                    saved_state = self.event_manager.get_event_state(chest_event.event_id)
-                    if saved_state:
-                        chest_event.is_empty = saved_state.get("is_empty", False)
-                        if chest_event.is_empty and sprite:
-                            sprite.update_visual()
-
                 except Exception as e:
                     self.logger.warning(f"Ошибка создания спрайта: {e}")
     def _calculate_bounds(self):
         """Вычисляет границы карты в пикселях"""
-        if not self.tile_map:
+        if not self.compiled_map:
             self.bounds = {'left': 0, 'right': 0, 'bottom': 0, 'top': 0, 'width': 0, 'height': 0}
             return
 
-        # В Tiled координаты уже в пикселях после загрузки через arcade
-        width_px = self.tile_map.width * C.TILE_SIZE
-        height_px = self.tile_map.height * C.TILE_SIZE
+        width_px = self.compiled_map.width * C.TILE_SIZE
+        height_px = self.compiled_map.height * C.TILE_SIZE
 
         self.bounds = {
             'left': 0,
@@ -170,17 +197,13 @@ class MapLoader:
         """Загружает зоны для монстров (прямоугольники)"""
         zones = []
 
-        for layer_name, object_list in self.tile_map.object_lists.items():
-            if layer_name.lower() == "zones":
-                for i, obj in enumerate(object_list):
-                    zone = self._create_zone_from_object(obj, i, map_name)
-                    if zone:
-                        zones.append(zone)
-                        game_data.add_mob_zone(zone["id"], zone)
-
-                self.logger.info(f"Загружено зон для карты '{map_name}': {len(zones)}")
-                break
+        for i, obj in enumerate(self._object_list("zones")):
+            zone = self._create_zone_from_object(obj, i, map_name)
+            if zone:
+                zones.append(zone)
+                game_data.add_mob_zone(zone["id"], zone)
 
+        self.logger.info(f"Загружено зон для карты '{map_name}': {len(zones)}")
         return zones
 
     def _create_zone_from_object(self, obj, index: int, map_name: str = None):
@@ -226,20 +249,16 @@ class MapLoader:
         """Загружает существ (монстры и NPC) для конкретной карты"""
         mob_list = []
 
-        if not self.tile_map:
+        if not self.compiled_map:
             return mob_list
 
         # Загружаем существ
-        for layer_name, object_list in self.tile_map.object_lists.items():
-            if layer_name.lower() == 'entities':
-                for index, obj in enumerate(object_list):
-                    mob = self._create_entity_from_object(obj, index, map_name)
-                    if mob:
-                        mob_list.append(mob)
-
-                self.logger.info(f"Загружено существ для карты '{map_name}': {len(mob_list)}")
-                break
+        for index, obj in enumerate(self._object_list("entities")):
+            mob = self._create_entity_from_object(obj, index, map_name)
+            if mob:
+                mob_list.append(mob)
 
+        self.logger.info(f"Загружено существ для карты '{map_name}': {len(mob_list)}")
         return mob_list
 
     def _create_entity_from_object(self, obj, index: int, map_name: str = None):
@@ -291,18 +310,41 @@ class MapLoader:
 
         return None
 
-    def get_collision_layer(self):
-        """Возвращает слой коллизий"""
-        return self.collisions_layer
+    def unload(self):
+        """Освобождает карту: собранные чанки и отображённый в память файл скомпилированной карты"""
+        for layer in self.tile_layers.values():
+            layer.clear()
+        self.tile_layers = {}
+        self.ground_layer = None
+        self.walls_layer = None
+        if self.compiled_map is not None:
+            self.compiled_map.close()
+            self.compiled_map = None
+        self.loaded = False
+
+    def get_teleport_targets(self):
+        """Имена карт, на которые ведут телепорты этой карты"""
+        if not self.event_manager:
+            return set()
+        return {event.target_map for event in self.event_manager.events_by_type.get("teleport", ())
+                if getattr(event, "target_map", None)}
+
+    def get_sprite_count(self) -> int:
+        """Число созданных спрайтов карты (оценка занимаемой памяти)"""
+        return sum(layer.sprite_count for layer in self.tile_layers.values())
+
+    def get_collision_grid(self):
+        """Возвращает сетку коллизий"""
+        return self.collision_grid
 
     def get_bounds(self):
         """Возвращает границы карты"""
         return self.bounds
 
-    def draw(self):
-        """Отрисовывает карту"""
-        if self.scene:
-            self.scene.draw()
+    def draw(self, view_rect=None):
+        """Отрисовывает видимые чанки карты (view_rect: left, bottom, right, top)"""
+        for layer in self.tile_layers.values():
+            layer.draw(view_rect)
 
     def update_events(self, delta_time: float, player, game_state):
         """Обновляет события"""
@@ -0,0 +1,55 @@
+from typing import Tuple
+
+
+def move_and_collide(sprite, dx: float, dy: float, collision_grid=None) -> Tuple[int, int]:
+    """
+    Перемещает спрайт сначала по X, затем по Y, останавливая его вплотную к стене.
+    Возвращает нормаль контакта (normal_x, normal_y): -1/1 - с какой стороны стена оттолкнула, 0 - не было.
+    """
+    if collision_grid is None:
+        sprite.center_x += dx
+        sprite.center_y += dy
+        return 0, 0
+
+    normal_x, normal_y = 0, 0
+
+    if dx:
+        allowed, hit = collision_grid.sweep_x(sprite.left, sprite.bottom, sprite.right, sprite.top, dx)
+        sprite.center_x += allowed
+        if hit:
+            normal_x = -1 if dx > 0 else 1
+
+    if dy:
+        allowed, hit = collision_grid.sweep_y(sprite.left, sprite.bottom, sprite.right, sprite.top, dy)
+        sprite.center_y += allowed
+        if hit:
+            normal_y = -1 if dy > 0 else 1
+
+    return normal_x, normal_y
+
+
+def sweep_box(collision_grid, x: float, y: float, box, dx: float, dy: float):
+    """
+    То же, что move_and_collide, но для прямоугольника без спрайта (для пакетных обновлений).
+    box: (left, bottom, right, top) - края относительно центра (x, y)
+    Возвращает (новый x, новый y, normal_x, normal_y)
+    """
+    if collision_grid is None:
+        return x + dx, y + dy, 0, 0
+
+    left, bottom, right, top = box
+    normal_x, normal_y = 0, 0
+
+    if dx:
+        allowed, hit = collision_grid.sweep_x(x + left, y + bottom, x + right, y + top, dx)
+        x += allowed
+        if hit:
+            normal_x = -1 if dx > 0 else 1
+
+    if dy:
+        allowed, hit = collision_grid.sweep_y(x + left, y + bottom, x + right, y + top, dy)
+        y += allowed
+        if hit:
+            normal_y = -1 if dy > 0 else 1
+
+    return x, y, normal_x, normal_y
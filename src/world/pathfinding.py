@@ -0,0 +1,223 @@
+import heapq
+import logging
+import math
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+Tile = Tuple[int, int]
+
+# Соседи по 4 направлениям (без диагоналей, как и движение существ)
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Pathfinder:
+    """
+    Поиск пути по сетке коллизий.
+    - A* для отдельных запросов с кэшем "следующего шага" для каждой цели
+    - общее поле потока к игроку для всех преследователей одного размера сразу
+    Размер существа задаётся запасом (clearance) - сколько тайлов хитбокс занимает
+    вокруг центрального по каждую сторону. Тайл проходим с запасом r, если свободен
+    квадрат (2r + 1) x (2r + 1) вокруг него, то есть стены как бы расширены на r тайлов.
+    """
+
+    def __init__(self, collision_grid, cache_size: int = 64, max_nodes: int = 2000, flow_radius: int = 24):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.grid = collision_grid
+
+        # Кэш путей: {(цель, запас): {тайл: следующий тайл}} - любой тайл найденного пути сразу знает, куда идти
+        self.cache_size = cache_size
+        self._next_hop: "OrderedDict[Tuple[Tile, int], Dict[Tile, Tile]]" = OrderedDict()
+        # Недостижимые (старт, цель, запас), чтобы не повторять безуспешный поиск каждый кадр
+        self._unreachable: "OrderedDict[Tuple[Tile, Tile, int], bool]" = OrderedDict()
+
+        # Ограничение A* на число раскрытых узлов (ограничивает стоимость кадра)
+        self.max_nodes = max_nodes
+
+        # Поля потока к одной цели: {запас: {тайл: расстояние до цели в шагах}}, строятся по первому запросу
+        self.flow_radius = flow_radius
+        self.flow_goal: Optional[Tile] = None
+        self._flows: Dict[int, Dict[Tile, int]] = {}
+
+    # ---КООРДИНАТЫ---
+    def world_to_tile(self, x: float, y: float) -> Tile:
+        return int(x // self.grid.tile_size), int(y // self.grid.tile_size)
+
+    def tile_center(self, tile: Tile) -> Tuple[float, float]:
+        tile_size = self.grid.tile_size
+        return (tile[0] + 0.5) * tile_size, (tile[1] + 0.5) * tile_size
+
+    def clearance(self, box) -> int:
+        """
+        Запас в тайлах для хитбокса (left, bottom, right, top) относительно центра:
+        на сколько тайлов он выступает за центральный, если стоит в центре тайла
+        """
+        left, bottom, right, top = box
+        overhang = max(-left, -bottom, right, top) - self.grid.tile_size / 2
+        if overhang <= 0:
+            return 0
+        return math.ceil(overhang / self.grid.tile_size - 1e-6)
+
+    def _is_walkable(self, tile: Tile, clearance: int = 0) -> bool:
+        tx, ty = tile
+        grid = self.grid
+        if not (0 <= tx < grid.width and 0 <= ty < grid.height):
+            return False
+        if not clearance:
+            return not grid.is_blocked(tx, ty)
+        tile_size = grid.tile_size
+        return not grid.collides_rect((tx - clearance) * tile_size, (ty - clearance) * tile_size,
+                                      (tx + clearance + 1) * tile_size, (ty + clearance + 1) * tile_size)
+
+    # ---A*---
+    def find_path(self, start: Tile, goal: Tile, clearance: int = 0) -> Optional[List[Tile]]:
+        """
+        A* от start до goal для существа с запасом clearance.
+        Возвращает список тайлов без стартового или None
+        """
+        if start == goal:
+            return []
+        if not self._is_walkable(goal, clearance):
+            return None
+
+        open_heap = [(0, start)]
+        came_from: Dict[Tile, Tile] = {}
+        cost: Dict[Tile, int] = {start: 0}
+        closed = set()
+        expanded = 0
+
+        while open_heap:
+            _, current = heapq.heappop(open_heap)
+            if current == goal:
+                break
+            # Устаревшая запись кучи: узел уже раскрыт по более дешёвому пути
+            if current in closed:
+                continue
+            closed.add(current)
+
+            expanded += 1
+            if expanded > self.max_nodes:
+                return None
+
+            for ox, oy in NEIGHBOURS:
+                neighbour = (current[0] + ox, current[1] + oy)
+                if neighbour in closed or not self._is_walkable(neighbour, clearance):
+                    continue
+                new_cost = cost[current] + 1
+                if new_cost < cost.get(neighbour, new_cost + 1):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = current
+                    heuristic = abs(goal[0] - neighbour[0]) + abs(goal[1] - neighbour[1])
+                    heapq.heappush(open_heap, (new_cost + heuristic, neighbour))
+        else:
+            return None
+
+        path = [goal]
+        while path[-1] in came_from and came_from[path[-1]] != start:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
+
+    def next_waypoint(self, x: float, y: float, target_x: float, target_y: float, clearance: int = 0):
+        """
+        Центр следующего тайла на пути к цели (с кэшем для каждого запаса).
+        None - если цель в том же тайле или пути нет
+        """
+        start = self.world_to_tile(x, y)
+        goal = self.world_to_tile(target_x, target_y)
+        if start == goal:
+            return None
+
+        key = (goal, clearance)
+        hops = self._next_hop.get(key)
+        if hops is not None:
+            self._next_hop.move_to_end(key)
+            if start in hops:
+                return self.tile_center(hops[start])
+
+        if (start, goal, clearance) in self._unreachable:
+            return None
+
+        path = self.find_path(start, goal, clearance)
+        if not path:
+            self._unreachable[(start, goal, clearance)] = True
+            if len(self._unreachable) > self.cache_size:
+                self._unreachable.popitem(last=False)
+            return None
+
+        # Запоминаем следующий шаг для каждого тайла пути
+        if hops is None:
+            hops = {}
+            self._next_hop[key] = hops
+            if len(self._next_hop) > self.cache_size:
+                self._next_hop.popitem(last=False)
+
+        previous = start
+        for tile in path:
+            hops[previous] = tile
+            previous = tile
+
+        return self.tile_center(path[0])
+
+    # ---ПОЛЕ ПОТОКА---
+    def update_flow_field(self, target_x: float, target_y: float):
+        """Сбрасывает поля потока, если цель сменила тайл (пересчёт - при первом запросе каждого запаса)"""
+        goal = self.world_to_tile(target_x, target_y)
+        if goal == self.flow_goal:
+            return
+
+        self.flow_goal = goal
+        self._flows = {}
+
+    def _flow_field(self, clearance: int) -> Dict[Tile, int]:
+        """Поле потока к текущей цели для существ с запасом clearance (BFS от цели)"""
+        flow = self._flows.get(clearance)
+        if flow is not None:
+            return flow
+
+        goal = self.flow_goal
+        flow = self._flows[clearance] = {goal: 0}
+        queue = deque([goal])
+
+        while queue:
+            current = queue.popleft()
+            distance = flow[current]
+            if distance >= self.flow_radius:
+                continue
+            for ox, oy in NEIGHBOURS:
+                neighbour = (current[0] + ox, current[1] + oy)
+                if neighbour not in flow and self._is_walkable(neighbour, clearance):
+                    flow[neighbour] = distance + 1
+                    queue.append(neighbour)
+
+        return flow
+
+    def flow_waypoint(self, x: float, y: float, clearance: int = 0):
+        """
+        Центр соседнего тайла, ближе к цели поля потока для этого запаса.
+        Крупное существо у стены может стоять в тайле вне своего поля - тогда ведём в соседний тайл поля.
+        None - если поля нет, рядом нет тайлов поля или точка уже в тайле цели
+        """
+        if self.flow_goal is None:
+            return None
+        flow = self._flow_field(clearance)
+        tile = self.world_to_tile(x, y)
+        distance = flow.get(tile, math.inf)
+        if not distance:
+            return None
+
+        best = None
+        for ox, oy in NEIGHBOURS:
+            neighbour = (tile[0] + ox, tile[1] + oy)
+            neighbour_distance = flow.get(neighbour)
+            if neighbour_distance is not None and neighbour_distance < distance:
+                distance = neighbour_distance
+                best = neighbour
+
+        return self.tile_center(best) if best else None
+
+    def clear_cache(self):
+        """Сбрасывает кэш путей и поле потока"""
+        self._next_hop.clear()
+        self._unreachable.clear()
+        self.flow_goal = None
+        self._flows = {}
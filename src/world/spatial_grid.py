@@ -0,0 +1,113 @@
+import math
+from typing import Dict, List, Tuple, Any, Set
+
+
+class SpatialGrid:
+    """
+    Равномерная сетка ячеек для быстрого поиска объектов по координатам.
+    Каждый объект хранится в одной ячейке по своей точке (обычно центру спрайта).
+    """
+
+    def __init__(self, cell_size: float = 256):
+        self.cell_size = cell_size
+
+        # {(cx, cy): {объект, ...}}
+        self._cells: Dict[Tuple[int, int], Set[Any]] = {}
+        # {объект: (ячейка, x, y)}
+        self._items: Dict[Any, Tuple[Tuple[int, int], float, float]] = {}
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, obj, x: float, y: float):
+        """Добавляет объект (или переносит, если он уже есть)"""
+        if obj in self._items:
+            self.move(obj, x, y)
+            return
+
+        cell = self._cell_of(x, y)
+        self._cells.setdefault(cell, set()).add(obj)
+        self._items[obj] = (cell, x, y)
+
+    def remove(self, obj):
+        """Удаляет объект из сетки"""
+        entry = self._items.pop(obj, None)
+        if entry is None:
+            return
+
+        cell = entry[0]
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(obj)
+            if not bucket:
+                del self._cells[cell]
+
+    def move(self, obj, x: float, y: float):
+        """Обновляет позицию объекта. Ячейка меняется только при пересечении её границы"""
+        entry = self._items.get(obj)
+        if entry is None:
+            self.insert(obj, x, y)
+            return
+
+        old_cell = entry[0]
+        new_cell = self._cell_of(x, y)
+        if new_cell != old_cell:
+            bucket = self._cells.get(old_cell)
+            if bucket is not None:
+                bucket.discard(obj)
+                if not bucket:
+                    del self._cells[old_cell]
+            self._cells.setdefault(new_cell, set()).add(obj)
+
+        self._items[obj] = (new_cell, x, y)
+
+    def query_rect(self, left: float, bottom: float, right: float, top: float) -> List[Any]:
+        """Возвращает объекты, чьи точки лежат внутри прямоугольника"""
+        result = []
+        min_cx, min_cy = self._cell_of(left, bottom)
+        max_cx, max_cy = self._cell_of(right, top)
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    _, x, y = self._items[obj]
+                    if left <= x <= right and bottom <= y <= top:
+                        result.append(obj)
+
+        return result
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """Возвращает объекты в радиусе от точки (без извлечения корня)"""
+        result = []
+        radius_sq = radius * radius
+        min_cx, min_cy = self._cell_of(x - radius, y - radius)
+        max_cx, max_cy = self._cell_of(x + radius, y + radius)
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    _, ox, oy = self._items[obj]
+                    if (ox - x) ** 2 + (oy - y) ** 2 <= radius_sq:
+                        result.append(obj)
+
+        return result
+
+    def clear(self):
+        """Очищает сетку"""
+        self._cells.clear()
+        self._items.clear()
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, obj) -> bool:
+        return obj in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
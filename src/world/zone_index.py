@@ -0,0 +1,185 @@
+import math
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from config import constants as C
+
+Cell = Tuple[int, int]
+
+
+def zone_bounds(rect) -> Tuple[float, float, float, float]:
+    """
+    (left, bottom, right, top) прямоугольника зоны.
+    y - верхний край (так хранятся зоны из Tiled), высота берётся по модулю
+    """
+    x, y, w, h = rect
+    return x, y - abs(h), x + w, y
+
+
+def zone_center(rect) -> Tuple[float, float]:
+    """Центр зоны (как считался в GameData.find_nearest_zone)"""
+    x, y, w, h = rect
+    return x + w / 2, y + h / 2
+
+
+class ZoneIndex:
+    """
+    Индекс зон монстров одной карты: равномерная сетка над прямоугольниками зон.
+    Центры зон лежат в одной ячейке каждая (для поиска ближайшей, кольцами от точки),
+    площадь зоны - во всех ячейках, которые она накрывает (для поиска зоны под точкой).
+    Возвращаются общие записи только для чтения (MappingProxyType), а не копии.
+    """
+
+    def __init__(self, cell_size: float = C.TILE_SIZE * 8):
+        self.cell_size = cell_size
+
+        # {id зоны: запись}, и порядок добавления (при равном расстоянии побеждает более ранняя)
+        self._records: Dict[str, Mapping] = {}
+        self._order: Dict[str, int] = {}
+        self._counter = 0
+
+        # {ячейка: [id зон с центром в ней]} и {ячейка: [id зон, накрывающих её]}
+        self._centers: Dict[Cell, List[str]] = {}
+        self._cover: Dict[Cell, List[str]] = {}
+
+        # Границы занятых ячеек центров (чтобы поиск колец знал, где остановиться)
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, zone_id) -> bool:
+        return zone_id in self._records
+
+    def get(self, zone_id: str) -> Optional[Mapping]:
+        return self._records.get(zone_id)
+
+    def add(self, zone_id: str, zone: dict) -> Mapping:
+        """Добавляет зону (повторное добавление с тем же id заменяет её)"""
+        if zone_id in self._records:
+            self.remove(zone_id)
+
+        record = MappingProxyType(dict(zone, id=zone_id))
+        self._records[zone_id] = record
+        self._order[zone_id] = self._counter
+        self._counter += 1
+
+        cell = self._cell_of(*zone_center(record["rect"]))
+        self._centers.setdefault(cell, []).append(zone_id)
+        self._extend_bounds(cell)
+
+        for cell in self._covered_cells(record["rect"]):
+            self._cover.setdefault(cell, []).append(zone_id)
+
+        return record
+
+    def remove(self, zone_id: str):
+        record = self._records.pop(zone_id, None)
+        if record is None:
+            return
+        del self._order[zone_id]
+
+        cell = self._cell_of(*zone_center(record["rect"]))
+        self._discard(self._centers, cell, zone_id)
+        for cell in self._covered_cells(record["rect"]):
+            self._discard(self._cover, cell, zone_id)
+
+    def clear(self):
+        self._records.clear()
+        self._order.clear()
+        self._centers.clear()
+        self._cover.clear()
+        self._bounds = None
+
+    @staticmethod
+    def _discard(cells: Dict[Cell, List[str]], cell: Cell, zone_id: str):
+        bucket = cells.get(cell)
+        if bucket and zone_id in bucket:
+            bucket.remove(zone_id)
+            if not bucket:
+                del cells[cell]
+
+    def _covered_cells(self, rect):
+        left, bottom, right, top = zone_bounds(rect)
+        min_cx, min_cy = self._cell_of(left, bottom)
+        max_cx, max_cy = self._cell_of(right, top)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                yield cx, cy
+
+    def _extend_bounds(self, cell: Cell):
+        cx, cy = cell
+        if self._bounds is None:
+            self._bounds = (cx, cy, cx, cy)
+            return
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        self._bounds = (min(min_cx, cx), min(min_cy, cy), max(max_cx, cx), max(max_cy, cy))
+
+    # ---ЗАПРОСЫ---
+    def nearest(self, x: float, y: float, max_distance: float = 1000) -> Optional[Mapping]:
+        """Зона с ближайшим к точке центром (не дальше max_distance)"""
+        found = self.nearest_with_distance(x, y, max_distance)
+        return found[1] if found else None
+
+    def nearest_with_distance(self, x: float, y: float, max_distance: float = 1000):
+        """(расстояние, запись) ближайшей зоны или None"""
+        if not self._records:
+            return None
+
+        cell_size = self.cell_size
+        qx, qy = self._cell_of(x, y)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        # Дальше этого кольца занятых ячеек нет
+        last_ring = max(abs(qx - min_cx), abs(qx - max_cx), abs(qy - min_cy), abs(qy - max_cy))
+        max_distance_sq = max_distance * max_distance
+
+        best = None
+        best_key = (float('inf'), 0)
+
+        for ring in range(last_ring + 1):
+            # Любая точка в кольце ring дальше (ring - 1) ячеек от запроса
+            ring_distance = (ring - 1) * cell_size
+            if ring_distance > 0 and (ring_distance ** 2 > best_key[0] or ring_distance > max_distance):
+                break
+
+            for cell in self._ring_cells(qx, qy, ring):
+                for zone_id in self._centers.get(cell, ()):
+                    record = self._records[zone_id]
+                    center_x, center_y = zone_center(record["rect"])
+                    distance_sq = (x - center_x) ** 2 + (y - center_y) ** 2
+                    if distance_sq > max_distance_sq:
+                        continue
+                    key = (distance_sq, self._order[zone_id])
+                    if key < best_key:
+                        best_key = key
+                        best = record
+
+        if best is None:
+            return None
+        return math.sqrt(best_key[0]), best
+
+    @staticmethod
+    def _ring_cells(qx: int, qy: int, ring: int):
+        if ring == 0:
+            yield qx, qy
+            return
+        for cx in range(qx - ring, qx + ring + 1):
+            yield cx, qy - ring
+            yield cx, qy + ring
+        for cy in range(qy - ring + 1, qy + ring):
+            yield qx - ring, cy
+            yield qx + ring, cy
+
+    def containing(self, x: float, y: float) -> Optional[Mapping]:
+        """Зона, в которой лежит точка (при пересечении - добавленная раньше)"""
+        best = None
+        for zone_id in self._cover.get(self._cell_of(x, y), ()):
+            record = self._records[zone_id]
+            left, bottom, right, top = zone_bounds(record["rect"])
+            if left <= x <= right and bottom <= y <= top:
+                if best is None or self._order[zone_id] < self._order[best["id"]]:
+                    best = record
+        return best
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# arcade без окна (контекст OpenGL не нужен для логики)
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
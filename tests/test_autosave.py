@@ -0,0 +1,61 @@
+from src.core.autosave import AutosaveService
+from src.core.game_data import game_data
+
+
+def _read(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def _level_in(filename):
+    game_data.player_data["level"] = 0
+    game_data.load_from_file(filename)
+    return game_data.player_data["level"]
+
+
+def _set_level(level):
+    game_data.player_data["level"] = level
+    game_data.mark_dirty("player")
+
+
+def test_autosave_uses_its_own_slot(tmp_path):
+    filename = str(tmp_path / "savegame.dat")
+    service = AutosaveService(filename=filename, autosave_filename=str(tmp_path / "autosave.dat"), interval=0.1)
+    _set_level(42)
+    game_data.save_to_file(filename)
+    saved = _read(filename)
+
+    # Новая игра без ручного сохранения: первый интервал - полный снимок, дальше журнал
+    service.start()
+    _set_level(1)
+    service.update(0.1)
+    _set_level(5)
+    service.update(0.1)
+    service.wait()
+
+    # Как после сбоя: слот автосохранения отстаёт не больше чем на интервал, файл игрока не тронут
+    assert _level_in(service.autosave_filename) == 5
+    assert _read(filename) == saved
+    assert service.newest_slot() == service.autosave_filename
+
+    # Загрузка сохранения игрока явно, затем ручное сохранение пишет оба файла
+    assert service.load(filename) == filename
+    assert game_data.player_data["level"] == 42
+    _set_level(43)
+    service.save_now()
+    service.stop()
+
+    assert _level_in(filename) == 43
+    assert _level_in(service.autosave_filename) == 43
+
+
+def test_stop_without_interval_writes_only_autosave_slot(tmp_path):
+    filename = str(tmp_path / "savegame.dat")
+    service = AutosaveService(filename=filename, autosave_filename=str(tmp_path / "autosave.dat"))
+    service.start()
+    _set_level(7)
+    service.stop()
+
+    assert not (tmp_path / "savegame.dat").exists()
+    assert _level_in(service.autosave_filename) == 7
+    assert service.load() == service.autosave_filename
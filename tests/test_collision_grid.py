@@ -0,0 +1,36 @@
+import random
+
+from src.world.collision_grid import CollisionGrid
+
+TILE = 32
+
+
+def test_bits_round_trip():
+    grid = CollisionGrid(13, 7, TILE)
+    rng = random.Random(4)
+    for _ in range(30):
+        grid.set_blocked(rng.randrange(13), rng.randrange(7))
+
+    packed = grid.to_bits()
+    assert len(packed) == (13 * 7 + 7) // 8
+    assert CollisionGrid.from_bits(packed, 13, 7, TILE).cells == grid.cells
+
+
+def test_out_of_map_is_not_blocked():
+    grid = CollisionGrid(2, 2, TILE)
+    grid.set_blocked(5, 5)
+    assert not any(grid.cells)
+    assert not grid.is_blocked(-1, 0)
+    assert not grid.collides_rect(-100, -100, -1, -1)
+
+
+def test_collides_rect_touching_is_not_overlap():
+    grid = CollisionGrid(4, 4, TILE)
+    grid.set_blocked(2, 1)
+
+    # Прямоугольник вплотную к стене с любой стороны её не пересекает
+    assert not grid.collides_rect(0, 32, 64, 64)
+    assert not grid.collides_rect(96, 32, 128, 64)
+    assert not grid.collides_rect(64, 0, 96, 32)
+    assert grid.collides_rect(63.5, 32, 64.5, 33)
+    assert grid.is_blocked_at(80, 40)
@@ -0,0 +1,41 @@
+from src.events.cooldown_scheduler import CooldownScheduler
+from src.events.event import GameEvent
+
+
+def _event(event_id, scheduler, cooldown):
+    event = GameEvent(event_id, event_id, "trigger", (0, 0, 10, 10))
+    event.max_cooldown = cooldown
+    event.scheduler = scheduler
+    return event
+
+
+def test_cooldowns_end_on_their_tick():
+    scheduler = CooldownScheduler()
+    # Одинаковый тик окончания: события между собой не сравниваются
+    short, same, long = _event("short", scheduler, 2), _event("same", scheduler, 2), _event("long", scheduler, 5)
+    for event in (long, short, same):
+        event.start_cooldown()
+
+    scheduler.advance()
+    assert short.activated and same.activated and long.activated
+    scheduler.advance()
+    assert not short.activated and not same.activated and long.activated
+    assert short.cooldown == 0 and len(scheduler) == 1
+
+    scheduler.advance(3)
+    assert not long.activated and len(scheduler) == 0
+
+
+def test_restarted_cooldown_skips_stale_entry():
+    scheduler = CooldownScheduler()
+    event = _event("event", scheduler, 3)
+    event.start_cooldown()
+    scheduler.advance(2)
+    # Перезапуск до окончания: старая запись в куче устаревает
+    event.start_cooldown()
+
+    scheduler.advance()
+    assert event.activated
+    assert len(scheduler) == 1
+    scheduler.advance(2)
+    assert not event.activated and len(scheduler) == 0
@@ -0,0 +1,81 @@
+from collections import Counter
+
+import pytest
+
+from src.core.game_data import game_data
+from src.entities.entity_manager import EntityManager
+
+CREATURES = 12
+TICKS = 5
+
+
+@pytest.fixture
+def manager():
+    manager = EntityManager()
+    manager.set_current_map("test_map")
+    yield manager
+    for entity_id in list(manager.entities):
+        manager.remove_entity(entity_id)
+        game_data.remove_mob(entity_id)
+
+
+def spawn(manager, count):
+    # Все существа рядом с фокусом - уровень LOD "near", обновление каждый тик
+    return [
+        manager.spawn_monster(f"creature_bug_{i}_test_map", "bug", "bug", (100 + i * 10, 100), map_name="test_map")
+        for i in range(count)
+    ]
+
+
+def test_update_all_steps_each_creature_once_per_tick(manager):
+    monsters = spawn(manager, CREATURES)
+
+    steps = []
+    elapsed = Counter()
+    step = manager.ai.step
+
+    def counting_step(scheduled, *args):
+        steps.append(Counter(monster.entity_id for monster, _ in scheduled))
+        for monster, delta_time in scheduled:
+            elapsed[monster.entity_id] += delta_time
+        return step(scheduled, *args)
+
+    manager.ai.step = counting_step
+
+    for _ in range(TICKS):
+        manager.update_all(1 / 60, focus=(100, 100))
+
+    # Один шаг ИИ за тик, в нём каждое существо ровно один раз
+    assert len(steps) == TICKS
+    expected = Counter(monster.entity_id for monster in monsters)
+    for counts in steps:
+        assert counts == expected
+
+    # И время симуляции существа идёт с обычной скоростью, а не двойной
+    for monster in monsters:
+        assert elapsed[monster.entity_id] == pytest.approx(TICKS / 60)
+
+
+def test_map_registry_keeps_maps_apart(manager):
+    # Имя одной карты - часть имени другой: раньше монстры определялись по подстроке id
+    here = manager.spawn_monster("creature_bug_0_test_map", "bug", "bug", (100, 100), map_name="test_map")
+    there = manager.spawn_monster("creature_bug_0_test_map_2", "bug", "bug", (100, 100), map_name="test_map_2")
+
+    assert list(manager.get_monsters_for_current_map()) == [here]
+    assert list(manager.get_map_mobs("test_map_2")) == [there]
+
+    manager.remove_entity(there.entity_id)
+    assert len(manager.get_map_mobs("test_map_2")) == 0
+    assert list(manager.get_map_mobs("test_map")) == [here]
+
+
+def test_queued_removal_waits_for_flush(manager):
+    monsters = spawn(manager, 3)
+    manager.queue_removal(monsters[0].entity_id)
+    manager.queue_removal(monsters[0].entity_id)
+
+    assert monsters[0] in manager.mob
+    manager.flush_removals()
+    assert monsters[0] not in manager.mob and monsters[0].entity_id not in manager.entities
+    assert set(manager.mob) == set(monsters[1:])
+    assert set(manager.query_radius(100, 100, 1000)) == set(monsters[1:])
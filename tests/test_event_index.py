@@ -0,0 +1,77 @@
+import random
+
+from src.events.event import GameEvent
+from src.events.event_index import EventIndex
+from src.events.event_manager import EventManager
+from src.events.event_registry import event_registry
+
+
+class MarkerEvent(GameEvent):
+    """Тип только для теста (в общий реестр не регистрируется)"""
+    tiled_type = "marker"
+
+    def __init__(self, event_id, rect):
+        super().__init__(event_id, event_id, "marker", rect)
+
+
+def _overlaps(event, left, bottom, right, top):
+    x0, y0 = min(event.x, event.x + event.width), min(event.y, event.y + event.height)
+    x1, y1 = max(event.x, event.x + event.width), max(event.y, event.y + event.height)
+    return x0 <= right and left <= x1 and y0 <= top and bottom <= y1
+
+
+def test_query_rect_matches_brute_force():
+    rng = random.Random(21)
+    index = EventIndex(cell_size=64)
+    events = [
+        GameEvent(f"e{i}", "e", "trigger",
+                  (rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(5, 200), rng.uniform(-200, 200)))
+        for i in range(200)
+    ]
+    for event in events:
+        index.add(event)
+    for event in events[::5]:
+        index.remove(event)
+    alive = [event for i, event in enumerate(events) if i % 5]
+    assert len(index) == len(alive)
+
+    for _ in range(200):
+        x, y = rng.uniform(-600, 600), rng.uniform(-600, 600)
+        rect = (x, y, x + rng.uniform(0, 100), y + rng.uniform(0, 100))
+        found = index.query_rect(*rect)
+        # Кандидаты - надмножество точных попаданий, в порядке добавления
+        assert [event for event in alive if _overlaps(event, *rect)] == [
+            event for event in found if _overlaps(event, *rect)]
+        assert found == sorted(found, key=events.index)
+        assert all(event in index for event in found)
+
+
+def test_nearest_by_registered_type():
+    index = EventIndex(cell_size=64)
+    near, far = MarkerEvent("near", (90, 90, 20, 20)), MarkerEvent("far", (190, 90, 20, 20))
+    # Событие без класса в реестре не попадает в поиск по типу, даже с тем же type
+    untyped = GameEvent("untyped", "untyped", "marker", (100, 100, 0, 0))
+    for event in (far, untyped, near):
+        index.add(event)
+
+    assert index.nearest("marker", 100, 100, 500) is near
+    assert index.nearest("marker", 160, 100, 500) is far
+    assert index.nearest("marker", 100, 100, 50) is near
+    assert index.nearest("marker", 150, 100, 10) is None
+    assert index.nearest("chest", 100, 100, 500) is None
+
+    index.remove(near)
+    assert index.nearest("marker", 100, 100, 500) is far
+    index.clear()
+    assert index.nearest("marker", 200, 100, 500) is None and len(index) == 0
+
+
+def test_nearest_chest_event():
+    manager = EventManager()
+    chest = event_registry.create("chest", "chest_0", "chest", (0, 0, 64, 64), {})
+    teleport = event_registry.create("teleport", "teleport_0", "teleport", (0, 0, 64, 64), {})
+    manager.add_event(teleport)
+    manager.add_event(chest)
+
+    assert manager.find_nearest_chest_event(40, 40) is chest
+    assert manager.find_nearest_chest_event(1000, 1000) is None
@@ -0,0 +1,48 @@
+from src.world.collision_grid import CollisionGrid
+from src.world.line_of_sight import LineOfSight
+
+TILE = 32
+
+
+def _center(tx, ty):
+    return (tx + 0.5) * TILE, (ty + 0.5) * TILE
+
+
+def _grid():
+    """Стена в тайле (5, 5)"""
+    grid = CollisionGrid(12, 12, TILE)
+    grid.set_blocked(5, 5)
+    return grid
+
+
+def test_raycast():
+    sight = LineOfSight(_grid())
+    assert not sight.raycast(*_center(2, 5), *_center(8, 5))
+    assert not sight.raycast(*_center(2, 2), *_center(8, 8))
+    assert sight.raycast(*_center(2, 6), *_center(8, 6))
+    # Стена в тайле цели не закрывает её саму
+    assert sight.raycast(*_center(2, 5), *_center(5, 5))
+
+
+def test_ray_budget_and_cache():
+    sight = LineOfSight(_grid(), max_rays_per_frame=2)
+    target = _center(8, 5)
+    sight.begin_frame(*target)
+
+    assert sight.is_visible(*_center(2, 5), *target) is False
+    assert sight.is_visible(*_center(8, 1), *target) is True
+    # Бюджет исчерпан: новый луч не бросается, известные пары берутся из кэша
+    assert sight.is_visible(*_center(1, 1), *target) is None
+    assert sight.is_visible(2 * TILE + 1, 5 * TILE + 1, *target) is False
+    assert sight.rays_cast == 2
+
+    # Следующий кадр: бюджет сброшен, кэш сохранён, пока цель в том же тайле
+    sight.begin_frame(target[0] + 3, target[1] - 3)
+    assert sight.rays_cast == 0
+    assert sight.is_visible(*_center(1, 1), *target) is True
+    assert sight.is_visible(*_center(2, 5), *target) is False
+    assert sight.rays_cast == 1
+
+    # Цель сменила тайл - кэш очищен
+    sight.begin_frame(*_center(8, 6))
+    assert sight._cache == {}
@@ -0,0 +1,61 @@
+from collections import Counter
+
+import pytest
+
+from src.entities.lod_scheduler import LODScheduler
+
+DT = 1 / 60
+TIERS = [("mid", 300, 3), ("near", 100, 1), ("far", 600, 6)]
+
+
+class Dummy:
+    def __init__(self, x):
+        self.center_x, self.center_y = x, 0.0
+        self.skipped = []
+
+    def fast_forward(self, seconds):
+        self.skipped.append(seconds)
+
+
+def test_tiers_update_periods():
+    scheduler = LODScheduler(TIERS, dormant_mode="fast_forward")
+    near, mid, far = Dummy(50), Dummy(200), Dummy(500)
+
+    calls = Counter()
+    elapsed = Counter()
+    for _ in range(12):
+        for monster, delta_time in scheduler.schedule([near, mid, far], 0, 0, DT, total=5):
+            calls[monster] += 1
+            elapsed[monster] += delta_time
+
+    assert scheduler.counters == {"near": 1, "mid": 1, "far": 1, "dormant": 2}
+    assert calls == {near: 12, mid: 4, far: 2}
+    # Редкие обновления получают накопленное время, ничего не теряется
+    for monster, period in ((near, 1), (mid, 3), (far, 6)):
+        assert elapsed[monster] <= 12 * DT + 1e-9
+        assert elapsed[monster] > (12 - period) * DT
+
+
+def test_phases_spread_rare_updates():
+    scheduler = LODScheduler(TIERS)
+    monsters = [Dummy(550) for _ in range(12)]
+    per_tick = [len(scheduler.schedule(monsters, 0, 0, DT)) for _ in range(6)]
+    assert per_tick == [2] * 6
+
+
+def test_wake_fast_forwards_sleep_time():
+    scheduler = LODScheduler(TIERS, dormant_mode="fast_forward")
+    monster = Dummy(50)
+
+    scheduler.schedule([monster], 0, 0, DT)
+    for _ in range(10):
+        scheduler.schedule([], 0, 0, DT, total=1)
+    assert scheduler.counters["dormant"] == 1
+
+    # После сна: сон прокручен разом, а шаг обновления - обычный
+    assert scheduler.schedule([monster], 0, 0, DT) == [(monster, pytest.approx(DT))]
+    assert monster.skipped == [pytest.approx(10 * DT)]
+
+    scheduler.forget(monster)
+    assert scheduler.schedule([monster], 0, 0, DT) == [(monster, pytest.approx(DT))]
+    assert len(monster.skipped) == 1
@@ -0,0 +1,30 @@
+from src.world.map_cache import MapCache
+
+
+def test_eviction_closes_compiled_map():
+    cache = MapCache(max_maps=1)
+    first = cache.get("secmap")
+    compiled = first.compiled_map
+    assert compiled is not None and not compiled.closed
+
+    cache.get("testmap")
+    assert "secmap" not in cache._maps
+    assert compiled.closed
+    assert first.compiled_map is None
+    cache.clear()
+
+
+def test_prefetched_map_is_built_in_steps():
+    cache = MapCache(build_budget=0)
+    cache.get("secmap")
+    cache.prefetch("testmap")
+    cache._pending["testmap"].result()
+
+    # Без бюджета - ровно один шаг сборки за кадр
+    frames = 0
+    while "testmap" not in cache._maps:
+        cache.update()
+        frames += 1
+    assert frames > 3
+    assert cache._maps["testmap"].loaded
+    cache.clear()
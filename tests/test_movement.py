@@ -0,0 +1,64 @@
+import arcade
+
+from src.world.collision_grid import CollisionGrid
+from src.world.movement import move_and_collide, sweep_box
+
+TILE = 32
+BOX = (-10, -10, 10, 10)
+
+
+def _grid():
+    """Стена в тайле (3, 1)"""
+    grid = CollisionGrid(8, 4, TILE)
+    grid.set_blocked(3, 1)
+    return grid
+
+
+def test_sweep_stops_flush_against_wall():
+    grid = _grid()
+    # Справа: правый край на x = 96 (левая граница стены)
+    x, y, normal_x, normal_y = sweep_box(grid, 48, 48, BOX, 100, 0)
+    assert (x, y, normal_x, normal_y) == (86, 48, -1, 0)
+    assert not grid.collides_rect(x - 10, y - 10, x + 10, y + 10)
+
+    # Слева: левый край на x = 128 (правая граница стены)
+    x, _, normal_x, _ = sweep_box(grid, 200, 48, BOX, -150, 0)
+    assert (x, normal_x) == (138, 1)
+
+    # Снизу и сверху
+    _, y, _, normal_y = sweep_box(grid, 112, 10, BOX, 0, 40)
+    assert (y, normal_y) == (22, -1)
+    _, y, _, normal_y = sweep_box(grid, 112, 110, BOX, 0, -40)
+    assert (y, normal_y) == (74, 1)
+
+
+def test_sweep_does_not_tunnel_through_thin_wall():
+    grid = _grid()
+    # Шаг длиннее тайла не перепрыгивает стену
+    x, _, normal_x, _ = sweep_box(grid, 48, 48, BOX, 1000, 0)
+    assert (x, normal_x) == (86, -1)
+
+
+def test_free_move_and_slide_along_wall():
+    grid = _grid()
+    assert sweep_box(grid, 48, 48, BOX, 20, 0) == (68, 48, 0, 0)
+    # Движение по диагонали: X упирается, Y продолжается
+    x, y, normal_x, normal_y = sweep_box(grid, 80, 48, BOX, 20, 5)
+    assert (x, y, normal_x, normal_y) == (86, 53, -1, 0)
+    assert sweep_box(None, 1, 2, BOX, 3, 4) == (4, 6, 0, 0)
+
+
+def test_move_and_collide_sprite():
+    grid = _grid()
+    sprite = arcade.SpriteSolidColor(20, 20, center_x=48, center_y=48)
+
+    assert move_and_collide(sprite, 100, 0, grid) == (-1, 0)
+    assert sprite.right == 96 and sprite.center_y == 48
+    assert not grid.collides_sprite(sprite)
+
+    # Повторный шаг в стену не двигает спрайт
+    assert move_and_collide(sprite, 5, 0, grid) == (-1, 0)
+    assert sprite.right == 96
+
+    assert move_and_collide(sprite, 0, 20, grid) == (0, 0)
+    assert sprite.center_y == 68
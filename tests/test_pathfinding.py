@@ -0,0 +1,97 @@
+from src.world.collision_grid import CollisionGrid
+from src.world.pathfinding import Pathfinder
+
+TILE = 32
+
+
+def _walled_grid():
+    """Стена по x = 5 с проходом в один тайл (y = 8) и в три тайла (y = 1..3)"""
+    grid = CollisionGrid(11, 12, TILE)
+    for ty in range(12):
+        if ty not in (1, 2, 3, 8):
+            grid.set_blocked(5, ty)
+    return grid
+
+
+def test_clearance_from_hit_box():
+    pathfinder = Pathfinder(_walled_grid())
+    assert pathfinder.clearance((-16, -16, 16, 16)) == 0
+    assert pathfinder.clearance((-10, -30, 10, 12)) == 1
+    assert pathfinder.clearance((-48, -48, 48, 48)) == 1
+    assert pathfinder.clearance((-49, -8, 8, 8)) == 2
+
+
+def test_large_creature_avoids_narrow_gap():
+    pathfinder = Pathfinder(_walled_grid())
+
+    small = pathfinder.find_path((1, 9), (9, 9))
+    assert (5, 8) in small
+
+    large = pathfinder.find_path((1, 9), (9, 9), clearance=1)
+    assert (5, 8) not in large and (5, 2) in large
+    # Каждый тайл пути вмещает квадрат 3x3
+    assert all(pathfinder._is_walkable(tile, 1) for tile in large)
+
+    # Проход в три тайла - предел для запаса 1
+    assert pathfinder.find_path((1, 9), (9, 9), clearance=2) is None
+
+
+def test_waypoints_are_cached_per_clearance():
+    pathfinder = Pathfinder(_walled_grid())
+    start, goal = pathfinder.tile_center((4, 8)), pathfinder.tile_center((9, 8))
+
+    assert pathfinder.next_waypoint(*start, *goal) == pathfinder.tile_center((5, 8))
+    assert pathfinder.next_waypoint(*start, *goal, clearance=1) != pathfinder.tile_center((5, 8))
+
+
+def test_flow_field_per_clearance():
+    pathfinder = Pathfinder(_walled_grid())
+    pathfinder.update_flow_field(*pathfinder.tile_center((7, 8)))
+
+    assert pathfinder.flow_waypoint(*pathfinder.tile_center((4, 8))) == pathfinder.tile_center((5, 8))
+    # Крупному существу поле ведёт в обход, к широкому проходу
+    assert pathfinder.flow_waypoint(*pathfinder.tile_center((3, 8)), clearance=1) == pathfinder.tile_center((3, 7))
+
+
+def test_node_cap_limits_search():
+    grid = CollisionGrid(40, 40, TILE)
+    # По прямой раскрываются только 5 узлов до цели
+    assert Pathfinder(grid, max_nodes=5).find_path((0, 0), (5, 0)) == [(1, 0), (2, 0), (3, 0), (4, 0), (5, 0)]
+    assert Pathfinder(grid, max_nodes=4).find_path((0, 0), (5, 0)) is None
+
+    # Цель за стеной: поиск обходит всю область и упирается в предел
+    for tx in range(40):
+        grid.set_blocked(tx, 20)
+    pathfinder = Pathfinder(grid, max_nodes=100)
+    assert pathfinder.find_path((0, 0), (0, 39)) is None
+    assert pathfinder.next_waypoint(*pathfinder.tile_center((0, 0)), *pathfinder.tile_center((0, 39))) is None
+    assert ((0, 0), (0, 39), 0) in pathfinder._unreachable
+
+
+def test_flow_field_leads_to_goal():
+    pathfinder = Pathfinder(_walled_grid(), flow_radius=30)
+    goal = pathfinder.tile_center((8, 8))
+    pathfinder.update_flow_field(*goal)
+    flow = pathfinder._flow_field(0)
+
+    # Шаги по полю уменьшают расстояние на 1 и приводят в тайл цели
+    x, y = pathfinder.tile_center((1, 0))
+    steps = 0
+    while (waypoint := pathfinder.flow_waypoint(x, y)) is not None:
+        assert flow[pathfinder.world_to_tile(*waypoint)] == flow[pathfinder.world_to_tile(x, y)] - 1
+        x, y = waypoint
+        steps += 1
+    assert (x, y) == goal and steps == flow[(1, 0)]
+
+    # Цель в том же тайле - поле не пересчитывается
+    pathfinder.update_flow_field(goal[0] + 5, goal[1] - 5)
+    assert pathfinder._flow_field(0) is flow
+
+
+def test_flow_field_radius():
+    pathfinder = Pathfinder(CollisionGrid(40, 40, TILE), flow_radius=5)
+    pathfinder.update_flow_field(*pathfinder.tile_center((20, 20)))
+
+    assert pathfinder.flow_waypoint(*pathfinder.tile_center((20, 25))) == pathfinder.tile_center((20, 24))
+    assert pathfinder.flow_waypoint(*pathfinder.tile_center((20, 27))) is None
+    assert pathfinder.flow_waypoint(*pathfinder.tile_center((20, 20))) is None
@@ -0,0 +1,112 @@
+import pickle
+
+import pytest
+
+from src.core import save_format
+from src.core.game_data import game_data
+from src.core.save_format import SaveFormatError
+from src.events.event_state_store import event_states
+
+
+def _events_block() -> bytes:
+    """Блок состояний с одним сундуком (хранилище после этого возвращается как было)"""
+    records = dict(event_states.records)
+    event_states.set_state("chest_0", "chest", {"is_empty": True}, schema=(("is_empty", "?"),))
+    block = event_states.to_bytes()
+    event_states.records.clear()
+    event_states.records.update(records)
+    return block
+
+
+SECTIONS = {
+    "player": {"level": 42, "position": {"x": 10, "y": 20}},
+    "mobs": {
+        f"creature_bug_{i}": {
+            "health": i * 10, "speed": 1.5, "behavior": "aggressive" if i % 2 else "passive",
+            "zone_rect": (0.0, 100.0, 50.0, -50.0), **({"extra": [i]} if i % 3 == 0 else {}),
+        }
+        for i in range(20)
+    },
+    "zones": {"zone_0": {"id": "zone_0", "rect": (1, 2, 3, 4), "properties": {}}},
+    "events": _events_block(),
+}
+
+
+def test_round_trip():
+    assert save_format.loads(save_format.dumps(SECTIONS)) == SECTIONS
+
+
+def test_non_str_ids_and_keys_round_trip():
+    sections = {
+        "mobs": {
+            "creature_bug_0": {"custom_properties": {1: "a", (2, 3): None}},
+            "creature_bug_1": {"custom_properties": {1: "b"}},
+        },
+        "zones": {7: {"id": 7}, "zone_1": {"id": "zone_1"}},
+    }
+    assert save_format.loads(save_format.dumps(sections)) == sections
+
+
+def test_failed_delta_keeps_dirty_records():
+    game_data.clear_dirty()
+    game_data.player_data["bad"] = {1, 2}
+    game_data.mark_dirty("player")
+    try:
+        with pytest.raises(TypeError):
+            game_data.take_delta()
+        assert game_data._dirty == {"player": {None}}
+    finally:
+        del game_data.player_data["bad"]
+    assert save_format.loads(game_data.take_delta())["player"] == game_data.player_data
+
+
+def test_truncated_data_raises_save_format_error():
+    data = save_format.dumps(SECTIONS)
+    # Обрезанное оглавление и обрезанный файл на любой длине
+    for broken in [b"ITCS\x01\x00\x05\x00"] + [data[:size] for size in range(len(data))]:
+        with pytest.raises(SaveFormatError):
+            save_format.loads(broken)
+
+
+def test_corrupted_section_raises_save_format_error():
+    # Испорченный байт может дать другое допустимое значение, но не другое исключение
+    data = save_format.dumps(SECTIONS)
+    for position in range(len(data)):
+        broken = bytearray(data)
+        broken[position] ^= 0xFF
+        try:
+            save_format.loads(bytes(broken))
+        except SaveFormatError:
+            pass
+
+
+def test_corrupted_events_section_leaves_game_state_unchanged(tmp_path):
+    events = SECTIONS["events"]
+    filename = str(tmp_path / "savegame.dat")
+
+    game_data.player_data["level"] = 99
+    mobs, records = dict(game_data.mobs_data), dict(event_states.records)
+    # Испорчен только раздел events: обрезан или с лишним байтом
+    for broken in (events[:-1], events[:9], events + b"\0"):
+        data = save_format.dumps(dict(SECTIONS, events=broken))
+        with pytest.raises(SaveFormatError):
+            save_format.loads(data)
+
+        with open(filename, "wb") as f:
+            f.write(data)
+        game_data.load_from_file(filename)
+        assert game_data.player_data["level"] == 99
+        assert game_data.mobs_data == mobs
+        assert event_states.records == records
+
+
+def test_legacy_pickle_only_through_import():
+    legacy = pickle.dumps({"player_data": {"level": 7}, "mobs_data": {}, "mob_zones": {}})
+    with pytest.raises(SaveFormatError):
+        save_format.loads(legacy)
+
+    sections = save_format.import_legacy(legacy)
+    assert sections["player"] == {"level": 7}
+
+    with pytest.raises(SaveFormatError):
+        save_format.import_legacy(legacy[:10])
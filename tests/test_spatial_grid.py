@@ -0,0 +1,47 @@
+import random
+
+from src.world.spatial_grid import SpatialGrid
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(1)
+    grid = SpatialGrid(cell_size=100)
+    points = {}
+    for i in range(300):
+        points[i] = (rng.uniform(-1000, 1000), rng.uniform(-1000, 1000))
+        grid.insert(i, *points[i])
+
+    # Половина объектов переезжает, часть удаляется
+    for i in range(0, 300, 2):
+        points[i] = (rng.uniform(-1000, 1000), rng.uniform(-1000, 1000))
+        grid.move(i, *points[i])
+    for i in range(0, 300, 7):
+        grid.remove(i)
+        del points[i]
+    assert len(grid) == len(points) and set(grid) == set(points)
+
+    for _ in range(100):
+        x, y, radius = rng.uniform(-1100, 1100), rng.uniform(-1100, 1100), rng.uniform(0, 400)
+        expected = {i for i, (px, py) in points.items() if (px - x) ** 2 + (py - y) ** 2 <= radius ** 2}
+        assert sorted(grid.query_radius(x, y, radius)) == sorted(expected)
+
+        left, bottom = x - radius, y - radius / 2
+        right, top = x + radius / 3, y + radius
+        expected = {i for i, (px, py) in points.items() if left <= px <= right and bottom <= py <= top}
+        assert sorted(grid.query_rect(left, bottom, right, top)) == sorted(expected)
+
+
+def test_move_across_cell_boundary():
+    grid = SpatialGrid(cell_size=100)
+    grid.insert("a", 99, 50)
+    grid.insert("a", 101, 50)
+    assert len(grid) == 1
+
+    assert grid.query_rect(0, 0, 100, 100) == []
+    assert grid.query_rect(100, 0, 200, 100) == ["a"]
+    # Пустые ячейки не остаются в сетке
+    assert list(grid._cells) == [(1, 0)]
+
+    grid.remove("a")
+    grid.remove("a")
+    assert "a" not in grid and grid._cells == {}
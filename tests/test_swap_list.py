@@ -0,0 +1,40 @@
+import random
+
+from src.entities.swap_list import SwapRemoveList
+
+
+def test_remove_swaps_last_into_place():
+    items = SwapRemoveList()
+    for item in "abcde":
+        items.append(item)
+    items.append("a")
+    assert list(items) == ["a", "b", "c", "d", "e"]
+
+    assert items.remove("b")
+    assert list(items) == ["a", "e", "c", "d"]
+    assert items.remove("d")
+    assert list(items) == ["a", "e", "c"]
+    assert not items.remove("b")
+    assert "b" not in items and "e" in items
+    assert items[1] == "e" and len(items) == 3
+
+
+def test_index_stays_consistent():
+    rng = random.Random(20)
+    items = SwapRemoveList()
+    expected = set()
+    for _ in range(2000):
+        value = rng.randrange(100)
+        if rng.random() < 0.5:
+            items.append(value)
+            expected.add(value)
+        else:
+            assert items.remove(value) == (value in expected)
+            expected.discard(value)
+
+        assert len(items) == len(expected) and set(items) == expected
+    # Каждый элемент знает свой индекс
+    assert all(items[index] == item for item, index in items._index.items())
+
+    items.clear()
+    assert len(items) == 0 and 0 not in items
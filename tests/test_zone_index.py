@@ -0,0 +1,95 @@
+import math
+import random
+
+import pytest
+
+from src.world.zone_index import ZoneIndex, zone_bounds, zone_center
+
+
+def _random_zones(rng, count):
+    zones = {}
+    for i in range(count):
+        w, h = rng.uniform(10, 300), rng.uniform(10, 300)
+        # Как в Tiled: y - верхний край, высота бывает и отрицательной
+        rect = (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), w, h if i % 2 else -h)
+        zones[f"zone_{i}"] = {"rect": rect, "map_name": "test"}
+    return zones
+
+
+def _index(zones, cell_size):
+    index = ZoneIndex(cell_size)
+    for zone_id, zone in zones.items():
+        index.add(zone_id, zone)
+    return index
+
+
+def _brute_nearest(zones, x, y, max_distance):
+    best = None
+    for zone_id, zone in zones.items():
+        distance = math.dist((x, y), zone_center(zone["rect"]))
+        if distance <= max_distance and (best is None or distance < best[0]):
+            best = (distance, zone_id)
+    return best
+
+
+def _brute_containing(zones, x, y):
+    for zone_id, zone in zones.items():
+        left, bottom, right, top = zone_bounds(zone["rect"])
+        if left <= x <= right and bottom <= y <= top:
+            return zone_id
+    return None
+
+
+@pytest.mark.parametrize("cell_size", [64, 256, 5000])
+def test_nearest_matches_brute_force(cell_size):
+    rng = random.Random(18)
+    zones = _random_zones(rng, 200)
+    index = _index(zones, cell_size)
+
+    for _ in range(300):
+        x, y = rng.uniform(-3000, 3000), rng.uniform(-3000, 3000)
+        max_distance = rng.choice((100, 1000, 10000))
+        expected = _brute_nearest(zones, x, y, max_distance)
+        found = index.nearest_with_distance(x, y, max_distance)
+        if expected is None:
+            assert found is None
+        else:
+            assert found[1]["id"] == expected[1]
+            assert found[0] == pytest.approx(expected[0])
+
+
+@pytest.mark.parametrize("cell_size", [64, 256])
+def test_containing_matches_brute_force(cell_size):
+    rng = random.Random(180)
+    zones = _random_zones(rng, 300)
+    index = _index(zones, cell_size)
+
+    for _ in range(500):
+        x, y = rng.uniform(-2200, 2200), rng.uniform(-2200, 2200)
+        found = index.containing(x, y)
+        assert (found["id"] if found else None) == _brute_containing(zones, x, y)
+
+
+def test_ties_replace_and_remove():
+    index = ZoneIndex(64)
+    index.add("b", {"rect": (0, 100, 100, 100)})
+    index.add("a", {"rect": (0, 100, 100, 100)})
+
+    # При равенстве побеждает добавленная раньше
+    assert index.nearest(50, 50)["id"] == "b"
+    assert index.containing(50, 50)["id"] == "b"
+
+    # Повторное добавление заменяет зону и переносит её в конец
+    index.add("b", {"rect": (500, 600, 100, 100)})
+    assert len(index) == 2
+    assert index.nearest(50, 50)["id"] == "a"
+    assert index.containing(550, 550)["id"] == "b"
+
+    index.remove("a")
+    assert "a" not in index
+    assert index.containing(50, 50) is None
+    assert index.nearest(50, 50, max_distance=100) is None
+
+    # Записи только для чтения
+    with pytest.raises(TypeError):
+        index.get("b")["rect"] = None